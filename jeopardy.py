@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 """
 jeopardy.py - Pygame Jeopardy with selectable question files, feedback sounds, and Go Back button
-"""
 
-import os, csv, sys, pygame
-from collections import defaultdict
-from math import floor
+Everything is drawn through a jeopardy_render renderer: --renderer gpu
+(for 4K projectors) does the full-frame fills, the feedback dim and the
+text on the GPU, and falls back to software drawing if it can't.
+"""
 
-pygame.init()
-pygame.mixer.init()
+import argparse, csv, os, sys
+from jeopardy_startup import Startup, load_fonts, load_sounds  # first, so its clock covers importing pygame
+import pygame
+from jeopardy_engine import GameEngine, RULES_NO_PENALTY
+from jeopardy_scenes import Scene, SceneManager, Tween, linear
+from jeopardy_server import AnswerServer, ANSWER_EVENT
+from jeopardy_mirror import MirrorPublisher
+from jeopardy_log import EventLog, log_path
+from jeopardy_layout import LayoutCache, get_font, draw_fitted
+from jeopardy_render import create_renderer
+from jeopardy_dedup import DedupIndex, clue_text, board_repeats
+from jeopardy_watch import FileWatcher, LiveQuestionSet
 
 # ---------- Config ----------
 xx = 1.1
@@ -16,22 +26,17 @@ SCREEN_WIDTH = int(1200 * xx)
 SCREEN_HEIGHT = int(800 * xx)
 FPS = 30
 
-TOP_MARGIN = 100
 LEFT_MARGIN = 40
 RIGHT_MARGIN = 40
-BOTTOM_MARGIN = 120
 
-CATEGORY_HEIGHT = 80
-CATEGORY_PADDING = 12
-TILE_MARGIN = 12
-TILE_MIN_HEIGHT = 64
-TILE_MIN_WIDTH = 120
+# Board geometry as fractions of the window; sizes come from jeopardy_layout
+BOARD_LAYOUT = {"margin": 0.03, "top": 0.11, "category": 0.09, "bottom": 0.14, "gap": 0.014}
 
 FONT_NAME = "NotoSansSC-Regular.ttf"
 FONT_SMALL = 18
 FONT_MED = 24
 FONT_LARGE = 30
-TEAM_FONT_SIZE = 35
+QUESTION_FONT_MAX = 40  # long questions shrink from here (see jeopardy_layout.fit_text)
 
 BG = (10, 10, 10)
 TILE_COLOR = (30, 110, 200)
@@ -44,186 +49,182 @@ WRONG_COLOR = (200, 40, 40)
 OVERLAY_BG = (250, 250, 250)
 OVERLAY_TEXT = (10, 10, 10)
 
-FEEDBACK_DURATION = 60  # frames (~2 sec at 30 FPS)
+FEEDBACK_MS = 2000  # how long CORRECT/WRONG stays up
+ZOOM_MS = 250  # tile grows into the question card
+FLIP_MS = 400  # answered tile turns over to grey
+COUNT_MS = 600  # score counts up/down to its new value
+TIMER_WARN = 5  # seconds left when the countdown turns red
+
+parser = argparse.ArgumentParser(description="Multiple-choice Jeopardy")
+parser.add_argument("--serve", type=int, metavar="PORT",
+                    help="let players answer from their phones at http://<this machine>:PORT/")
+parser.add_argument("--mirror", type=int, metavar="PORT",
+                    help="publish board/score deltas for jeopardy_mirror.py on this local port")
+parser.add_argument("--timings", action="store_true", help="print how long each startup phase took")
+parser.add_argument("--log-dir", default="logs", help="where the game's event log goes (see jeopardy_log.py)")
+parser.add_argument("--no-log", action="store_true", help="do not write an event log")
+parser.add_argument("--no-watch", action="store_true", help="do not reload the question set when its file changes")
+parser.add_argument("--renderer", choices=["software", "gpu"], default="software",
+                    help="gpu draws with SDL textures (for 4K projectors); falls back to software")
+args = parser.parse_args()
 
 # ---------- Initialize Pygame ----------
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Jeopardy")
-clock = pygame.time.Clock()
-
-font_small = pygame.font.Font(FONT_NAME, FONT_SMALL)
-font_med = pygame.font.Font(FONT_NAME, FONT_MED)
-font_large = pygame.font.Font(FONT_NAME, FONT_LARGE)
-font_team = pygame.font.Font(FONT_NAME, TEAM_FONT_SIZE)
-
-# ---------- Load sounds ----------
-try:
-    sound_correct = pygame.mixer.Sound("correct.wav")
-    sound_wrong = pygame.mixer.Sound("wrong.wav")
-except:
-    sound_correct = sound_wrong = None
-
-# ---------- Helpers ----------
-def detect_delimiter(header_line):
-    return "\t" if "\t" in header_line else ","
-
-def wrap_text(text, font, max_width):
-    words = text.split()
-    if not words:
-        return [""]
-    lines = []
-    cur = words[0]
-    for w in words[1:]:
-        test = cur + " " + w
-        if font.size(test)[0] <= max_width:
-            cur = test
-        else:
-            lines.append(cur)
-            cur = w
-    lines.append(cur)
-    return lines
-
-def parse_correct_field(correct_field):
-    if not correct_field:
-        return None
-    c = correct_field.strip()
-    if len(c) == 1 and c in "1234":
-        return int(c)-1
-    if len(c) == 1 and c.upper() in "ABCD":
-        return ord(c.upper()) - ord("A")
-    return c
+startup = Startup(report=args.timings)
+startup.init_pygame()
+screen = create_renderer((SCREEN_WIDTH, SCREEN_HEIGHT), "Jeopardy", args.renderer)
+startup.mark("window")
+startup.first_frame(screen, BG)
+TIMER_TICK = pygame.event.custom_type()
+FEEDBACK_DONE = pygame.event.custom_type()
+QUESTIONS_CHANGED = pygame.event.custom_type()  # wakes the loop; the reload waits for the board
+
+# ---------- Load fonts & sounds ----------
+# On loader threads, while the question files are listed; waited for below
+fonts = startup.load("fonts", load_fonts, FONT_NAME, (FONT_SMALL, FONT_MED, FONT_LARGE))
+sounds = startup.load("sounds", load_sounds, "correct.wav", "wrong.wav")
 
 # ---------- Game State ----------
-team_names = ["Team A","Team B"]
-team_scores = [0,0]
-current_team_idx = 0
+# Scores, turns, used flags, wagers and the open clue all live in the engine.
+# Daily doubles come from a daily_double column, or one is placed on each board.
+engine = GameEngine(["Team A","Team B"], dict(RULES_NO_PENALTY, wagers=True, daily_doubles=1))
+played = DedupIndex()  # clues played tonight; a set that repeats them gets a warning
 
-showing_overlay = False
-overlay_question = None
 overlay_metadata = {}
+phone_server = None  # AnswerServer when started with --serve
+event_log = None  # EventLog unless started with --no-log
+live_set = None  # LiveQuestionSet of the open file
+watcher = None  # FileWatcher on it, unless started with --no-watch
+questions_changed = False  # set by the watcher thread, cleared by reload_questions()
+shown_scores = [0, 0]  # what the score bar shows; trails engine.scores while counting
 
 feedback_showing = False
 feedback_text = ""
 feedback_color = (0,0,0)
-feedback_timer = 0
-
-categories = {}
-category_names = []
-max_rows = 0
+FEEDBACK_SHADE = (0,0,0,180)
 
 # ---------- File Selection ----------
 QUESTION_DIR = "./"
 question_files = sorted([f for f in os.listdir(QUESTION_DIR) if f.startswith("q") and f.endswith(".txt")])
-showing_file_select = True
+startup.mark("data")
 file_select_scroll = 0
 file_select_item_h = 50
 file_select_pad = 10
 
-def draw_file_selection():
-    screen.fill(BG)
-    title = font_large.render("Select Question Set", True, TEXT)
-    screen.blit(title, ((SCREEN_WIDTH-title.get_width())//2, 20))
+def file_rects():
     start_y = 100 - file_select_scroll
     for i, f in enumerate(question_files):
-        rect = pygame.Rect(LEFT_MARGIN, start_y + i*(file_select_item_h+file_select_pad),
-                           SCREEN_WIDTH-LEFT_MARGIN-RIGHT_MARGIN, file_select_item_h)
-        pygame.draw.rect(screen, TILE_COLOR, rect, border_radius=6)
-        fname = font_med.render(f, True, TEXT)
-        screen.blit(fname, (rect.x+10, rect.y+(file_select_item_h-fname.get_height())//2))
+        yield f, pygame.Rect(LEFT_MARGIN, start_y + i*(file_select_item_h+file_select_pad),
+                             SCREEN_WIDTH-LEFT_MARGIN-RIGHT_MARGIN, file_select_item_h)
+
+def draw_file_selection():
+    screen.clear(BG)
+    screen.draw(screen.text(font_large, "Select Question Set", TEXT), midtop=(SCREEN_WIDTH//2, 20))
+    for f, rect in file_rects():
+        screen.fill(rect, TILE_COLOR, radius=6)
+        name = screen.text(font_med, f, TEXT)
+        screen.draw(name, (rect.x+10, rect.y+(file_select_item_h-name.get_rect().height)//2))
 
 # ---------- Load questions ----------
 def load_questions(filename):
-    global categories, category_names, max_rows, team_scores, current_team_idx
-    team_scores = [0,0]
-    current_team_idx = 0
-
-    questions_raw = []
-    with open(filename,"r",encoding="utf-8",newline="") as fh:
-        header_line = fh.readline()
-        delimiter = detect_delimiter(header_line)
-    with open(filename,"r",encoding="utf-8",newline="") as fh:
-        reader = csv.DictReader(fh, delimiter=delimiter)
-        for row in reader:
-            row_lc = {k.strip(): v for k,v in row.items()}
-            subtype = row_lc.get("subtype") or row_lc.get("category") or ""
-            qtext = row_lc.get("question") or ""
-            options = [row_lc.get(f"option{i}", "") for i in range(1,5)]
-            correct_raw = row_lc.get("correct") or ""
-            try:
-                time_allowed = int(row_lc.get("time") or 20)
-            except:
-                time_allowed = 20
-            square_text = row_lc.get("square_text") or "100"
-            try:
-                points = int(square_text)
-            except:
-                import re
-                m = re.search(r"\d+", str(square_text))
-                points = int(m.group()) if m else 100
-            questions_raw.append({
-                "subtype": subtype.strip(),
-                "question": qtext.strip(),
-                "options": [o.strip() for o in options],
-                "correct_raw": correct_raw.strip(),
-                "correct": parse_correct_field(correct_raw.strip()),
-                "time": time_allowed,
-                "square_text": str(square_text).strip(),
-                "points": points,
-                "used": False
-            })
-
-    categories = defaultdict(list)
-    for q in questions_raw:
-        categories[q["subtype"] or "Misc"].append(q)
-    category_names = sorted(categories.keys())
-    for cat in category_names:
-        categories[cat].sort(key=lambda x:x["points"])
-    max_rows = max(len(categories[c]) for c in category_names)
+    global live_set, watcher, questions_changed
+    live_set = LiveQuestionSet(filename)
+    categories, category_names = live_set.load()
+    # A hand-written set is played as written; repeats are only pointed out
+    for clue, repeated in board_repeats(categories, played):
+        print(f"Warning: {os.path.basename(filename)}: {clue['question']!r} repeats {repeated!r}")
+    if event_log:
+        event_log.note("questions", file=os.path.basename(filename))
+    engine.reset_scores()
+    engine.load_board(categories, category_names)
+    stop_watching()
+    questions_changed = False
+    if not args.no_watch:
+        watcher = FileWatcher(filename, on_questions_changed)
+        watcher.start()
+
+def on_questions_changed(path):
+    """Watcher thread: flag the reload and wake the loop."""
+    global questions_changed
+    questions_changed = True
+    try:
+        pygame.event.post(pygame.event.Event(QUESTIONS_CHANGED))
+    except pygame.error:
+        pass  # the game is shutting down
+
+def reload_questions():
+    """Edits to the open file, applied in place: used flags and scores are kept."""
+    global questions_changed
+    questions_changed = False
+    try:
+        result = live_set.reload()
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"Reload of {live_set.path} failed: {e}")
+        return
+    if result is None:
+        return
+    categories, category_names, parsed = result
+    engine.load_board(categories, category_names)
+    if event_log:
+        event_log.note("reload", file=os.path.basename(live_set.path), rows=parsed)
+
+def stop_watching():
+    global watcher
+    if watcher is not None:
+        watcher.stop()
+        watcher = None
 
 # ---------- Grid & Board ----------
-def compute_grid():
-    avail_w = SCREEN_WIDTH - LEFT_MARGIN - RIGHT_MARGIN
-    col_w = max((avail_w - (len(category_names)-1)*TILE_MARGIN)/len(category_names), TILE_MIN_WIDTH)
-    avail_h = SCREEN_HEIGHT - TOP_MARGIN - BOTTOM_MARGIN - CATEGORY_HEIGHT - CATEGORY_PADDING
-    tile_h = max(floor((avail_h - (max_rows-1)*TILE_MARGIN)/max_rows), TILE_MIN_HEIGHT) if max_rows>0 else TILE_MIN_HEIGHT
-    return col_w, tile_h
+layouts = LayoutCache(BOARD_LAYOUT)
+
+def board_layout():
+    return layouts.get(screen.get_size(), len(engine.category_names), engine.max_rows)
+
+def on_resize(size):
+    global SCREEN_WIDTH, SCREEN_HEIGHT
+    SCREEN_WIDTH, SCREEN_HEIGHT = size
+    layouts.invalidate()
+
+def draw_scores():
+    """Team scores across the top (from shown_scores); returns the score bar rect."""
+    layout = board_layout()
+    bar = pygame.Rect(0, 0, SCREEN_WIDTH, layout.header.height)
+    screen.fill(bar, BG)
+    font_team = get_font(FONT_NAME, layout.header_font)
+    rect1 = screen.draw(screen.text(font_team, f"{engine.team_names[0]}: {shown_scores[0]}", TEXT),
+                        topleft=(layout.header.x, 10))
+    rect2 = screen.draw(screen.text(font_team, f"{engine.team_names[1]}: {shown_scores[1]}", TEXT),
+                        topright=(layout.header.right, 10))
+    current = rect1 if engine.current_team==0 else rect2
+    screen.outline(current.inflate(16, 8), HIGHLIGHT, 3)
+    return bar
 
 def draw_board():
-    screen.fill(BG)
-    # --- team scores ---
-    surf1 = font_team.render(f"{team_names[0]}: {team_scores[0]}", True, TEXT)
-    surf2 = font_team.render(f"{team_names[1]}: {team_scores[1]}", True, TEXT)
-    screen.blit(surf1,(LEFT_MARGIN,10))
-    screen.blit(surf2,(SCREEN_WIDTH-RIGHT_MARGIN-surf2.get_width(),10))
-    if current_team_idx==0:
-        pygame.draw.rect(screen,HIGHLIGHT,(LEFT_MARGIN-8,6,surf1.get_width()+16,surf1.get_height()+8),3)
-    else:
-        pygame.draw.rect(screen,HIGHLIGHT,(SCREEN_WIDTH-RIGHT_MARGIN-surf2.get_width()-8,6,surf2.get_width()+16,surf2.get_height()+8),3)
+    screen.clear(BG)
+    layout = board_layout()
+    draw_scores()
 
-    tile_w, tile_h = compute_grid()
     # --- categories ---
-    for col_idx, cat in enumerate(category_names):
-        col_x = LEFT_MARGIN + col_idx*(tile_w+TILE_MARGIN)
-        cat_rect = pygame.Rect(col_x, TOP_MARGIN, tile_w, CATEGORY_HEIGHT)
-        pygame.draw.rect(screen, CATEGORY_COLOR, cat_rect)
-        pygame.draw.rect(screen, (0,0,0), cat_rect,2)
-        cat_lines = wrap_text(cat, font_med, tile_w-20)
-        total_h = len(cat_lines)*font_med.get_height()
-        start_y = TOP_MARGIN + (CATEGORY_HEIGHT - total_h)//2
-        for i,line in enumerate(cat_lines):
-            ls = font_med.render(line, True, TEXT)
-            screen.blit(ls, (col_x + (tile_w-ls.get_width())//2, start_y + i*font_med.get_height()))
+    for col_idx, cat in enumerate(engine.category_names):
+        cat_rect = layout.category_rect(col_idx)
+        screen.fill(cat_rect, CATEGORY_COLOR)
+        screen.outline(cat_rect, (0,0,0), 2)
+        draw_fitted(screen, cat, FONT_NAME, cat_rect.inflate(-20, -8), TEXT, layout.category_font)
     # --- question tiles ---
-    for col_idx, cat in enumerate(category_names):
-        col_x = LEFT_MARGIN + col_idx*(tile_w+TILE_MARGIN)
-        for row_idx, q in enumerate(categories[cat]):
-            tile_y = TOP_MARGIN + CATEGORY_HEIGHT + CATEGORY_PADDING + row_idx*(tile_h+TILE_MARGIN)
-            rect = pygame.Rect(col_x, tile_y, tile_w, tile_h)
+    font_tile = get_font(FONT_NAME, layout.tile_font)
+    for col_idx, cat in enumerate(engine.category_names):
+        for row_idx, q in enumerate(engine.categories[cat]):
+            rect = layout.tile_rect(col_idx, row_idx)
             color = TILE_USED_COLOR if q["used"] else TILE_COLOR
-            pygame.draw.rect(screen, color, rect, border_radius=6)
-            label = q["square_text"]
-            pts = font_large.render(label, True, TEXT)
-            screen.blit(pts,(col_x+tile_w/2-pts.get_width()/2, tile_y+tile_h/2-pts.get_height()/2))
+            screen.fill(rect, color, radius=6)
+            label = "DD" if q["used"] and q.get("daily_double") else q["square_text"]
+            screen.draw(screen.text(font_tile, label, TEXT), center=rect.center)
+
+    # --- phone leaderboard ---
+    if phone_server is not None:
+        top = phone_server.leaderboard(3)
+        if top:
+            text = "Phones: " + "   ".join(f"{name} {score}" for score, name in top)
+            screen.draw(screen.text(font_small, text, TEXT), (LEFT_MARGIN, SCREEN_HEIGHT-30))
 
     # --- back button ---
     global back_button_rect
@@ -231,80 +232,108 @@ def draw_board():
     draw_back_button()
 
 def get_tile_at(pos):
-    x,y = pos
-    tile_w, tile_h = compute_grid()
-    for col_idx, cat in enumerate(category_names):
-        col_x = LEFT_MARGIN + col_idx*(tile_w+TILE_MARGIN)
-        for row_idx, q in enumerate(categories[cat]):
-            tile_y = TOP_MARGIN + CATEGORY_HEIGHT + CATEGORY_PADDING + row_idx*(tile_h+TILE_MARGIN)
-            if pygame.Rect(col_x, tile_y, tile_w, tile_h).collidepoint(x,y):
-                return col_idx,row_idx
-    return None,None
+    col, row = board_layout().tile_at(pos)
+    if col is None or engine.clue_at(col, row) is None:
+        return None, None
+    return col, row
 
 # ---------- Overlay ----------
 def open_overlay(col_idx,row_idx):
-    global showing_overlay, overlay_question, overlay_metadata
-    cat = category_names[col_idx]
-    q = categories[cat][row_idx]
-    if q["used"]:
-        return
-    showing_overlay = True
-    overlay_question = q
+    global overlay_metadata
+    if engine.open(col_idx,row_idx) is None:
+        return False
     overlay_metadata = {"col":col_idx,"row":row_idx,"option_rects":[]}
-    correct = q["correct"]
-    overlay_metadata["correct_index"] = correct if isinstance(correct,int) else None
+    return True
 
-def draw_overlay():
-    pad = 20
+def overlay_box():
     overlay_w = SCREEN_WIDTH-200
     overlay_h = SCREEN_HEIGHT-220
-    ox = (SCREEN_WIDTH-overlay_w)//2
-    oy = (SCREEN_HEIGHT-overlay_h)//2
-    pygame.draw.rect(screen, OVERLAY_BG,(ox,oy,overlay_w,overlay_h),border_radius=8)
-    pygame.draw.rect(screen, (180,180,180),(ox,oy,overlay_w,overlay_h),2,border_radius=8)
-    title = f"{overlay_question['subtype']} — {overlay_question['square_text']} pts"
-    screen.blit(font_med.render(title,True,OVERLAY_TEXT),(ox+pad,oy+pad))
-    q_lines = wrap_text(overlay_question["question"], font_med, overlay_w-2*pad)
-    for i,line in enumerate(q_lines):
-        screen.blit(font_med.render(line,True,OVERLAY_TEXT),(ox+pad,oy+pad+40+i*(font_med.get_height()+4)))
-    options_y = oy+pad+40+len(q_lines)*(font_med.get_height()+4)+20
+    return pygame.Rect((SCREEN_WIDTH-overlay_w)//2, (SCREEN_HEIGHT-overlay_h)//2, overlay_w, overlay_h)
+
+def timer_rect():
+    box = overlay_box()
+    w, h = font_large.size("00:00")
+    return pygame.Rect(box.right-20-w-8, box.y+14, w+8, h+4)
+
+def draw_timer(seconds_left):
+    r = timer_rect()
+    screen.fill(r, OVERLAY_BG)
+    color = WRONG_COLOR if seconds_left <= TIMER_WARN else OVERLAY_TEXT
+    screen.draw(screen.text(font_large, f"{seconds_left//60}:{seconds_left%60:02d}", color),
+                topright=(r.right-4, r.y+2))
+    return r
+
+def phone_count_rect():
+    box = overlay_box()
+    return pygame.Rect(box.x+20, box.bottom-14-font_small.get_height(), 260, font_small.get_height())
+
+def draw_phone_count():
+    r = phone_count_rect()
+    screen.fill(r, OVERLAY_BG)
+    screen.draw(screen.text(font_small, f"Phone answers: {phone_server.answer_count()}", OVERLAY_TEXT), r.topleft)
+    return r
+
+def overlay_title():
+    q = engine.open_clue
+    if engine.wager_kind == "final":
+        return f"{q['subtype']} — Final Jeopardy"
+    if engine.wager_kind == "daily_double" and engine.current_team in engine.wagers:
+        return f"{q['subtype']} — Daily Double, {engine.team_names[engine.current_team]} for {engine.wagers[engine.current_team]}"
+    return f"{q['subtype']} — {q['square_text']} pts"
+
+def draw_overlay(prompt=None):
+    overlay_question = engine.open_clue
+    pad = 20
+    ox, oy, overlay_w, overlay_h = box = overlay_box()
+    screen.fill(box, OVERLAY_BG, radius=8)
+    screen.outline(box, (180,180,180), 2, radius=8)
+    title = overlay_title() if prompt is None else f"{overlay_title()}: {prompt}"
+    screen.draw(screen.text(font_med, title, OVERLAY_TEXT), (ox+pad, oy+pad))
     opt_h = 56
     opt_w = overlay_w-2*pad
+    # The question gets whatever height the options and the phone counter leave
+    options_h = len(overlay_question["options"])*(opt_h+12)
+    q_rect = pygame.Rect(ox+pad, oy+pad+40, opt_w, overlay_h-2*pad-60-options_h-font_small.get_height())
+    q_h = draw_fitted(screen, overlay_question["question"], FONT_NAME, q_rect, OVERLAY_TEXT,
+                      QUESTION_FONT_MAX, FONT_SMALL, align="topleft")
+    options_y = q_rect.y+q_h+20
     option_rects=[]
     for i,opt in enumerate(overlay_question["options"]):
         r = pygame.Rect(ox+pad, options_y+i*(opt_h+12), opt_w, opt_h)
-        pygame.draw.rect(screen, TILE_COLOR,r,border_radius=6)
+        screen.fill(r, TILE_COLOR, radius=6)
         label = f"{chr(65+i)}. {opt}"
-        screen.blit(font_med.render(label,True,(255,255,255)),(r.x+12,r.y+(opt_h-font_med.get_height())//2))
+        draw_fitted(screen, label, FONT_NAME, r.inflate(-24, -8), (255,255,255), FONT_MED, FONT_SMALL-4, align="left")
         option_rects.append(r)
     overlay_metadata["option_rects"]=option_rects
 
 # ---------- Back Button ----------
 def get_back_button_rect():
-    tile_w, tile_h = compute_grid()
-    board_bottom = TOP_MARGIN + CATEGORY_HEIGHT + CATEGORY_PADDING + max_rows*(tile_h+TILE_MARGIN)
+    board_bottom = board_layout().board_bottom
     rect = pygame.Rect((SCREEN_WIDTH-200)//2, board_bottom + 20, 200, 50)
     return rect
 
 def draw_back_button():
     rect = back_button_rect
-    pygame.draw.rect(screen, TILE_COLOR, rect, border_radius=6)
-    label = font_small.render("Change Question Set", True, TEXT)
-    screen.blit(label, (rect.x + (rect.width - label.get_width())//2,
-                        rect.y + (rect.height - label.get_height())//2))
+    screen.fill(rect, TILE_COLOR, radius=6)
+    screen.draw(screen.text(font_small, "Change Question Set", TEXT), center=rect.center)
 
 # ---------- Handle click ----------
-def handle_option_click(idx):
-    global showing_overlay, current_team_idx
-    global overlay_question, overlay_metadata
-    global feedback_showing, feedback_text, feedback_color, feedback_timer
+def close_phone_clue():
+    """Score phone answers for the open clue; returns a summary to append to the feedback."""
+    if phone_server is None:
+        return ""
+    q = engine.open_clue
+    correct = q.get("correct")
+    results = phone_server.close_clue(correct if isinstance(correct, int) else None, q["points"])
+    if not results:
+        return ""
+    return f"  (phones {sum(1 for r in results if r[3])}/{len(results)})"
 
-    q = overlay_question
-    correct = overlay_metadata.get("correct_index")
-    is_correct = (idx==correct)
+def handle_option_click(idx):
+    global feedback_text, feedback_color
 
-    if is_correct:
-        team_scores[current_team_idx]+=q["points"]
+    phones = close_phone_clue()
+    if engine.choose_option(idx):
         feedback_text="CORRECT! 🎉"
         feedback_color=CORRECT_COLOR
         if sound_correct:
@@ -314,74 +343,314 @@ def handle_option_click(idx):
         feedback_color=WRONG_COLOR
         if sound_wrong:
             sound_wrong.play()
-
-    q["used"]=True
-    categories[q["subtype"]][overlay_metadata["row"]]["used"]=True
-
-    current_team_idx=1-current_team_idx
-    showing_overlay=False
-    overlay_question=None
+    feedback_text += phones
+
+    show_feedback()
+
+def handle_final_choices(choices):
+    """Judge every team's Final Jeopardy pick (a team without one is wrong) and show the wagers."""
+    global feedback_text, feedback_color
+    phones = close_phone_clue()
+    wagers = dict(engine.wagers)  # the engine forgets them once the clue closes
+    results = []
+    for team in engine.wager_teams():
+        if team in choices:
+            correct = engine.choose_option(choices[team], team)
+        else:
+            engine.judge(False, team)
+            correct = False
+        mark = "✔" if correct else "❌"
+        results.append(f"{engine.team_names[team]} {mark} {wagers[team] if correct else -wagers[team]:+d}")
+    feedback_text = "   ".join(results) + phones
+    feedback_color = CORRECT_COLOR if any("✔" in r for r in results) else WRONG_COLOR
+    if sound_correct and feedback_color == CORRECT_COLOR:
+        sound_correct.play()
+    elif sound_wrong and feedback_color == WRONG_COLOR:
+        sound_wrong.play()
+    show_feedback()
+
+def handle_timeout(choices=None):
+    global feedback_text, feedback_color
+    if engine.wager_kind == "final":
+        handle_final_choices(choices or {})
+        return
+    phones = close_phone_clue()
+    engine.judge(False)
+    feedback_text="TIME'S UP ❌" + phones
+    feedback_color=WRONG_COLOR
+    if sound_wrong:
+        sound_wrong.play()
+    show_feedback()
+
+def show_feedback():
+    global feedback_showing
     overlay_metadata.clear()
     feedback_showing=True
-    feedback_timer=FEEDBACK_DURATION
+    # One-shot timer: the board sleeps while the message is up instead of counting frames
+    pygame.time.set_timer(FEEDBACK_DONE, FEEDBACK_MS, loops=1)
+
+def hide_feedback():
+    global feedback_showing
+    feedback_showing=False
+    pygame.time.set_timer(FEEDBACK_DONE, 0)
+
+def draw_feedback(clip=None):
+    """The board dimmed with the message on top; with clip, just that area of it."""
+    screen.shade(clip or (0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), FEEDBACK_SHADE)
+    screen.draw(screen.text(font_large, feedback_text, feedback_color),
+                center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2), clip=clip)
+
+def cover_feedback(rect):
+    """Re-apply the feedback card over an area an animation just repainted."""
+    if feedback_showing:
+        draw_feedback(rect)
+
+# ---------- Animations ----------
+def count_score(team, start, end):
+    def draw(surface, p):
+        shown_scores[team] = round(start + (end-start)*p)
+        rect = draw_scores()
+        cover_feedback(rect)
+        return rect
+    scenes.animator.add(Tween(COUNT_MS, draw))
+
+def flip_tile(col, row):
+    """The answered tile turns over: it squashes to a line and opens up grey."""
+    layout = board_layout()
+    rect = layout.tile_rect(col, row)
+    label = screen.text(get_font(FONT_NAME, layout.tile_font), engine.clue_at(col, row)["square_text"], TEXT)
+    label_w, label_h = label.get_rect().size
+    def draw(surface, p):
+        surface.fill(rect, BG)
+        squash = abs(1 - 2*p)
+        face = rect.inflate(0, -round(rect.height*(1-squash)))
+        if face.height > 0:
+            front = p < 0.5
+            surface.fill(face, TILE_COLOR if front else TILE_USED_COLOR, radius=6)
+            if front and label_h*squash >= 1:
+                surface.draw(label, size=(label_w, round(label_h*squash)), center=rect.center)
+        cover_feedback(rect)
+        return rect
+    scenes.animator.add(Tween(FLIP_MS, draw, ease=linear))
+
+def zoom_to_clue(col, row, on_done):
+    """Grow the clicked tile into the question card, then open it."""
+    start, end = board_layout().tile_rect(col, row), overlay_box()
+    def draw(surface, p):
+        box = pygame.Rect(start.x + (end.x-start.x)*p, start.y + (end.y-start.y)*p,
+                          start.w + (end.w-start.w)*p, start.h + (end.h-start.h)*p)
+        surface.fill(box, OVERLAY_BG, radius=8)
+        return box
+    scenes.animator.add(Tween(ZOOM_MS, draw, on_done))
+
+def animate_engine_event(event):
+    kind = event["type"]
+    if kind == "board":
+        shown_scores[:] = engine.scores
+    elif kind in ("judge", "score") and event["delta"]:
+        count_score(event["team"], event["score"]-event["delta"], event["score"])
+    elif kind == "close" and event["used"]:
+        played.add(clue_text(engine.clue_at(event["col"], event["row"])))
+        flip_tile(event["col"], event["row"])
+
+# ---------- Scenes ----------
+class FileSelectScene(Scene):
+    def draw(self, surface):
+        draw_file_selection()
 
-def draw_feedback():
-    s = pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT),pygame.SRCALPHA)
-    s.fill((0,0,0,180))
-    screen.blit(s,(0,0))
-    surf = font_large.render(feedback_text,True,feedback_color)
-    screen.blit(surf,((SCREEN_WIDTH-surf.get_width())//2,(SCREEN_HEIGHT-surf.get_height())//2))
+    def handle(self, e):
+        if e.type==pygame.MOUSEBUTTONDOWN and e.button==1:
+            for f, rect in file_rects():
+                if rect.collidepoint(e.pos):
+                    load_questions(os.path.join(QUESTION_DIR,f))
+                    self.manager.replace(BoardScene())
+                    break
+
+class BoardScene(Scene):
+    def update(self, dt):
+        # Polled: the file may change while a clue is open, and the board must not change under it
+        if questions_changed and engine.open_cell is None:
+            reload_questions()
+            self.manager.invalidate()
+
+    def draw(self, surface):
+        draw_board()
+        if feedback_showing:
+            draw_feedback()
 
-# ---------- Main loop ----------
-running=True
-back_button_rect = pygame.Rect(0,0,0,0)  # initialize
-while running:
-    clock.tick(FPS)
-    mx,my = 0,0
-    for e in pygame.event.get():
-        if e.type==pygame.QUIT:
-            running=False
+    def handle(self, e):
+        if e.type==FEEDBACK_DONE:
+            hide_feedback()
+            self.manager.invalidate()
         elif e.type==pygame.MOUSEBUTTONDOWN and e.button==1:
-            mx,my = e.pos
-            if showing_file_select:
-                start_y = 100 - file_select_scroll
-                for i, f in enumerate(question_files):
-                    rect = pygame.Rect(LEFT_MARGIN, start_y + i*(file_select_item_h+file_select_pad),
-                                       SCREEN_WIDTH-LEFT_MARGIN-RIGHT_MARGIN, file_select_item_h)
-                    if rect.collidepoint(mx,my):
-                        load_questions(os.path.join(QUESTION_DIR,f))
-                        showing_file_select = False
-                        break
-            elif showing_overlay:
-                for i,r in enumerate(overlay_metadata.get("option_rects",[])):
-                    if r.collidepoint(mx,my):
-                        handle_option_click(i)
-                        break
+            if engine.open_cell is not None:
+                return  # a tile is already zooming open
+            col,row = get_tile_at(e.pos)
+            if col is not None:
+                if open_overlay(col,row):
+                    hide_feedback()
+                    self.manager.invalidate()
+                    zoom_to_clue(col, row, lambda: self.manager.push(
+                        WagerScene() if engine.phase == "wager" else ClueScene()))
+            elif back_button_rect.collidepoint(e.pos):
+                overlay_metadata.clear()
+                hide_feedback()
+                stop_watching()
+                engine.reset_scores()
+                engine.clear_board()
+                self.manager.replace(FileSelectScene())
+
+class WagerScene(Scene):
+    """
+    Wagers before a daily double (the team whose turn it is) or Final Jeopardy
+    (each team in turn, typed as dots so the other team can't read it). Digits
+    and Enter; the engine checks the amount and a refused one shows why.
+    """
+    overlay = True
+
+    def __init__(self):
+        super().__init__()
+        self.typed = ""
+        self.error = None
+
+    def team(self):
+        return next(t for t in engine.wager_teams() if t not in engine.wagers)
+
+    def draw(self, surface):
+        pad = 20
+        box = overlay_box()
+        surface.fill(box, OVERLAY_BG, radius=8)
+        surface.outline(box, (180,180,180), 2, radius=8)
+        q = engine.open_clue
+        final = engine.wager_kind == "final"
+        title = "FINAL JEOPARDY" if final else "DAILY DOUBLE"
+        surface.draw(surface.text(font_large, title, HIGHLIGHT), midtop=(box.centerx, box.y + pad))
+        surface.draw(surface.text(font_med, f"Category: {q['subtype']}", OVERLAY_TEXT), (box.x+pad, box.y+pad+60))
+        team = self.team()
+        low, high = engine.wager_range(team)
+        prompt = f"{engine.team_names[team]}, your wager ({low} to {high}), then Enter"
+        surface.draw(surface.text(font_med, prompt, OVERLAY_TEXT), (box.x+pad, box.centery-70))
+        entry = pygame.Rect(box.centerx-150, box.centery-20, 300, 50)
+        surface.fill(entry, (255,255,255))
+        surface.outline(entry, HIGHLIGHT, 3)
+        shown = "*" * len(self.typed) if final else self.typed
+        surface.draw(surface.text(font_large, shown + "_", OVERLAY_TEXT), midleft=(entry.x+10, entry.centery))
+        if self.error:
+            surface.draw(surface.text(font_med, self.error, WRONG_COLOR), midtop=(box.centerx, entry.bottom+20))
+
+    def handle(self, e):
+        if e.type != pygame.KEYDOWN:
+            return
+        if e.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            try:
+                engine.set_wager(self.typed, self.team())
+            except ValueError as err:
+                self.error = str(err)
             else:
-                col,row = get_tile_at((mx,my))
-                if col is not None:
-                    open_overlay(col,row)
-                elif back_button_rect.collidepoint(mx,my):
-                    showing_file_select = True
-                    overlay_question = None
-                    overlay_metadata.clear()
-                    feedback_showing = False
-                    team_scores = [0,0]
-                    current_team_idx = 0
-
-    if showing_file_select:
-        draw_file_selection()
-    else:
-        draw_board()
-        if showing_overlay:
+                self.error = None
+                if engine.phase == "clue":  # every team has wagered
+                    self.manager.replace(ClueScene())
+                    return
+            self.typed = ""
+        elif e.key == pygame.K_BACKSPACE:
+            self.typed = self.typed[:-1]
+        elif e.unicode and e.unicode.isdigit() and len(self.typed) < 7:
+            self.typed += e.unicode
+        self.manager.invalidate()
+
+class ClueScene(Scene):
+    """
+    The question card. Counts down the clue's `time` column: a 1 s timer event
+    repaints only the clock, and the loop sleeps in between. Seconds left are
+    derived from get_ticks(), so a late tick never makes the clock drift.
+    In Final Jeopardy each team picks an option in turn; the picks are judged
+    together once the last team has chosen (or time runs out).
+    """
+    overlay = True  # the board stays visible around the question card
+
+    def __init__(self):
+        super().__init__()
+        self.time_allowed = engine.open_clue["time"]
+        self.started = None
+        self.final_choices = {}  # team -> option index, Final Jeopardy only
+
+    def choosing_team(self):
+        return next((t for t in engine.wager_teams() if t not in self.final_choices), None)
+
+    def seconds_left(self):
+        elapsed = (pygame.time.get_ticks() - self.started) // 1000
+        return max(0, self.time_allowed - elapsed)
+
+    def enter(self):
+        if self.started is None:
+            self.started = pygame.time.get_ticks()
+            pygame.time.set_timer(TIMER_TICK, 1000)
+            if phone_server is not None:
+                q = engine.open_clue
+                phone_server.open_clue(q["question"], q["options"])
+
+    def exit(self):
+        pygame.time.set_timer(TIMER_TICK, 0)
+
+    def draw(self, surface):
+        if engine.wager_kind == "final":
+            draw_overlay(f"{engine.team_names[self.choosing_team()]}, pick your answer")
+        else:
             draw_overlay()
-        if feedback_showing:
-            draw_feedback()
-            feedback_timer -= 1
-            if feedback_timer<=0:
-                feedback_showing=False
+        draw_timer(self.seconds_left())
+        if phone_server is not None:
+            draw_phone_count()
+
+    def handle(self, e):
+        if e.type==ANSWER_EVENT and phone_server is not None:
+            # One wake-up per batch of phone answers; only the counter is repainted
+            phone_server.drain()
+            self.manager.update_rects(draw_phone_count())
+        elif e.type==TIMER_TICK:
+            left = self.seconds_left()
+            if left <= 0:
+                handle_timeout(self.final_choices)
+                self.manager.pop()
+            else:
+                self.manager.update_rects(draw_timer(left))
+        elif e.type==pygame.MOUSEBUTTONDOWN and e.button==1:
+            for i,r in enumerate(overlay_metadata.get("option_rects",[])):
+                if r.collidepoint(e.pos):
+                    if engine.wager_kind == "final":
+                        self.final_choices[self.choosing_team()] = i
+                        if self.choosing_team() is not None:
+                            self.manager.invalidate()  # next team's turn to pick
+                            break
+                        handle_final_choices(self.final_choices)
+                    else:
+                        handle_option_click(i)
+                    self.manager.pop()
+                    break
 
-    pygame.display.flip()
+# ---------- Main loop ----------
+back_button_rect = pygame.Rect(0,0,0,0)  # initialize
+scenes = SceneManager(screen, FPS)
+scenes.resize_handlers.append(on_resize)
+engine.listeners.append(animate_engine_event)
+if args.serve is not None:
+    phone_server = AnswerServer(port=args.serve)
+    print(f"Phones can answer at http://<this machine>:{phone_server.start()}/")
+    scenes.quit_handlers.append(phone_server.stop)
+if args.mirror is not None:
+    mirror = MirrorPublisher(engine, port=args.mirror)
+    print(f"Mirror: python jeopardy_mirror.py {mirror.start()}")
+    scenes.quit_handlers.append(mirror.close)
+if not args.no_log:
+    event_log = EventLog(engine, log_path(args.log_dir))
+    event_log.start()
+    scenes.quit_handlers.append(event_log.close)
+scenes.quit_handlers.append(stop_watching)
+startup.mark("servers")
+font_small, font_med, font_large = startup.wait(fonts, "fonts")
+sound_correct, sound_wrong = startup.wait(sounds, "sounds")
+startup.ready()
+scenes.push(FileSelectScene())
+scenes.run()
 
 pygame.quit()
 
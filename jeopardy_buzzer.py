@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+jeopardy_buzzer.py - Buzz-in for N players from keyboard, gamepads and phones
+
+Every buzz is stamped with time.perf_counter_ns() as soon as it reaches us:
+socket buzzes on their own receiver thread, keyboard and gamepad buzzes when
+SDL's queue is pumped. SDL keeps input in arrival order, so a slow frame can
+delay a keyboard buzz but never reorder it against another keyboard buzz.
+
+The hub does not pick a winner on the first buzz it sees. It waits a short
+settle window (SETTLE_NS) after the first buzz so a buzz that happened
+earlier but arrived through a slower path still wins, then takes the lowest
+timestamp. Buzzing before the clue is armed locks that player out briefly,
+like the real show.
+
+Phone buzzers send a UDP datagram "BUZZ <player>" to the buzz port, and
+for typed play "ANSWER <player> <response text>" (UTF-8) once they have
+the turn; take_answers() hands those to the game for judging.
+"""
+
+import socket, threading, time
+import pygame
+
+SETTLE_NS = 5_000_000          # 5 ms
+LOCKOUT_NS = 250_000_000       # early buzz penalty
+DEFAULT_BUZZ_PORT = 5005
+# Number row: 1 buzzes player 0, 2 buzzes player 1, ...
+DEFAULT_KEYS = [pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5,
+                pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]
+
+BUZZ_EVENT = pygame.event.custom_type()
+
+
+class BuzzerHub:
+    def __init__(self, num_players, keys=None):
+        self.num_players = num_players
+        self.keys = {k: i for i, k in enumerate((keys or DEFAULT_KEYS)[:num_players])}
+        self.joysticks = {}  # instance_id -> player
+        self.lock = threading.Lock()
+        self.armed = False
+        self.armed_at = 0
+        self.buzzes = []        # (timestamp_ns, player, source) since arming
+        self.locked_until = {}  # player -> timestamp_ns
+        self.winner = None
+        self.answers = []       # (player, text) typed on phones, until taken
+        self.receiver = None
+
+    # ---------- Sources ----------
+    def add_joysticks(self):
+        """Give each connected gamepad to the next player, in connection order."""
+        if not pygame.joystick.get_init():
+            pygame.joystick.init()
+        for i in range(pygame.joystick.get_count()):
+            js = pygame.joystick.Joystick(i)
+            self.joysticks[js.get_instance_id()] = len(self.joysticks) % self.num_players
+
+    def listen(self, port=DEFAULT_BUZZ_PORT, host="0.0.0.0"):
+        """Start a UDP receiver thread for phone buzzers."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        self.receiver = sock
+        threading.Thread(target=self._receive, args=(sock,), daemon=True).start()
+        return sock.getsockname()[1]
+
+    def _receive(self, sock):
+        while True:
+            try:
+                data, _ = sock.recvfrom(1024)
+            except OSError:
+                return  # socket closed
+            stamp = time.perf_counter_ns()
+            parts = data.split(None, 2)
+            if len(parts) == 2 and parts[0] == b"BUZZ" and parts[1].isdigit():
+                self.buzz(int(parts[1]), "socket", stamp)
+            elif len(parts) == 3 and parts[0] == b"ANSWER" and parts[1].isdigit():
+                with self.lock:
+                    self.answers.append((int(parts[1]), parts[2].decode("utf-8", "replace")))
+            else:
+                continue
+            # Wake the main loop if it is idle in event.wait()
+            pygame.event.post(pygame.event.Event(BUZZ_EVENT))
+
+    def close(self):
+        if self.receiver is not None:
+            self.receiver.close()
+            self.receiver = None
+
+    def feed(self, event):
+        """Pass pygame events through; returns True if the event was a buzz."""
+        if event.type == pygame.KEYDOWN and event.key in self.keys:
+            self.buzz(self.keys[event.key], "key")
+            return True
+        if event.type == pygame.JOYBUTTONDOWN and event.instance_id in self.joysticks:
+            self.buzz(self.joysticks[event.instance_id], "joystick")
+            return True
+        if event.type == pygame.JOYDEVICEADDED:
+            self.add_joysticks()
+        return event.type == BUZZ_EVENT
+
+    # ---------- Arbitration ----------
+    def arm(self):
+        with self.lock:
+            self.armed = True
+            self.armed_at = time.perf_counter_ns()
+            self.buzzes = []
+            self.winner = None
+            self.answers = []
+
+    def disarm(self):
+        with self.lock:
+            self.armed = False
+
+    def buzz(self, player, source, stamp=None):
+        stamp = time.perf_counter_ns() if stamp is None else stamp
+        if not 0 <= player < self.num_players:
+            return
+        with self.lock:
+            if not self.armed:
+                self.locked_until[player] = stamp + LOCKOUT_NS
+                return
+            if stamp < self.locked_until.get(player, 0) or self.winner is not None:
+                return
+            self.buzzes.append((stamp, player, source))
+
+    def poll(self, now=None):
+        """Return the winning player once the settle window has passed, else None."""
+        now = time.perf_counter_ns() if now is None else now
+        with self.lock:
+            if self.winner is None and self.buzzes:
+                first = min(self.buzzes)
+                if now - first[0] >= SETTLE_NS:
+                    self.winner = first[1]
+                    self.armed = False
+            return self.winner
+
+    def take_answers(self):
+        """Typed answers received since the last call, oldest first."""
+        with self.lock:
+            answers, self.answers = self.answers, []
+        return answers
+
+    def pending(self):
+        """True while a buzz is waiting out the settle window."""
+        return self.winner is None and bool(self.buzzes)
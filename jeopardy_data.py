@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+jeopardy_data.py - Dataset loading and episode index for the GitHub Jeopardy dataset
+"""
+
+import csv, hashlib, json, os, re
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import date, timedelta
+
+# CJK ideographs, kana, Hangul, CJK/fullwidth punctuation (a regex character class)
+CJK_CHARS = ("⺀-⿿　-ヿ㄀-ㇿ㈀-鿿가-힯"
+             "豈-﫿︰-﹏＀-￯\U00020000-\U0002fa1f")
+
+# ---------- Loading ----------
+def read_rounds(filename, rounds_dict=None):
+    """Parse a season TSV into {(air_date, round): {category: [clue, ...]}}."""
+    if rounds_dict is None:
+        rounds_dict = {}
+    with open(filename, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f, delimiter='\t')
+        for row in reader:
+            # Ensure core fields exist before processing
+            if row.get('air_date') and row.get('round') and row.get('category') and row.get('answer'):
+                try:
+                    points = int(row.get('clue_value') or row.get('cluevalue') or 0)
+                except ValueError:
+                    points = 0
+
+                clue = {
+                    'question': row['answer'].strip(),
+                    'answer': row['question'].strip(),
+                    'points': points,
+                    'used': False
+                }
+                air_date = row['air_date'].strip()
+                try:
+                    rnd = int(row['round'])
+                except ValueError:
+                    rnd = 1 # Default to round 1 if unparsable
+                # Flags only where set, to keep the clue dicts of big datasets small
+                if rnd >= 3:
+                    clue['final'] = True
+                elif parse_amount(row.get('daily_double_value')) > 0:
+                    clue['daily_double'] = True
+
+                category = row['category'].strip()
+                key = (air_date, rnd)
+                if key not in rounds_dict:
+                    rounds_dict[key] = {}
+                if category not in rounds_dict[key]:
+                    rounds_dict[key][category] = []
+                rounds_dict[key][category].append(clue)
+    return rounds_dict
+
+def parse_amount(text):
+    """Dollar amount from "1000", "$1,000" or "" (0)."""
+    digits = re.sub(r"[^\d]", "", text or "")
+    return int(digits) if digits else 0
+
+# ---------- Question sets (q*.txt) ----------
+def detect_delimiter(header_line):
+    return "\t" if "\t" in header_line else ","
+
+def parse_correct_field(correct_field):
+    if not correct_field:
+        return None
+    c = correct_field.strip()
+    if len(c) == 1 and c in "1234":
+        return int(c)-1
+    if len(c) == 1 and c.upper() in "ABCD":
+        return ord(c.upper()) - ord("A")
+    return c
+
+def parse_question_row(row):
+    row_lc = {k.strip(): v for k,v in row.items()}
+    subtype = row_lc.get("subtype") or row_lc.get("category") or ""
+    qtext = row_lc.get("question") or ""
+    options = [row_lc.get(f"option{i}", "") for i in range(1,5)]
+    correct_raw = row_lc.get("correct") or ""
+    try:
+        time_allowed = int(row_lc.get("time") or 20)
+    except:
+        time_allowed = 20
+    square_text = row_lc.get("square_text") or "100"
+    final = str(square_text).strip().upper().startswith("FINAL")
+    try:
+        points = int(square_text)
+    except:
+        m = re.search(r"\d+", str(square_text))
+        points = 0 if final else int(m.group()) if m else 100
+    # Optional column: "daily_double" (yes/1/x) or "daily_double_value" (a wager > 0)
+    dd_raw = (row_lc.get("daily_double") or row_lc.get("daily_double_value") or "").strip().lower()
+    daily_double = dd_raw in ("y", "yes", "true", "x", "dd") or parse_amount(dd_raw) > 0
+    return {
+        "subtype": subtype.strip(),
+        "question": qtext.strip(),
+        "options": [o.strip() for o in options],
+        "correct_raw": correct_raw.strip(),
+        "correct": parse_correct_field(correct_raw.strip()),
+        "time": time_allowed,
+        "square_text": str(square_text).strip(),
+        "points": points,
+        "daily_double": daily_double and not final,
+        "final": final,
+        "used": False
+    }
+
+def read_question_file(filename):
+    """Parse a multiple-choice q*.txt set. Returns (categories, category_names)."""
+    with open(filename,"r",encoding="utf-8",newline="") as fh:
+        header_line = fh.readline()
+        delimiter = detect_delimiter(header_line)
+    questions_raw = []
+    with open(filename,"r",encoding="utf-8",newline="") as fh:
+        reader = csv.DictReader(fh, delimiter=delimiter)
+        for row in reader:
+            questions_raw.append(parse_question_row(row))
+    return group_questions(questions_raw)
+
+def group_questions(questions_raw):
+    """Parsed rows -> (categories, category_names), each category sorted by points."""
+    categories = defaultdict(list)
+    for q in questions_raw:
+        categories[q["subtype"] or "Misc"].append(q)
+    category_names = sorted(categories.keys())
+    for cat in category_names:
+        categories[cat].sort(key=lambda x:(x["final"], x["points"]))
+    return dict(categories), category_names
+
+def clue_response(clue):
+    """The expected response: a dataset clue's answer, or a q*.txt clue's correct option."""
+    if "answer" in clue:
+        return clue["answer"]
+    correct, options = clue.get("correct"), clue.get("options") or []
+    return options[correct] if isinstance(correct, int) and correct < len(options) else ""
+
+# ---------- Sharded datasets ----------
+MANIFEST_NAME = "manifest.json"
+
+def file_checksum(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def read_manifest(dataset_dir):
+    """Return the manifest dict of a dataset directory, or None if it has none."""
+    path = os.path.join(dataset_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def write_manifest(dataset_dir, manifest):
+    # Write then rename so a crash never leaves a half-written manifest behind
+    path = os.path.join(dataset_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
+
+def select_shards(manifest, start=None, end=None):
+    """Manifest entries whose [first_date, last_date] range overlaps [start, end]."""
+    selected = []
+    for entry in manifest["shards"]:
+        if start and entry["last_date"] < start:
+            continue
+        if end and entry["first_date"] > end:
+            continue
+        selected.append(entry)
+    return selected
+
+def verify_dataset(dataset_dir):
+    """Return a list of (shard file, problem) for shards that are missing or fail their checksum."""
+    problems = []
+    manifest = read_manifest(dataset_dir)
+    if manifest is None:
+        return [(MANIFEST_NAME, "missing")]
+    for entry in manifest["shards"]:
+        path = os.path.join(dataset_dir, entry["file"])
+        if not os.path.exists(path):
+            problems.append((entry["file"], "missing"))
+        elif file_checksum(path) != entry["sha256"]:
+            problems.append((entry["file"], "checksum mismatch"))
+    return problems
+
+def read_dataset(path, start=None, end=None):
+    """
+    Load a single TSV, or a dataset directory written by jeopardy_preprocess.py.
+
+    With a manifest, only shards overlapping the [start, end] air-date range are
+    opened; rounds outside the range are dropped. Directories without a
+    manifest fall back to loading every *.tsv in them.
+    """
+    if not os.path.isdir(path):
+        rounds_dict = read_rounds(path)
+    else:
+        rounds_dict = {}
+        manifest = read_manifest(path)
+        if manifest is not None:
+            files = [entry["file"] for entry in select_shards(manifest, start, end)]
+        else:
+            files = sorted(name for name in os.listdir(path) if name.endswith(".tsv"))
+        for name in files:
+            read_rounds(os.path.join(path, name), rounds_dict)
+    if start or end:
+        for key in [k for k in rounds_dict if (start and k[0] < start) or (end and k[0] > end)]:
+            del rounds_dict[key]
+    return rounds_dict
+
+def read_episodes(path, dates):
+    """
+    The rounds aired on `dates`. With a manifest only the shards holding those
+    dates are read; a single TSV (or a directory without one) is read whole.
+    """
+    manifest = read_manifest(path) if os.path.isdir(path) else None
+    if manifest is None:
+        rounds_dict = read_dataset(path)
+    else:
+        rounds_dict = {}
+        files = sorted({entry["file"] for d in dates for entry in select_shards(manifest, d, d)})
+        for name in files:
+            read_rounds(os.path.join(path, name), rounds_dict)
+    dates = set(dates)
+    return {key: value for key, value in rounds_dict.items() if key[0] in dates}
+
+# ---------- Episode index ----------
+def _parse_date(text):
+    return date.fromisoformat(text[:10])
+
+def _add_months(d, months):
+    m = d.month - 1 + months
+    y = d.year + m // 12
+    m = m % 12 + 1
+    # Clamp the day so Jan 31 + 1 month lands on the end of February
+    for day in (d.day, 30, 29, 28):
+        try:
+            return date(y, m, day)
+        except ValueError:
+            continue
+
+class EpisodeIndex:
+    """
+    Sorted index over (air_date, round) keys.
+
+    Air dates are ISO strings, so they sort (and bisect) correctly as text.
+    Positions are indices into `keys`, which is the same order as the old
+    `rounds_list`, so the board can keep using a single integer cursor.
+    """
+
+    def __init__(self, rounds_dict):
+        self.rounds = rounds_dict
+        self.keys = sorted(rounds_dict.keys())
+        self.position = {key: i for i, key in enumerate(self.keys)}
+        # One entry per episode: its air date and the position of its first round
+        self.dates = []
+        self.date_start = []
+        for i, (air_date, _) in enumerate(self.keys):
+            if not self.dates or self.dates[-1] != air_date:
+                self.dates.append(air_date)
+                self.date_start.append(i)
+        self.episode_of_date = {d: n for n, d in enumerate(self.dates)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __getitem__(self, key):
+        return self.rounds[key]
+
+    def key_at(self, pos):
+        return self.keys[pos]
+
+    def episode_count(self):
+        return len(self.dates)
+
+    def episode_number(self, pos):
+        """0-based episode number of the round at `pos`."""
+        return self.episode_of_date[self.keys[pos][0]]
+
+    def episode(self, n):
+        """Position of the first round of the nth (0-based) episode, clamped."""
+        if not self.dates:
+            return 0
+        n = max(0, min(len(self.dates) - 1, n))
+        return self.date_start[n]
+
+    def seek_date(self, air_date):
+        """Position of the first round on or after `air_date` (clamped to the last episode)."""
+        return self.episode(bisect_left(self.dates, air_date))
+
+    def jump_days(self, pos, days):
+        target = _parse_date(self.keys[pos][0]) + timedelta(days=days)
+        return self._jump_to(pos, target.isoformat(), days)
+
+    def jump_months(self, pos, months):
+        target = _add_months(_parse_date(self.keys[pos][0]), months)
+        return self._jump_to(pos, target.isoformat(), months)
+
+    def _jump_to(self, pos, air_date, direction):
+        n = bisect_left(self.dates, air_date)
+        if direction < 0 and (n >= len(self.dates) or self.dates[n] != air_date):
+            # Going backwards, land on the last episode aired on or before the target
+            n -= 1
+        return self.episode(n)
+
+    def seek(self, text, pos=0):
+        """
+        Resolve a text entry to a position. Accepts:
+          YYYY-MM-DD / YYYY-MM / YYYY   first episode on or after that date
+          #N                            Nth episode (1-based)
+          +Nd / -Nw / +Nm               relative jump in days, weeks or months
+        Returns None if the text cannot be parsed.
+        """
+        text = text.strip()
+        if not text or not self.keys:
+            return None
+        try:
+            if text[0] == "#":
+                return self.episode(int(text[1:]) - 1)
+            if text[0] in "+-" and text[-1].lower() in "dwm":
+                amount = int(text[:-1])
+                unit = text[-1].lower()
+                if unit == "m":
+                    return self.jump_months(pos, amount)
+                return self.jump_days(pos, amount * (7 if unit == "w" else 1))
+            parts = text.split("-")
+            if not all(p.isdigit() for p in parts) or len(parts) > 3:
+                return None
+            year = parts[0]
+            month = parts[1].zfill(2) if len(parts) > 1 else "01"
+            day = parts[2].zfill(2) if len(parts) > 2 else "01"
+            target = f"{year}-{month}-{day}"
+            _parse_date(target)  # reject impossible dates like 1984-13-01
+            return self.seek_date(target)
+        except ValueError:
+            return None
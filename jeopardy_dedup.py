@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+jeopardy_dedup.py - Find near-duplicate clues with MinHash signatures and LSH buckets
+
+Usage: python jeopardy_dedup.py PATH ... [--threshold 0.6] [--workers N] [--show N] [--save INDEX]
+
+PATH is a q*.txt question set, a season TSV or a dataset directory from
+jeopardy_preprocess.py. Prints the groups of clues that repeat the same
+fact; --save writes them as JSON for board builders (load_groups()).
+
+Each clue (clue text plus response) is reduced to its set of word pairs;
+CJK text has no spaces, so there each character counts as a word. Clues
+with fewer than MIN_SHINGLES pairs are never matched: in a clue that short
+one changed word moves the similarity by 0.1 or more. A clue's MinHash
+signature holds, for each of SIG_SIZE hash functions, the
+smallest hash over those pairs; two signatures agree in a fraction of
+places that estimates the Jaccard similarity of the two sets. The values
+are 16 bits, packed 17 bits apart into one Python int, so the element-wise
+minimum over a clue's pairs is a few big-int operations rather than a loop
+over values. Signatures are computed in a process pool.
+
+LSH cuts each signature into BANDS bands of ROWS values; clues with an
+identical band share a bucket and only those candidates are compared, so
+the work grows with the number of clues rather than the number of pairs.
+SIG_SIZE values estimate a similarity too roughly to decide on, so each
+candidate pair is confirmed with the exact Jaccard similarity of the two
+sets of pairs. Confirmed pairs are merged into groups.
+
+DedupIndex is the incremental side for the games: add() each clue as it
+is played, and board_repeats() finds the clues on a new board that repeat
+one played tonight (or an earlier clue on the same board).
+exclude_near_duplicates() flags those as excluded, which the engine and
+board skip; `used` is left alone, so a snapshot still records only what
+was played. jeopardy_game.py does that for dataset boards on every visit,
+while jeopardy.py only warns, since a hand-written q*.txt set repeats a
+clue on purpose.
+"""
+
+import argparse, hashlib, json, os, re, sys, time
+from multiprocessing import Pool
+
+from jeopardy_data import CJK_CHARS, clue_response
+
+SIG_SIZE = 30         # hash values per signature; 30 * 17 bits fit one 64-byte digest
+BANDS, ROWS = 10, 3   # candidates from ~0.45 similarity up; confirmed at the threshold
+THRESHOLD = 0.6       # Jaccard similarity of word pairs for a near-duplicate
+MIN_SHINGLES = 8      # clues with fewer word pairs are too short to judge
+MAX_BUCKET_CHECKS = 8  # members of one bucket compared against a new clue
+
+FIELD_BITS = 17
+VALUES = sum(0xFFFF << (FIELD_BITS * i) for i in range(SIG_SIZE))
+GUARDS = sum(1 << (FIELD_BITS * i + 16) for i in range(SIG_SIZE))
+BAND_MASK = (1 << (FIELD_BITS * ROWS)) - 1
+
+_words_re = re.compile(f"[0-9a-z]+|[{CJK_CHARS}]")
+
+# ---------- Signatures ----------
+def clue_text(clue):
+    """What is compared: the clue and its response (or, for q*.txt, the correct option)."""
+    return f"{clue['question']} {clue_response(clue)}"
+
+def shingles(text):
+    words = _words_re.findall(text.lower())
+    if len(words) < 2:
+        return [tuple(words)] if words else []
+    return list(zip(words, words[1:]))
+
+_values = {}  # shingle -> packed hash values, per process
+
+def _shingle_values(shingle):
+    digest = hashlib.blake2b(" ".join(shingle).encode(), digest_size=64).digest()
+    return int.from_bytes(digest, "little") & VALUES
+
+def _packed_min(a, b):
+    # Per 17-bit field: (guard | a) - b keeps the guard bit iff a >= b; no borrow crosses fields
+    ge = ((a | GUARDS) - b) & GUARDS
+    take_b = ge - (ge >> 16)
+    return (b & take_b) | (a & ~take_b & VALUES)
+
+def signature(text):
+    return pairs_signature(set(shingles(text)))
+
+def pairs_signature(pairs):
+    """Packed MinHash signature of a set of word pairs, or None if it has fewer than MIN_SHINGLES."""
+    if len(pairs) < MIN_SHINGLES:
+        return None
+    sig = None
+    for shingle in pairs:
+        values = _values.get(shingle)
+        if values is None:
+            values = _values[shingle] = _shingle_values(shingle)
+        sig = values if sig is None else _packed_min(sig, values)
+    return sig
+
+def signatures(texts):
+    return [signature(text) for text in texts]
+
+def jaccard(a, b):
+    """Exact Jaccard similarity of two sets of word pairs."""
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def band_keys(sig):
+    return [(sig >> (FIELD_BITS * ROWS * band)) & BAND_MASK for band in range(BANDS)]
+
+def clue_id(clue):
+    """Stable short id for a clue, used in saved indexes."""
+    text = " ".join(_words_re.findall(clue_text(clue).lower()))
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+# ---------- Grouping ----------
+def find_groups(sigs, texts, threshold=THRESHOLD):
+    """
+    Groups (lists of indexes, 2+ members) of near-duplicate clues: candidates
+    share a band of their signatures, and are confirmed on `texts`.
+    None signatures are skipped.
+    """
+    parent = list(range(len(sigs)))
+    pairs = {}  # index -> set of word pairs, for candidates only
+
+    def pairs_of(i):
+        if i not in pairs:
+            pairs[i] = set(shingles(texts[i]))
+        return pairs[i]
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(BANDS):
+        shift = FIELD_BITS * ROWS * band
+        buckets = {}
+        for i, sig in enumerate(sigs):
+            if sig is None:
+                continue
+            bucket = buckets.setdefault((sig >> shift) & BAND_MASK, [])
+            root = find(i)
+            for j in bucket[:MAX_BUCKET_CHECKS]:
+                if find(j) == root:
+                    break
+                if jaccard(pairs_of(i), pairs_of(j)) >= threshold:
+                    parent[find(j)] = root
+                    break
+            else:
+                # Only unmatched clues join the bucket; a group is found through its first member
+                bucket.append(i)
+
+    groups = {}
+    for i in range(len(sigs)):
+        if sigs[i] is not None:
+            groups.setdefault(find(i), []).append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+def compute_signatures(texts, workers=None, chunk=20000):
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(texts) <= chunk:
+        return signatures(texts)
+    chunks = [texts[i:i + chunk] for i in range(0, len(texts), chunk)]
+    with Pool(workers) as pool:
+        return [sig for part in pool.map(signatures, chunks) for sig in part]
+
+# ---------- Incremental index ----------
+class DedupIndex:
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+        self.pairs = []  # set of word pairs per item
+        self.items = []
+        self.buckets = [{} for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, text, item=None):
+        pairs = set(shingles(text))
+        sig = pairs_signature(pairs)
+        if sig is None:
+            return
+        idx = len(self.pairs)
+        self.pairs.append(pairs)
+        self.items.append(text if item is None else item)
+        for band, key in enumerate(band_keys(sig)):
+            self.buckets[band].setdefault(key, []).append(idx)
+
+    def near_duplicates(self, text):
+        """Items added earlier that `text` nearly repeats."""
+        pairs = set(shingles(text))
+        sig = pairs_signature(pairs)
+        if sig is None:
+            return []
+        seen, found = set(), []
+        for band, key in enumerate(band_keys(sig)):
+            for idx in self.buckets[band].get(key, ()):
+                if idx not in seen:
+                    seen.add(idx)
+                    if jaccard(pairs, self.pairs[idx]) >= self.threshold:
+                        found.append(self.items[idx])
+        return found
+
+def board_repeats(categories, played):
+    """
+    (clue, repeated text) for each unused clue of a new board ({category: [clue, ...]})
+    that repeats a clue in `played` (a DedupIndex) or an earlier clue on the board.
+    """
+    board = DedupIndex(played.threshold)
+    for clues in categories.values():
+        for clue in clues:
+            if clue["used"]:
+                continue
+            text = clue_text(clue)
+            found = played.near_duplicates(text) or board.near_duplicates(text)
+            if found:
+                yield clue, found[0]
+            else:
+                board.add(text)
+
+def exclude_near_duplicates(categories, played):
+    """
+    Flag the board_repeats() of a board as excluded, replacing the flags of
+    an earlier visit. Returns the count. `used` is not touched:
+
+    >>> played = DedupIndex()
+    >>> played.add("This river, mentioned more often in the Bible than any other, "
+    ...            "flows into the Dead Sea the Jordan")
+    >>> clue = {"question": "This river, mentioned more often in the Bible than any other, "
+    ...                     "empties into the Dead Sea", "answer": "the Jordan", "used": False}
+    >>> board = {"RIVERS": [clue]}
+    >>> exclude_near_duplicates(board, played), exclude_near_duplicates(board, DedupIndex())
+    (1, 0)
+    >>> clue["used"], clue["excluded"]
+    (False, False)
+    """
+    excluded = 0
+    for clues in categories.values():
+        for clue in clues:
+            clue["excluded"] = False
+    for clue, _ in board_repeats(categories, played):
+        clue["excluded"] = True
+        excluded += 1
+    return excluded
+
+# ---------- Saved groups ----------
+def save_groups(path, clues, groups, threshold):
+    data = {"threshold": threshold, "groups": [[clue_id(clues[i][1]) for i in members] for members in groups]}
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+def load_groups(path):
+    """{clue_id: group number} from a --save file; clues sharing a number repeat each other."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {cid: n for n, members in enumerate(data["groups"]) for cid in members}
+
+# ---------- Command line ----------
+def read_clues(path):
+    """[(source, clue), ...] from a q*.txt set, a season TSV or a dataset directory."""
+    from jeopardy_data import read_dataset, read_question_file
+    if path.endswith(".txt"):
+        categories, _ = read_question_file(path)
+        return [(os.path.basename(path), clue) for clues in categories.values() for clue in clues]
+    found = []
+    for (air_date, rnd), categories in sorted(read_dataset(path).items()):
+        for category, clues in categories.items():
+            found.extend((f"{air_date} R{rnd} {category}", clue) for clue in clues)
+    return found
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find near-duplicate clues across question sets and datasets")
+    parser.add_argument("paths", nargs="+", help="q*.txt sets, season TSVs or dataset directories")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="similarity (0-1) to count as a duplicate")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--show", type=int, default=10, metavar="N", help="print the first N groups")
+    parser.add_argument("--save", metavar="INDEX", help="write the groups as JSON for board builders")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    clues = []
+    for path in args.paths:
+        try:
+            clues.extend(read_clues(path))
+        except (OSError, ValueError) as e:
+            print(f"Error reading {path}: {e}")
+            return 1
+    loaded = time.perf_counter()
+    texts = [clue_text(clue) for _, clue in clues]
+    sigs = compute_signatures(texts, args.workers)
+    signed = time.perf_counter()
+    groups = find_groups(sigs, texts, args.threshold)
+    done = time.perf_counter()
+
+    print(f"{len(clues)} clues, {len(groups)} near-duplicate groups covering "
+          f"{sum(len(g) for g in groups)} clues (load {loaded - start:.1f} s, "
+          f"signatures {signed - loaded:.1f} s, grouping {done - signed:.1f} s)")
+    for members in groups[:args.show]:
+        print()
+        for i in members[:5]:
+            source, clue = clues[i]
+            print(f"  [{source}] {clue['question']} -> {clue_response(clue)}")
+        if len(members) > 5:
+            print(f"  ... and {len(members) - 5} more")
+    if args.save:
+        save_groups(args.save, clues, groups, args.threshold)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+jeopardy_difficulty.py - Boards built to a difficulty curve from how clues were actually answered
+
+    python jeopardy_difficulty.py index dataset/ logs/*.jsonl [--groups dedup.json] [--out difficulty.json]
+    python jeopardy_difficulty.py build difficulty.json [--curve 0.2,0.35,0.5,0.65,0.8] [--boards N] [--out board.tsv]
+    python jeopardy_game.py board.tsv
+
+`index` estimates a difficulty (0 easy .. 1 hard) for every clue of a
+dataset from the event logs (jeopardy_log.py) and saves them, grouped by
+category block (air date, round, category), to one JSON file. A clue's
+accuracy is its own record, shrunk towards its category's record, which is
+shrunk towards a prior for its row on the board; with no games played the
+prior alone orders a category by its clue values. With --groups (from
+jeopardy_dedup.py --save) near-duplicate clues share their record.
+
+`build` reads only the index to choose categories: each complete block is
+scored by how far its sorted difficulties are from the target curve, and
+the boards are drawn from the best fits. Only the shards holding the
+chosen blocks are then read from the dataset. The clues are put on the
+ladder in order of difficulty -- the hardest gets the top value whatever
+its clue_value was -- and written as a season TSV for jeopardy_game.py.
+"""
+
+import argparse, json, os, random, sys, time
+from datetime import date, timedelta
+
+from jeopardy_data import read_dataset, read_episodes
+from jeopardy_log import read_log
+
+DEFAULT_CURVE = (0.2, 0.35, 0.5, 0.65, 0.8)  # target difficulty per row, top to bottom
+ROW_ACCURACY = (0.85, 0.75, 0.65, 0.55, 0.45)  # prior share of correct answers per row
+PRIOR_WEIGHT = 4      # answers a prior counts as
+CANDIDATES = 20       # best-fitting blocks per board slot the draw is made from
+VALUE_STEP = 200      # round 1 ladder 200, 400, ...; round 2 doubles it
+INDEX_VERSION = 1
+
+def question_key(text):
+    return " ".join(text.lower().split())
+
+# ---------- Answer records ----------
+def read_records(log_paths):
+    """({question key: [answers, correct]}, {category: [answers, correct]}) from event logs."""
+    clues, categories = {}, {}
+    for path in log_paths:
+        for record in read_log(path):
+            if record.get("type") != "judge" or "question" not in record:
+                continue
+            correct = 1 if record.get("correct") else 0
+            for table, key in ((clues, question_key(record["question"])), (categories, record["category"])):
+                stats = table.setdefault(key, [0, 0])
+                stats[0] += 1
+                stats[1] += correct
+    return clues, categories
+
+def shrink(stats, prior):
+    """Share of correct answers, pulled towards `prior` when there are few of them."""
+    answers, correct = stats if stats else (0, 0)
+    return (correct + PRIOR_WEIGHT * prior) / (answers + PRIOR_WEIGHT)
+
+def row_priors(categories):
+    """{clue value: prior accuracy} from the value's rank among the round's values."""
+    values = sorted({clue["points"] for clues in categories.values() for clue in clues})
+    last = len(ROW_ACCURACY) - 1
+    return {v: ROW_ACCURACY[min(i, last)] for i, v in enumerate(values)}
+
+# ---------- Index ----------
+def build_index(dataset, log_paths, groups_path=None):
+    clues_seen, categories_seen = read_records(log_paths)
+    groups = None
+    if groups_path:
+        from jeopardy_dedup import clue_id, load_groups
+        groups = load_groups(groups_path)
+    rounds = read_dataset(dataset)
+
+    if groups is not None:
+        # Pool the records of near-duplicates: every clue of a group gets the group's total
+        pooled = {}
+        keyed = []
+        for categories in rounds.values():
+            for clues in categories.values():
+                for clue in clues:
+                    group = groups.get(clue_id(clue))
+                    key = question_key(clue["question"])
+                    keyed.append((key, group))
+                    stats = clues_seen.get(key)
+                    if group is not None and stats:
+                        total = pooled.setdefault(group, [0, 0])
+                        total[0] += stats[0]
+                        total[1] += stats[1]
+        for key, group in keyed:
+            if group in pooled:
+                clues_seen[key] = pooled[group]
+
+    blocks = []
+    for (air_date, rnd), categories in sorted(rounds.items()):
+        priors = row_priors(categories)
+        for category, clues in categories.items():
+            scores = []
+            for clue in clues:
+                prior = shrink(categories_seen.get(category), priors[clue["points"]])
+                accuracy = shrink(clues_seen.get(question_key(clue["question"])), prior)
+                scores.append(round(1 - accuracy, 3))
+            blocks.append([air_date, rnd, category, scores])
+    return {"version": INDEX_VERSION, "dataset": os.path.abspath(dataset),
+            "answers": sum(n for n, _ in clues_seen.values()), "blocks": blocks}
+
+def save_index(path, index):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+def load_index(path):
+    with open(path, encoding="utf-8") as f:
+        index = json.load(f)
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(f"{path}: unsupported index version {index.get('version')}")
+    return index
+
+# ---------- Building boards ----------
+def fit_error(scores, curve):
+    return sum((s - t) ** 2 for s, t in zip(sorted(scores), curve))
+
+def choose_blocks(index, curve=DEFAULT_CURVE, boards=1, columns=6, rng=random):
+    """Pick boards * columns blocks (distinct category names) that fit `curve` best, with some variety."""
+    eligible = [b for b in index["blocks"] if len(b[3]) == len(curve)]
+    rng.shuffle(eligible)  # ties (no games logged yet) are broken at random
+    eligible.sort(key=lambda b: fit_error(b[3], curve))
+    wanted = boards * columns
+    candidates = eligible[:max(wanted * CANDIDATES, wanted)]
+    rng.shuffle(candidates)
+    chosen, names = [], set()
+    for block in candidates:
+        if block[2] not in names:
+            names.add(block[2])
+            chosen.append(block)
+            if len(chosen) == wanted:
+                break
+    # Best fits first, so a partial last board gets the weakest ones
+    chosen.sort(key=lambda b: fit_error(b[3], curve))
+    return [chosen[i:i + columns] for i in range(0, len(chosen), columns)]
+
+def build_boards(index, curve=DEFAULT_CURVE, boards=1, columns=6, dataset=None, rng=random):
+    """[{category: [clue, ...]}, ...] with each category's clues ordered easiest first."""
+    chosen = choose_blocks(index, curve, boards, columns, rng)
+    # Only the shards that contain the chosen blocks' dates are read
+    rounds = read_episodes(dataset or index["dataset"], {b[0] for board in chosen for b in board})
+    result = []
+    for board in chosen:
+        categories = {}
+        for air_date, rnd, category, scores in board:
+            clues = rounds[(air_date, rnd)][category]
+            order = sorted(range(len(clues)), key=lambda i: scores[i])
+            name = category
+            while name in categories:  # the same name from two episodes
+                name += " "
+            categories[name] = [dict(clues[i], difficulty=scores[i]) for i in order]
+        result.append(categories)
+    return result
+
+def write_boards(path, boards, first_date=None):
+    """Boards as a season TSV: round 1 and 2 of consecutive days, values by row."""
+    from jeopardy_preprocess import COLUMNS, format_row
+    first_date = first_date or date.today()
+    with open(path + ".tmp", "w", encoding="utf-8", newline="") as f:
+        f.write("\t".join(COLUMNS) + "\n")
+        for n, categories in enumerate(boards):
+            rnd = n % 2 + 1
+            air_date = (first_date + timedelta(days=n // 2)).isoformat()
+            for category, clues in categories.items():
+                for row, clue in enumerate(clues):
+                    f.write(format_row({
+                        "round": rnd, "clue_value": VALUE_STEP * (row + 1) * rnd, "daily_double_value": 0,
+                        "category": category.strip(), "comments": "", "answer": clue["question"],
+                        "question": clue["answer"], "air_date": air_date,
+                        "notes": f"difficulty {clue['difficulty']:.2f}",
+                    }))
+    os.replace(path + ".tmp", path)
+
+# ---------- Command line ----------
+def parse_curve(text):
+    try:
+        curve = tuple(float(x) for x in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("expected comma-separated numbers, e.g. 0.2,0.35,0.5,0.65,0.8")
+    if not curve or not all(0 <= x <= 1 for x in curve):
+        raise argparse.ArgumentTypeError("difficulties must be between 0 and 1")
+    return curve
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build boards to a difficulty curve from logged games")
+    commands = parser.add_subparsers(dest="command", required=True)
+    p = commands.add_parser("index", help="estimate clue difficulties from event logs")
+    p.add_argument("dataset", help="season TSV or dataset directory")
+    p.add_argument("logs", nargs="*", help="game-*.jsonl event logs")
+    p.add_argument("--groups", help="near-duplicate groups from jeopardy_dedup.py --save")
+    p.add_argument("--out", default="difficulty.json")
+    p = commands.add_parser("build", help="write boards that follow a difficulty curve")
+    p.add_argument("index", help="file written by the index command")
+    p.add_argument("--dataset", help="dataset to read clues from (default: the one indexed)")
+    p.add_argument("--curve", type=parse_curve, default=DEFAULT_CURVE,
+                   help="difficulty per row, 0 easy .. 1 hard (default 0.2,0.35,0.5,0.65,0.8)")
+    p.add_argument("--boards", type=int, default=2, help="boards to build (round 1, round 2, ...)")
+    p.add_argument("--columns", type=int, default=6, help="categories per board")
+    p.add_argument("--seed", type=int, help="random seed, for a repeatable pick")
+    p.add_argument("--out", default="board.tsv")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        if args.command == "index":
+            index = build_index(args.dataset, args.logs, args.groups)
+            save_index(args.out, index)
+            print(f"{len(index['blocks'])} categories, {index['answers']} logged answers used -> {args.out} "
+                  f"({time.perf_counter() - start:.1f} s)")
+        else:
+            index = load_index(args.index)
+            boards = build_boards(index, args.curve, args.boards, args.columns, args.dataset, random.Random(args.seed))
+            write_boards(args.out, boards)
+            for n, categories in enumerate(boards):
+                print(f"Board {n + 1}:")
+                for category, clues in categories.items():
+                    print(f"  {category}: " + " ".join(f"{c['difficulty']:.2f}" for c in clues))
+            print(f"-> {args.out} ({time.perf_counter() - start:.2f} s); play it with: python jeopardy_game.py {args.out}")
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
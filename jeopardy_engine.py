@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+jeopardy_engine.py - Game state machine shared by every Jeopardy front-end
+
+No pygame in here: the front-ends draw the board and turn clicks/keys into
+calls on a GameEngine, and the engine owns scores, turns, `used` flags and
+the clue life-cycle. A clue flagged `excluded` (a repeat left off the
+board, see jeopardy_dedup) can't be opened and doesn't count as remaining,
+but is not `used` either. Anything that wants to react to the game
+(sounds, logging, mirroring) registers a listener and receives plain event
+dicts.
+
+Phases:
+    "board"   no clue open
+    "wager"   daily double / Final Jeopardy opened, waiting for wagers
+    "clue"    clue open, answer hidden
+    "answer"  answer revealed, waiting for the host to judge it
+
+Wagers (rules "wagers"): a clue marked `daily_double` is played by the team
+whose turn it is for a wager of DD_MIN_WAGER up to the larger of its score
+and the board's top value; a Final Jeopardy clue (`final`, or 0 points) is
+played by every team, each wagering 0 up to its score while the other
+wagers stay hidden. The wagers live in the engine (`wager_kind`, `wagers`,
+`final_results`) until the clue closes.
+"""
+
+import random
+
+# ---------- Rules ----------
+# The scripts disagreed on wrong answers: jeopardy_game.py subtracts the clue
+# value, the others did not. That is now an explicit rule each front-end
+# picks instead of a copy-paste drift.
+# "wagers" turns on daily doubles and Final Jeopardy wagers; front-ends
+# without a wager screen leave it off and play those clues at face value.
+# "daily_doubles" is how many to place on a board that has none marked.
+RULES_CLASSIC = {"penalise_wrong": True, "switch_turn": True, "wagers": False, "daily_doubles": 0}
+RULES_NO_PENALTY = {"penalise_wrong": False, "switch_turn": True, "wagers": False, "daily_doubles": 0}
+RULES_SOLO = {"penalise_wrong": False, "switch_turn": False, "wagers": False, "daily_doubles": 0}
+
+DD_MIN_WAGER = 5
+
+
+class GameEngine:
+    def __init__(self, team_names=("Team 1", "Team 2"), rules=None):
+        self.team_names = list(team_names)
+        self.rules = dict(RULES_CLASSIC if rules is None else rules)
+        self.listeners = []
+        self.categories = {}
+        self.category_names = []
+        self.wager_kind = None    # "daily_double" / "final" while such a clue is open
+        self.wagers = {}          # team -> wager for the open clue
+        self.final_results = {}   # team -> correct, Final Jeopardy answers judged so far
+        self.reset_scores()
+        self.clear_board()
+
+    # ---------- Board ----------
+    def clear_board(self):
+        self.categories = {}
+        self.category_names = []
+        self.max_rows = 0
+        self.phase = "board"
+        self.open_cell = None  # (col, row) of the open clue
+        self.emit("board", categories=0, rows=0)
+
+    def load_board(self, categories, category_names=None):
+        """
+        Use `categories` ({name: [clue, ...]}) as the current board. Clue dicts
+        are shared, not copied, so `used` flags survive switching rounds.
+        """
+        self.categories = categories
+        self.category_names = list(categories.keys()) if category_names is None else list(category_names)
+        self.max_rows = max((len(categories[c]) for c in self.category_names), default=0)
+        self.phase = "board"
+        self.open_cell = None
+        if self.rules.get("wagers") and self.rules.get("daily_doubles"):
+            self.place_daily_doubles(self.rules["daily_doubles"])
+        self.emit("board", categories=len(self.category_names), rows=self.max_rows)
+
+    def place_daily_doubles(self, count, rng=random):
+        """
+        Mark `count` unplayed clues as daily doubles, favouring the lower rows as
+        the show does, unless the board already has some (from the data).
+        """
+        cells = [q for c in self.category_names for q in self.categories[c]]
+        if any(q.get("daily_double") for q in cells):
+            return
+        candidates = [(row, q) for c in self.category_names for row, q in enumerate(self.categories[c])
+                      if playable(q) and not is_final(q)]
+        for _ in range(min(count, len(candidates))):
+            i = rng.choices(range(len(candidates)), weights=[row + 1 for row, _ in candidates])[0]
+            candidates.pop(i)[1]["daily_double"] = True
+
+    def clue_at(self, col, row):
+        clues = self.categories[self.category_names[col]]
+        return clues[row] if 0 <= row < len(clues) else None
+
+    @property
+    def open_clue(self):
+        return self.clue_at(*self.open_cell) if self.open_cell else None
+
+    @property
+    def open_category(self):
+        return self.category_names[self.open_cell[0]] if self.open_cell else None
+
+    def remaining(self):
+        return sum(1 for c in self.category_names for q in self.categories[c] if playable(q))
+
+    def top_value(self):
+        return max((q["points"] for c in self.category_names for q in self.categories[c]), default=0)
+
+    # ---------- Teams ----------
+    def reset_scores(self):
+        self.scores = [0] * len(self.team_names)
+        self.current_team = 0
+
+    def next_team(self):
+        self.current_team = (self.current_team + 1) % len(self.team_names)
+        self.emit("turn", team=self.current_team)
+
+    def set_team(self, team):
+        self.current_team = team % len(self.team_names)
+        self.emit("turn", team=self.current_team)
+
+    def adjust_score(self, delta, team=None):
+        """Manual +/- adjustment by the host."""
+        team = self.current_team if team is None else team
+        self.scores[team] += delta
+        self.emit("score", team=team, delta=delta, score=self.scores[team], reason="manual")
+
+    # ---------- Clue life-cycle ----------
+    def open(self, col, row):
+        """Open the clue at (col, row). Returns the clue, or None if it can't be opened."""
+        if self.phase != "board":
+            return None
+        clue = self.clue_at(col, row)
+        if clue is None or not playable(clue):
+            return None
+        self.open_cell = (col, row)
+        self.wager_kind = None
+        if self.rules.get("wagers"):
+            if is_final(clue):
+                self.wager_kind = "final"
+            elif clue.get("daily_double"):
+                self.wager_kind = "daily_double"
+        self.wagers = {}
+        self.final_results = {}
+        self.phase = "wager" if self.wager_kind else "clue"
+        self.emit("open", col=col, row=row, category=self.category_names[col], points=clue["points"],
+                  wager=self.wager_kind)
+        return clue
+
+    # ---------- Wagers ----------
+    def wager_teams(self):
+        """Teams that wager on the open clue, in order."""
+        if self.wager_kind == "final":
+            return list(range(len(self.team_names)))
+        if self.wager_kind == "daily_double":
+            return [self.current_team]
+        return []
+
+    def wager_range(self, team=None):
+        """(lowest, highest) wager `team` may make on the open clue."""
+        team = self.current_team if team is None else team
+        if self.wager_kind == "final":
+            return 0, max(self.scores[team], 0)
+        top = max(self.scores[team], self.top_value())
+        return min(DD_MIN_WAGER, top), top
+
+    def set_wager(self, amount, team=None):
+        """
+        Record `team`'s wager (default: whoever's turn it is). Raises ValueError,
+        with a message for the player, if the amount is not allowed. Once every
+        team has wagered the clue moves on to the "clue" phase.
+        """
+        if self.phase != "wager":
+            raise ValueError("No wager is open")
+        team = self.current_team if team is None else team
+        if team not in self.wager_teams():
+            raise ValueError(f"{self.team_names[team]} does not wager on this clue")
+        try:
+            amount = int(amount)
+        except (TypeError, ValueError):
+            raise ValueError("Enter a whole number")
+        low, high = self.wager_range(team)
+        if not low <= amount <= high:
+            raise ValueError(f"Wager must be between {low} and {high}")
+        self.wagers[team] = amount
+        done = all(t in self.wagers for t in self.wager_teams())
+        # Final Jeopardy wagers stay hidden until the answers are judged
+        self.emit("wager", team=team, wager=self.wager_kind,
+                  amount=None if self.wager_kind == "final" else amount, complete=done)
+        if done:
+            self.phase = "clue"
+        return amount
+
+    def reveal(self):
+        if self.phase == "clue":
+            self.phase = "answer"
+            self.emit("reveal", col=self.open_cell[0], row=self.open_cell[1])
+
+    def judge(self, correct, team=None):
+        """
+        Score the open clue for `team` (default: whoever's turn it is) and close it.
+        Final Jeopardy is judged once per team and closes after the last one.
+        """
+        if self.phase not in ("clue", "answer"):
+            return None
+        clue = self.open_clue
+        team = self.current_team if team is None else team
+        if self.wager_kind:
+            if team not in self.wagers or team in self.final_results:
+                return None
+            stake = self.wagers[team]
+            delta = stake if correct else -stake
+        elif correct:
+            delta = clue["points"]
+        elif self.rules["penalise_wrong"]:
+            delta = -clue["points"]
+        else:
+            delta = 0
+        self.scores[team] += delta
+        col, row = self.open_cell
+        self.emit("judge", col=col, row=row, team=team, correct=correct, delta=delta, score=self.scores[team],
+                  wager=self.wagers.get(team))
+        if self.wager_kind == "final":
+            self.final_results[team] = correct
+            if len(self.final_results) < len(self.wagers):
+                return delta
+            self._close_clue()
+            return delta
+        self._close_clue()
+        if self.rules["switch_turn"]:
+            self.next_team()
+        return delta
+
+    def choose_option(self, idx, team=None):
+        """Multiple-choice answer: judge the open clue by comparing `idx` with its correct index."""
+        clue = self.open_clue
+        if clue is None:
+            return None
+        correct = clue.get("correct")
+        is_correct = isinstance(correct, int) and idx == correct
+        self.judge(is_correct, team)
+        return is_correct
+
+    def close(self, used=True):
+        """Close the open clue without scoring (e.g. Final Jeopardy scored by hand)."""
+        if self.open_cell is None:
+            return
+        self._close_clue(used)
+
+    def _close_clue(self, used=True):
+        col, row = self.open_cell
+        if used:
+            self.clue_at(col, row)["used"] = True
+        self.open_cell = None
+        self.phase = "board"
+        self.wager_kind = None
+        self.wagers = {}
+        self.final_results = {}
+        self.emit("close", col=col, row=row, used=used)
+
+    # ---------- Events ----------
+    def emit(self, kind, **data):
+        if not self.listeners:
+            return
+        data["type"] = kind
+        for listener in self.listeners:
+            listener(data)
+
+
+def playable(clue):
+    """Still on the board: neither played nor excluded."""
+    return not clue["used"] and not clue.get("excluded", False)
+
+def is_final(clue):
+    return clue.get("final", False) or clue["points"] == 0
@@ -1,16 +1,60 @@
-import csv
+import argparse
+import os
 import sys
+from jeopardy_startup import Startup, load_fonts, load_sounds  # first, so its clock covers importing pygame
 import pygame
+from jeopardy_data import read_dataset, EpisodeIndex
+from jeopardy_engine import GameEngine, RULES_CLASSIC, is_final, playable
+from jeopardy_scenes import Scene, SceneManager
+from jeopardy_mirror import MirrorPublisher
+from jeopardy_log import EventLog, log_path
+from jeopardy_layout import LayoutCache, get_font, draw_fitted
+from jeopardy_match import prepare, is_correct
+from jeopardy_dedup import DedupIndex, clue_text, exclude_near_duplicates
+from jeopardy_snapshot import take_snapshot, save_snapshot, load_snapshot, restore_rounds, snapshot_path
+
+# --- Command line ---
+parser = argparse.ArgumentParser(usage="python program.py database_file.tsv|dataset_dir [from_date [to_date]] [--teams N] [--buzz-port PORT] [--mirror PORT] [--timings] [--log-dir DIR | --no-log] [--save-dir DIR] [--resume SNAPSHOT]")
+parser.add_argument("dataset", nargs="?", help="optional with --resume (default: the snapshot's dataset)")
+# Optional air-date range; with a dataset directory only the overlapping shards are opened
+parser.add_argument("date_from", nargs="?")
+parser.add_argument("date_to", nargs="?")
+parser.add_argument("--teams", type=int, default=2, help="number of teams/players (buzz keys 1-9)")
+parser.add_argument("--buzz-port", type=int, default=None, help="UDP port for phone buzzers")
+parser.add_argument("--mirror", type=int, default=None, help="local port for an audience display (jeopardy_mirror.py)")
+parser.add_argument("--timings", action="store_true", help="print how long each startup phase took")
+parser.add_argument("--log-dir", default="logs", help="where the game's event log goes (see jeopardy_log.py)")
+parser.add_argument("--no-log", action="store_true", help="do not write an event log")
+parser.add_argument("--save-dir", default="saves", help="where S on the board saves the game (see jeopardy_snapshot.py)")
+parser.add_argument("--resume", metavar="SNAPSHOT", help="continue a saved game")
+args = parser.parse_args()
+
+snapshot = None
+if args.resume:
+    try:
+        snapshot = load_snapshot(args.resume)
+    except (OSError, ValueError) as e:
+        print(f"Error loading {args.resume}: {e}")
+        sys.exit()
+    args.teams = len(snapshot["teams"])
+elif not args.dataset:
+    parser.error("a dataset is required unless resuming a game")
 
-pygame.init()
+startup = Startup(report=args.timings)
+startup.init_pygame()
+from jeopardy_buzzer import BuzzerHub  # needs pygame initialised for its custom event type
+DATASET_LOADED = pygame.event.custom_type()  # wakes the loop when a resumed game's dataset is in
 
 # --- Screen setup ---
 SCREEN_WIDTH, SCREEN_HEIGHT = 1800, 900
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+FPS = 30
+screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption("Jeopardy Game")
-font_category = pygame.font.SysFont(None, 36)
-font_score = pygame.font.SysFont(None, 48)
-font_clue = pygame.font.SysFont(None, 48)
+startup.mark("window")
+startup.first_frame(screen, (0, 0, 0))
+# Fonts and sounds load on loader threads while the dataset is read; waited for below
+fonts = startup.load("fonts", load_fonts, None, (36, 48))
+sounds = startup.load("sounds", load_sounds, "correct.wav", "wrong.wav")
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -23,74 +67,137 @@ YELLOW = (255, 255, 0)
 ORANGE = (255, 140, 0)
 
 # --- Game state ---
-team_scores = [0, 0]
-team_names = ["Team 1", "Team 2"]
-current_team = 0
+# Scores, turns and used flags live in the engine; it is pointed at one round's board at a time
+# Daily doubles come from the dataset's daily_double_value; a board without any gets one placed
+team_names = snapshot["teams"] if snapshot else [f"Team {i+1}" for i in range(args.teams)]
+engine = GameEngine(team_names, dict(RULES_CLASSIC, wagers=True, daily_doubles=1))
+played = DedupIndex()  # clues played tonight; repeats of them are excluded from later boards
+
+def remember_played(event):
+    if event["type"] == "close" and event["used"]:
+        played.add(clue_text(engine.clue_at(event["col"], event["row"])))
+
+engine.listeners.append(remember_played)
+
+# Buzz-in: keys 1..N, one gamepad per team, and optionally UDP buzzes from phones
+buzzers = BuzzerHub(args.teams)
+buzzers.add_joysticks()
+if args.buzz_port:
+    buzzers.listen(args.buzz_port)
 
 current_round_index = 0
 rounds_list = []
 rounds_dict = {}  # key: (air_date, round), value: dict of categories → list of clues
+episode_index = None
+pending_rounds = None  # Future of the full dataset while a resumed game runs on its own episodes
+
+seek_text = None  # text being typed into the "Go To" box, None when the box is closed
 
-BUTTON_MARGIN_X = 20
-BUTTON_MARGIN_Y = 20
-CATEGORY_MARGIN_Y = 80
 BOTTOM_MARGIN_Y = 120
-BUTTON_HEIGHT = 60
+LINE_SPACING = 80
+CLUE_FONT_MAX = 64  # long clues shrink from here (see jeopardy_layout.fit_text)
 
-# ---------- Load sounds ----------
-try:
-    sound_correct = pygame.mixer.Sound("correct.wav")
-    sound_wrong = pygame.mixer.Sound("wrong.wav")
-except:
-    sound_correct = sound_wrong = None
+# Board geometry as fractions of the window; sizes come from jeopardy_layout
+BOARD_LAYOUT = {"margin": 0.011, "top": 0.089, "category": 0.09, "bottom": 0.133, "gap": 0.022}
+layouts = LayoutCache(BOARD_LAYOUT)
 
-# --- Load dataset ---
-if len(sys.argv) < 2:
-    print("Usage: python program.py database_file.tsv")
-    sys.exit()
+def on_resize(size):
+    global SCREEN_WIDTH, SCREEN_HEIGHT
+    SCREEN_WIDTH, SCREEN_HEIGHT = size
+    layouts.invalidate()
 
-csv_file = sys.argv[1]
+# --- Load dataset ---
+# A resumed game uses the snapshot's dataset and date range unless given new ones (another machine)
+csv_file = (args.dataset or snapshot["dataset"]) if snapshot else args.dataset
+date_from = args.date_from or (snapshot["date_from"] if snapshot else None)
+date_to = args.date_to or (snapshot["date_to"] if snapshot else None)
 
 def load_data(filename):
-    global rounds_list, rounds_dict
-    rounds_dict = {}
+    global rounds_list, rounds_dict, episode_index
     try:
-        with open(filename, newline='', encoding='utf-8') as f:
-            # Use tab as delimiter, as requested in the user's saved context and previous responses
-            reader = csv.DictReader(f, delimiter='\t')
-            for row in reader:
-                # Ensure core fields exist before processing
-                if row.get('air_date') and row.get('round') and row.get('category') and row.get('answer'):
-                    try:
-                        points = int(row.get('clue_value') or row.get('cluevalue') or 0)
-                    except ValueError:
-                        points = 0
-                        
-                    clue = {
-                        'question': row['answer'].strip(),
-                        'answer': row['question'].strip(),
-                        'points': points,
-                        'used': False
-                    }
-                    air_date = row['air_date'].strip()
-                    try:
-                        rnd = int(row['round'])
-                    except ValueError:
-                        rnd = 1 # Default to round 1 if unparsable
-                        
-                    category = row['category'].strip()
-                    key = (air_date, rnd)
-                    if key not in rounds_dict:
-                        rounds_dict[key] = {}
-                    if category not in rounds_dict[key]:
-                        rounds_dict[key][category] = []
-                    rounds_dict[key][category].append(clue)
-        rounds_list = sorted(rounds_dict.keys())
+        rounds_dict = read_dataset(filename, date_from, date_to)
+        episode_index = EpisodeIndex(rounds_dict)
+        rounds_list = episode_index.keys
     except Exception as e:
         print(f"Error loading data from {filename}: {e}")
         sys.exit()
 
-load_data(csv_file)
+def set_round(index):
+    global current_round_index
+    current_round_index = index
+    if rounds_list:
+        categories = rounds_dict[rounds_list[current_round_index]]
+        exclude_near_duplicates(categories, played)
+        engine.load_board(categories)
+        prepare(engine.categories)  # answer keys for typed responses
+
+def resume_game(snapshot):
+    """Board, scores and turn from a snapshot; only the episodes it refers to are read here."""
+    global rounds_list, rounds_dict, episode_index, pending_rounds
+    try:
+        rounds_dict, skipped = restore_rounds(snapshot, csv_file)
+    except (OSError, ValueError) as e:
+        print(f"Error resuming from {csv_file}: {e}")
+        sys.exit()
+    for air_date, rnd in skipped:
+        print(f"Resume: {air_date} round {rnd} is missing or changed in {csv_file}; its clues start unused")
+    episode_index = EpisodeIndex(rounds_dict)
+    rounds_list = episode_index.keys
+    engine.scores[:] = snapshot["scores"]
+    engine.current_team = snapshot["current_team"]
+    for categories in rounds_dict.values():
+        for clues in categories.values():
+            for clue in clues:
+                if clue["used"]:
+                    played.add(clue_text(clue))
+    set_round(episode_index.position.get(snapshot["round"], 0))
+    # The rest of the dataset, for navigating on; merged in by finish_loading()
+    pending_rounds = startup.load("dataset", read_dataset, csv_file, date_from, date_to)
+    pending_rounds.add_done_callback(wake_on_loaded)
+
+def wake_on_loaded(_):
+    try:
+        pygame.event.post(pygame.event.Event(DATASET_LOADED))
+    except pygame.error:
+        pass  # the game was closed before the dataset was in
+
+def finish_loading():
+    """Swap in the full dataset once it has been read; the resumed rounds keep their clue dicts."""
+    global rounds_list, rounds_dict, episode_index, pending_rounds, current_round_index
+    future, pending_rounds = pending_rounds, None
+    try:
+        full = future.result()
+    except Exception as e:
+        print(f"Error loading data from {csv_file}: {e}")
+        return
+    full.update(rounds_dict)
+    key = rounds_list[current_round_index] if rounds_list else None
+    rounds_dict = full
+    episode_index = EpisodeIndex(rounds_dict)
+    rounds_list = episode_index.keys
+    current_round_index = episode_index.position.get(key, 0)
+
+def save_game():
+    if not rounds_list:
+        return
+    data = take_snapshot(engine, os.path.abspath(csv_file), rounds_dict, rounds_list[current_round_index],
+                         date_from, date_to)
+    try:
+        path = save_snapshot(snapshot_path(args.save_dir), data)
+    except OSError as e:
+        print(f"Save failed: {e}")
+        return
+    print(f"Saved ({len(data)} bytes): python jeopardy_game.py --resume {path}")
+
+if snapshot:
+    resume_game(snapshot)
+else:
+    load_data(csv_file)
+    set_round(0)
+startup.mark("data")
+font_category, font_score = startup.wait(fonts, "fonts")
+font_clue = font_score
+sound_correct, sound_wrong = startup.wait(sounds, "sounds")
 
 # --- Helper functions ---
 def draw_board():
@@ -99,7 +206,7 @@ def draw_board():
     if not rounds_list:
         no_data_surf = font_score.render("No valid data loaded. Check TSV file.", True, RED)
         screen.blit(no_data_surf, (SCREEN_WIDTH/2 - no_data_surf.get_width()/2, SCREEN_HEIGHT/2 - 50))
-        return [], None, None, []
+        return [], None, None, [], None
         
     round_key = rounds_list[current_round_index]
     air_date, rnd_number = round_key
@@ -109,21 +216,21 @@ def draw_board():
     if num_categories == 0:
         no_cat_surf = font_score.render(f"Round {rnd_number} has no categories.", True, RED)
         screen.blit(no_cat_surf, (SCREEN_WIDTH/2 - no_cat_surf.get_width()/2, SCREEN_HEIGHT/2 - 50))
-        return [], None, None, []
+        return [], None, None, [], None
         
-    col_width = (SCREEN_WIDTH - BUTTON_MARGIN_X * (num_categories + 1)) / num_categories
+    layout = layouts.get(screen.get_size(), num_categories, engine.max_rows)
 
     score_rects = []
     # Draw team scores (top-left)
-    for i in range(2):
-        score_surf = font_score.render(f"{team_names[i]}: {team_scores[i]}", True, WHITE)
-        x_pos = 20 + i * 500
+    for i in range(len(engine.team_names)):
+        score_surf = font_score.render(f"{engine.team_names[i]}: {engine.scores[i]}", True, WHITE)
+        x_pos = 20 + i * min(500, SCREEN_WIDTH * 0.55 / len(engine.team_names))
         y_pos = 10
         score_rect = pygame.Rect(x_pos - 10, y_pos - 5, score_surf.get_width() + 20, score_surf.get_height() + 10)
         
         screen.blit(score_surf, (x_pos, y_pos))
         
-        if i == current_team:
+        if i == engine.current_team:
             pygame.draw.rect(screen, ORANGE, score_rect, 3)
         
         # Draw subtle border for score clickability
@@ -131,45 +238,40 @@ def draw_board():
         score_rects.append(score_rect) 
 
     # Draw air_date and round (top-right)
-    round_info = f"Air Date: {air_date}  |  Round: {rnd_number}"
+    episode_no = episode_index.episode_number(current_round_index) + 1
+    round_info = f"Episode {episode_no}/{episode_index.episode_count()}  |  Air Date: {air_date}  |  Round: {rnd_number}"
+    if pending_rounds is not None:
+        round_info = "Loading episodes...  |  " + round_info
     round_surf = font_score.render(round_info, True, WHITE)
     screen.blit(round_surf, (SCREEN_WIDTH - round_surf.get_width() - 20, 10))
 
-    # Draw categories with wrapped text
+    # Draw categories, shrunk to fit their header
     for idx, cat in enumerate(current_categories):
-        x = BUTTON_MARGIN_X + idx * (col_width + BUTTON_MARGIN_X)
-        wrapped_lines = wrap_text(cat, font_category, col_width)
-        for i, line in enumerate(wrapped_lines):
-            screen.blit(font_category.render(line, True, WHITE),
-                        (x + (col_width - font_category.size(line)[0]) / 2,
-                         CATEGORY_MARGIN_Y + i*30))
+        draw_fitted(screen, cat, None, layout.category_rect(idx), WHITE, layout.category_font)
 
     # Draw clue buttons
     buttons = []
-    # Find max rows dynamically based on the current round's categories
-    max_rows = max(len(rounds_dict[round_key][cat]) for cat in current_categories) if current_categories else 0
-    
-    for row in range(max_rows):
+    font_tile = get_font(None, layout.tile_font)
+    for row in range(engine.max_rows):
         for col, cat in enumerate(current_categories):
-            x = BUTTON_MARGIN_X + col * (col_width + BUTTON_MARGIN_X)
-            y = CATEGORY_MARGIN_Y + 60 + row * (BUTTON_HEIGHT + BUTTON_MARGIN_Y)
             clues = rounds_dict[round_key].get(cat, [])
             
             if row < len(clues):
                 clue = clues[row]
-                color = BLUE if not clue['used'] else GRAY
-                rect = pygame.Rect(x, y, col_width, BUTTON_HEIGHT)
+                color = BLUE if playable(clue) else GRAY
+                rect = layout.tile_rect(col, row)
                 pygame.draw.rect(screen, color, rect)
                 
-                # Check for 0 points (Final Jeopardy) or other special clues
+                # Final Jeopardy, and daily doubles once they have been found
                 text_label = str(clue['points'])
-                if clue['points'] == 0:
+                if is_final(clue):
                      text_label = "FINAL!"
+                elif clue['used'] and clue.get('daily_double'):
+                     text_label = "DD"
                      
-                text_surf = font_clue.render(text_label, True, WHITE)
-                screen.blit(text_surf, (x + (col_width - text_surf.get_width()) / 2,
-                                         y + (BUTTON_HEIGHT - text_surf.get_height()) / 2))
-                buttons.append({'rect': rect, 'clue': clue})
+                text_surf = font_tile.render(text_label, True, WHITE)
+                screen.blit(text_surf, text_surf.get_rect(center=rect.center))
+                buttons.append({'rect': rect, 'clue': clue, 'col': col, 'row': row})
 
     # Round navigation buttons
     prev_rect = pygame.Rect(50, SCREEN_HEIGHT - BOTTOM_MARGIN_Y + 20, 200, 60)
@@ -183,234 +285,436 @@ def draw_board():
     screen.blit(next_text, (next_rect.x + (next_rect.width - next_text.get_width()) / 2,
                              next_rect.y + (next_rect.height - next_text.get_height()) / 2))
 
-    return buttons, prev_rect, next_rect, score_rects
-
-
-def wrap_text(text, font, max_width):
-    words = text.split()
-    lines = []
-    current = ""
-    for word in words:
-        test = current + " " + word if current else word
-        if font.size(test)[0] <= max_width:
-            current = test
-        else:
-            if current:
-                lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    return lines
-
-def show_question(clue, category):
-    global current_team
-    running = True
-    show_answer = False
-    correct_rect = wrong_rect = answer_rect = None
-    line_spacing = 80
-    
-    # Check for Final Jeopardy: points = 0
-    is_final_jeopardy = (clue['points'] == 0)
-    
-    # NEW STATE VARIABLE for Final Jeopardy Flow
-    # 1: Wager Collection, 2: Clue Display, 3: Answer/Scoring
-    if is_final_jeopardy:
-        fj_stage = 1
+    # Go To box: click (or press G) and type a date, #episode, or +1w/-1m style jump
+    goto_rect = pygame.Rect(SCREEN_WIDTH/2 - 250, SCREEN_HEIGHT - BOTTOM_MARGIN_Y + 20, 500, 60)
+    if seek_text is None:
+        pygame.draw.rect(screen, GREEN, goto_rect)
+        goto_label = "Go To (date / #episode)"
     else:
-        fj_stage = 2 # Treat regular questions as starting at stage 2 (Clue Display)
-
-    while running:
-        screen.fill(BLACK)
-        
-        # --- Display category ---
-        cat_text = "FINAL JEOPARDY!" if is_final_jeopardy else f"Category: {category}"
-        cat_color = RED if is_final_jeopardy else ORANGE
-        cat_surf = font_category.render(cat_text, True, cat_color)
-        screen.blit(cat_surf, (20, 20))
-        
-        # --- Final Jeopardy Stage 1: Wager Collection ---
-        if is_final_jeopardy and fj_stage == 1:
-            title = font_score.render("STAGE 1: WAGER COLLECTION", True, ORANGE)
-            screen.blit(title, (SCREEN_WIDTH/2 - title.get_width()/2, SCREEN_HEIGHT/4))
-            
-            prompt_lines = [
-                "*** HOST INSTRUCTION ***",
-                "1. Instruct all teams to **WRITE DOWN THEIR WAGERS** in private.",
-                "2. When all wagers are submitted, click **'Show Clue'**."
-            ]
-            for i, line in enumerate(prompt_lines):
-                surf = font_clue.render(line, True, WHITE)
-                screen.blit(surf, (SCREEN_WIDTH/2 - surf.get_width()/2, SCREEN_HEIGHT/4 + 100 + i*line_spacing))
-
-            answer_rect = pygame.Rect(SCREEN_WIDTH/2-150, SCREEN_HEIGHT-150, 300, 60)
-            pygame.draw.rect(screen, GREEN, answer_rect)
-            screen.blit(font_category.render("Show Clue", True, WHITE), (answer_rect.x+90, answer_rect.y+15))
-            
-            # This is the only clickable button in this stage
-            correct_rect = answer_rect
-            wrong_rect = None
-            
-        # --- Final Jeopardy Stage 2: Clue Display (Wager placed) ---
-        elif is_final_jeopardy and fj_stage == 2:
-            title = font_score.render("STAGE 2: CLUE DISPLAY (Teams must write their answer!)", True, RED)
-            screen.blit(title, (SCREEN_WIDTH/2 - title.get_width()/2, SCREEN_HEIGHT/4))
-
-            # Display question
-            lines = wrap_text(clue['question'], font_clue, SCREEN_WIDTH*0.6)
-            for i, line in enumerate(lines):
-                screen.blit(font_clue.render(line, True, WHITE), (20, 90 + i * line_spacing))
-                
-            answer_rect = pygame.Rect(SCREEN_WIDTH/2-150, SCREEN_HEIGHT-150, 300, 60)
-            pygame.draw.rect(screen, ORANGE, answer_rect)
-            screen.blit(font_category.render("Show Answer/Score", True, WHITE), (answer_rect.x+20, answer_rect.y+15))
-            
-            correct_rect = answer_rect
-            wrong_rect = None
-
-        # --- Final Jeopardy Stage 3: Answer & Score ---
-        elif is_final_jeopardy and fj_stage == 3:
+        pygame.draw.rect(screen, WHITE, goto_rect)
+        pygame.draw.rect(screen, ORANGE, goto_rect, 3)
+        goto_label = seek_text + "_"
+    goto_surf = font_category.render(goto_label, True, BLACK if seek_text is not None else WHITE)
+    screen.blit(goto_surf, (goto_rect.x + (goto_rect.width - goto_surf.get_width()) / 2,
+                            goto_rect.y + (goto_rect.height - goto_surf.get_height()) / 2))
+
+    return buttons, prev_rect, next_rect, score_rects, goto_rect
+
+
+def question_box():
+    # Left 60% of the screen between the header and the answer
+    return pygame.Rect(20, 90, SCREEN_WIDTH*0.6, SCREEN_HEIGHT/2 - 200)
+
+def answer_box():
+    return pygame.Rect(20, SCREEN_HEIGHT/2 - 100, SCREEN_WIDTH - 40, SCREEN_HEIGHT/2 - 80)
+
+# --- Scenes ---
+def draw_button(rect, color, label):
+    pygame.draw.rect(screen, color, rect)
+    surf = font_category.render(label, True, WHITE)
+    screen.blit(surf, (rect.x + (rect.width - surf.get_width()) / 2,
+                       rect.y + (rect.height - surf.get_height()) / 2))
+
+
+class ClueScene(Scene):
+    """
+    A regular clue: question, then Show Answer, then Correct / Wrong.
+    Buzzers are armed while the clue is open; the first team to buzz gets the turn.
+    The team that buzzed can also type its response (keyboard, Enter to submit,
+    or ANSWER from a phone); typed responses are judged automatically.
+    A daily double belongs to the team that wagered: no buzzers, typing at once.
+    """
+
+    def __init__(self, clue, category):
+        super().__init__()
+        self.clue = clue
+        self.category = category
+        self.show_answer = False
+        self.buzzed = None
+        self.typed = None  # response being typed after a buzz, None when the box is closed
+        if engine.wager_kind == "daily_double":
+            self.buzzed = engine.current_team
+            self.typed = ""
+        self.place_buttons()
+
+    def place_buttons(self):
+        # Anchored to the window edges, so redone whenever the window is resized
+        self.answer_rect = pygame.Rect(SCREEN_WIDTH/2-100, SCREEN_HEIGHT-150, 200, 60)
+        self.correct_rect = pygame.Rect(SCREEN_WIDTH/2-220, SCREEN_HEIGHT-150, 200, 60)
+        self.wrong_rect = pygame.Rect(SCREEN_WIDTH/2+20, SCREEN_HEIGHT-150, 200, 60)
+        self.typed_rect = pygame.Rect(SCREEN_WIDTH/2-300, SCREEN_HEIGHT-230, 600, 60)
+
+    def enter(self):
+        if self.buzzed is None:
+            buzzers.arm()
+
+    def exit(self):
+        buzzers.disarm()
+
+    def animating(self):
+        # Keep ticking while a buzz waits out the settle window
+        return buzzers.pending()
+
+    def update(self, dt):
+        winner = buzzers.poll()
+        if winner is not None and self.buzzed is None:
+            self.buzzed = winner
+            self.typed = ""
+            engine.set_team(winner)
+            self.manager.invalidate()
+        for player, text in buzzers.take_answers():
+            if player == self.buzzed and not self.show_answer:
+                self.judge_typed(text)
+                return
+
+    def judge_typed(self, text):
+        handle_answer(is_correct(text, self.clue['answer']))
+        self.manager.pop()
+
+    def draw(self, surface):
+        self.place_buttons()
+        surface.fill(BLACK)
+        cat_surf = font_category.render(f"Category: {self.category}", True, ORANGE)
+        surface.blit(cat_surf, (20, 20))
+        if engine.wager_kind == "daily_double":
+            buzz_surf = font_score.render(f"Daily Double: {engine.team_names[self.buzzed]} "
+                                          f"for {engine.wagers[self.buzzed]}", True, ORANGE)
+            surface.blit(buzz_surf, (SCREEN_WIDTH - buzz_surf.get_width() - 20, 20))
+        elif self.buzzed is not None:
+            buzz_surf = font_score.render(f"{engine.team_names[self.buzzed]} buzzed in!", True, ORANGE)
+            surface.blit(buzz_surf, (SCREEN_WIDTH - buzz_surf.get_width() - 20, 20))
+
+        # Display question
+        draw_fitted(surface, self.clue['question'], None, question_box(), WHITE, CLUE_FONT_MAX, align="topleft")
+
+        if not self.show_answer:
+            if self.typed is not None:
+                pygame.draw.rect(surface, WHITE, self.typed_rect)
+                pygame.draw.rect(surface, ORANGE, self.typed_rect, 3)
+                draw_fitted(surface, self.typed + "_", None, self.typed_rect.inflate(-20, -8), BLACK, 36, align="left")
+            draw_button(self.answer_rect, GREEN, "Show Answer")
+        else:
             # Display answer
-            lines_ans = wrap_text(clue['answer'], font_clue, SCREEN_WIDTH-40)
-            for i, line in enumerate(lines_ans):
-                screen.blit(font_clue.render(line, True, YELLOW), (20, SCREEN_HEIGHT / 2 - 100 + i*60))
-
-            # Manual Score Prompt
-            prompt_lines = [
-                "WAGER & RESPONSE REVEALED. Manual Score Adjustment Required.",
-                "USE KEYS: [+] or [=] to ADD $1000, [-] to SUBTRACT $1000.",
-                "[T] to TOGGLE TEAM. Adjust for both teams, then click DONE."
-            ]
-            for i, line in enumerate(prompt_lines):
-                surf = font_score.render(line, True, RED if i == 0 else WHITE)
-                screen.blit(surf, (SCREEN_WIDTH/2 - surf.get_width()/2, SCREEN_HEIGHT - 350 + i*60))
-
-            # Done Button (exits to board)
-            done_rect = pygame.Rect(SCREEN_WIDTH/2-100, SCREEN_HEIGHT-150, 200, 60)
-            pygame.draw.rect(screen, GREEN, done_rect)
-            screen.blit(font_category.render("Done (Exit)", True, WHITE), (done_rect.x+20, done_rect.y+15))
-            
-            correct_rect = done_rect
-            wrong_rect = None
-            
-        # --- Regular Question Clue/Answer Flow ---
-        else: # Regular clue (not Final Jeopardy or fj_stage is not active)
-            # Display question
-            lines = wrap_text(clue['question'], font_clue, SCREEN_WIDTH*0.6)
-            for i, line in enumerate(lines):
-                screen.blit(font_clue.render(line, True, WHITE), (20, 90 + i * line_spacing))
-
-            if not show_answer:
-                # Button: Show Answer
-                answer_rect = pygame.Rect(SCREEN_WIDTH/2-100, SCREEN_HEIGHT-150, 200, 60)
-                pygame.draw.rect(screen, GREEN, answer_rect)
-                screen.blit(font_category.render("Show Answer", True, WHITE), (answer_rect.x+20, answer_rect.y+15))
+            draw_fitted(surface, self.clue['answer'], None, answer_box(), YELLOW, CLUE_FONT_MAX, align="topleft")
+            draw_button(self.correct_rect, GREEN, "Correct")
+            draw_button(self.wrong_rect, RED, "Wrong")
+
+    def handle(self, event):
+        if event.type == pygame.KEYDOWN and self.typed is not None and not self.show_answer:
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                if self.typed.strip():
+                    self.judge_typed(self.typed)
+            elif event.key == pygame.K_BACKSPACE:
+                self.typed = self.typed[:-1]
+            elif event.unicode and event.unicode.isprintable():
+                self.typed += event.unicode
+            self.manager.invalidate()
+            return
+        if buzzers.feed(event) or event.type != pygame.MOUSEBUTTONDOWN:
+            return
+        if not self.show_answer:
+            if self.answer_rect.collidepoint(event.pos):
+                self.show_answer = True
+                engine.reveal()
+        elif self.correct_rect.collidepoint(event.pos):
+            handle_answer(True)
+            self.manager.pop()
+        elif self.wrong_rect.collidepoint(event.pos):
+            handle_answer(False)
+            self.manager.pop()
+
+
+def draw_wager_box(surface, rect, text, error):
+    pygame.draw.rect(surface, WHITE, rect)
+    pygame.draw.rect(surface, ORANGE, rect, 3)
+    draw_fitted(surface, text + "_", None, rect.inflate(-20, -8), BLACK, 36, align="left")
+    if error:
+        surf = font_score.render(error, True, RED)
+        surface.blit(surf, (SCREEN_WIDTH/2 - surf.get_width()/2, rect.bottom + 20))
+
+
+def type_wager(event, typed):
+    """Digits typed into a wager box; returns the new text."""
+    if event.key == pygame.K_BACKSPACE:
+        return typed[:-1]
+    if event.unicode and event.unicode.isdigit() and len(typed) < 7:
+        return typed + event.unicode
+    return typed
+
+
+class WagerScene(Scene):
+    """
+    Daily double: the team whose turn it is types its wager, Enter to play.
+    The engine checks it against the team's score; a refused amount shows why.
+    """
+
+    def __init__(self, clue, category):
+        super().__init__()
+        self.clue = clue
+        self.category = category
+        self.typed = ""
+        self.error = None
+
+    def draw(self, surface):
+        surface.fill(BLACK)
+        cat_surf = font_category.render(f"Category: {self.category}", True, ORANGE)
+        surface.blit(cat_surf, (20, 20))
+        title = get_font(None, 120).render("DAILY DOUBLE!", True, YELLOW)
+        surface.blit(title, (SCREEN_WIDTH/2 - title.get_width()/2, SCREEN_HEIGHT/5))
+        low, high = engine.wager_range()
+        prompt = font_score.render(f"{engine.team_names[engine.current_team]}: wager {low} to {high}, then Enter",
+                                   True, WHITE)
+        surface.blit(prompt, (SCREEN_WIDTH/2 - prompt.get_width()/2, SCREEN_HEIGHT/2 - 80))
+        draw_wager_box(surface, pygame.Rect(SCREEN_WIDTH/2-200, SCREEN_HEIGHT/2, 400, 60), self.typed, self.error)
+
+    def handle(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            try:
+                engine.set_wager(self.typed)
+            except ValueError as e:
+                self.error = str(e)
+                self.typed = ""
             else:
-                # Display answer
-                lines_ans = wrap_text(clue['answer'], font_clue, SCREEN_WIDTH-40)
-                for i, line in enumerate(lines_ans):
-                    screen.blit(font_clue.render(line, True, YELLOW), (20, SCREEN_HEIGHT / 2 - 100 + i*60))
-
-                # Correct / Wrong buttons
-                correct_rect = pygame.Rect(SCREEN_WIDTH/2-220, SCREEN_HEIGHT-150, 200, 60)
-                wrong_rect = pygame.Rect(SCREEN_WIDTH/2+20, SCREEN_HEIGHT-150, 200, 60)
-                pygame.draw.rect(screen, GREEN, correct_rect)
-                pygame.draw.rect(screen, RED, wrong_rect)
-                screen.blit(font_category.render("Correct", True, WHITE), (correct_rect.x+50, correct_rect.y+15))
-                screen.blit(font_category.render("Wrong", True, WHITE), (wrong_rect.x+60, wrong_rect.y+15))
-
-
-        pygame.display.flip()
-
-        # --- Event handling ---
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                
-                # --- Final Jeopardy State Transitions ---
-                if is_final_jeopardy:
-                    if correct_rect and correct_rect.collidepoint(mx,my):
-                        if fj_stage == 1:
-                            fj_stage = 2 # Wager collected, move to Clue
-                        elif fj_stage == 2:
-                            fj_stage = 3 # Clue displayed, move to Answer/Score
-                        elif fj_stage == 3:
-                            clue['used'] = True # Done scoring
-                            running = False # Exit to board
-                        
-                # --- Regular Question Flow ---
-                elif not is_final_jeopardy:
-                    if not show_answer and answer_rect and answer_rect.collidepoint(mx,my):
-                        show_answer = True
-                    
-                    elif show_answer:
-                        if correct_rect and correct_rect.collidepoint(mx,my):
-                            handle_answer(True, clue['points'])
-                            clue['used'] = True
-                            running = False
-                        elif wrong_rect and wrong_rect.collidepoint(mx,my):
-                            handle_answer(False, clue['points'])
-                            clue['used'] = True
-                            running = False
-
-
-def handle_answer(correct, points):
-    global current_team
-    if correct:
-        team_scores[current_team] += points
-        if sound_correct: sound_correct.play()
-    else:
-        team_scores[current_team] -= points # Subtract points for wrong answer
-        if sound_wrong: sound_wrong.play()
+                self.manager.replace(ClueScene(self.clue, self.category))
+                return
+        else:
+            self.typed = type_wager(event, self.typed)
+        self.manager.invalidate()
+
+
+class FinalScene(Scene):
+    """
+    Final Jeopardy (a round 3 clue, or points == 0).
+    Stage 1: each team types its wager in turn (masked, so the others can't
+    see it), 2: clue display, 3: answer, judged team by team with the wagers
+    revealed as they are scored. The +/- keys still adjust scores by hand.
+    """
+
+    def __init__(self, clue):
+        super().__init__()
+        self.clue = clue
+        self.stage = 1
+        self.typed = ""
+        self.error = None
+        self.results = {}  # team -> (correct, wager); the engine forgets the wagers once all are judged
+        self.button_rect = pygame.Rect(SCREEN_WIDTH/2-150, SCREEN_HEIGHT-150, 300, 60)
+
+    def wagering_team(self):
+        return next((t for t in engine.wager_teams() if t not in engine.wagers), None)
+
+    def judge_rects(self):
+        """(team, correct rect, wrong rect) for every team, one row each."""
+        rows = []
+        top = SCREEN_HEIGHT/2 - 60
+        step = min(70, (SCREEN_HEIGHT - 200 - top) / max(1, len(engine.team_names)))
+        for team in range(len(engine.team_names)):
+            y = top + team * step
+            rows.append((team, pygame.Rect(SCREEN_WIDTH/2 + 100, y, 160, step - 10),
+                         pygame.Rect(SCREEN_WIDTH/2 + 280, y, 160, step - 10)))
+        return rows
+
+    def draw(self, surface):
+        self.button_rect = pygame.Rect(SCREEN_WIDTH/2-150, SCREEN_HEIGHT-150, 300, 60)
+        surface.fill(BLACK)
+        surface.blit(font_category.render("FINAL JEOPARDY!", True, RED), (20, 20))
+
+        if self.stage == 1:
+            title = font_score.render("STAGE 1: WAGERS (other teams look away)", True, ORANGE)
+            surface.blit(title, (SCREEN_WIDTH/2 - title.get_width()/2, SCREEN_HEIGHT/4))
+            team = self.wagering_team()
+            low, high = engine.wager_range(team)
+            prompt = font_score.render(f"{engine.team_names[team]}: wager {low} to {high}, then Enter", True, WHITE)
+            surface.blit(prompt, (SCREEN_WIDTH/2 - prompt.get_width()/2, SCREEN_HEIGHT/2 - 80))
+            draw_wager_box(surface, pygame.Rect(SCREEN_WIDTH/2-200, SCREEN_HEIGHT/2, 400, 60),
+                           "*" * len(self.typed), self.error)
+            done = ", ".join(engine.team_names[t] for t in engine.wagers)
+            if done:
+                surf = font_score.render(f"Wagered: {done}", True, GRAY)
+                surface.blit(surf, (SCREEN_WIDTH/2 - surf.get_width()/2, SCREEN_HEIGHT/2 + 160))
+
+        elif self.stage == 2:
+            title = font_score.render("STAGE 2: CLUE DISPLAY (Teams must write their answer!)", True, RED)
+            surface.blit(title, (SCREEN_WIDTH/2 - title.get_width()/2, SCREEN_HEIGHT/4))
+            box = question_box().move(0, SCREEN_HEIGHT/4 + 60 - 90)
+            draw_fitted(surface, self.clue['question'], None, box, WHITE, CLUE_FONT_MAX, align="topleft")
+            draw_button(self.button_rect, ORANGE, "Show Answer/Score")
 
-    current_team = 1 - current_team  # switch turn
-    
+        else:
+            box = answer_box()
+            box.height = SCREEN_HEIGHT/2 - 320  # the teams are judged below
+            box.y = 90
+            draw_fitted(surface, self.clue['answer'], None, box, YELLOW, CLUE_FONT_MAX, align="topleft")
+            for team, correct_rect, wrong_rect in self.judge_rects():
+                if team in self.results:
+                    correct, wager = self.results[team]
+                    label = f"{engine.team_names[team]}: {'right' if correct else 'wrong'}, wagered {wager} -> {engine.scores[team]}"
+                else:
+                    label = f"{engine.team_names[team]}: {engine.scores[team]}"
+                    if engine.open_cell is not None:
+                        draw_button(correct_rect, GREEN, "Correct")
+                        draw_button(wrong_rect, RED, "Wrong")
+                surf = font_score.render(label, True, WHITE)
+                surface.blit(surf, (correct_rect.x - 40 - surf.get_width(),
+                                    correct_rect.centery - surf.get_height() / 2))
+            hint = font_score.render("[+]/[-] adjust the current team by $1000, [T] switches team", True, GRAY)
+            surface.blit(hint, (SCREEN_WIDTH/2 - hint.get_width()/2, SCREEN_HEIGHT - 220))
+            draw_button(self.button_rect, GREEN, "Done (Exit)")
+
+    def handle(self, event):
+        if self.stage == 1:
+            if event.type != pygame.KEYDOWN:
+                return
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                try:
+                    engine.set_wager(self.typed, self.wagering_team())
+                except ValueError as e:
+                    self.error = str(e)
+                else:
+                    self.error = None
+                    if engine.phase == "clue":  # every team has wagered
+                        self.stage = 2
+                self.typed = ""
+            else:
+                self.typed = type_wager(event, self.typed)
+            self.manager.invalidate()
+        elif event.type == pygame.KEYDOWN and self.stage == 3:
+            handle_score_keys(event)
+        elif event.type == pygame.MOUSEBUTTONDOWN and self.stage == 2:
+            if self.button_rect.collidepoint(event.pos):
+                engine.reveal()
+                self.stage = 3
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            for team, correct_rect, wrong_rect in self.judge_rects():
+                if team in self.results or engine.open_cell is None:
+                    continue
+                for rect, correct in ((correct_rect, True), (wrong_rect, False)):
+                    if rect.collidepoint(event.pos):
+                        self.results[team] = (correct, engine.wagers[team])
+                        handle_answer(correct, team)
+            if self.button_rect.collidepoint(event.pos):
+                engine.close() # Teams not judged keep their score
+                self.manager.pop()
+
+
+class BoardScene(Scene):
+    def __init__(self):
+        super().__init__()
+        self.buttons, self.prev_rect, self.next_rect, self.score_rects, self.goto_rect = [], None, None, [], None
+
+    def update(self, dt):
+        # Polled rather than handled: DATASET_LOADED may arrive while a clue is on top
+        if pending_rounds is not None and pending_rounds.done():
+            finish_loading()
+            self.manager.invalidate()
+
+    def draw(self, surface):
+        self.buttons, self.prev_rect, self.next_rect, self.score_rects, self.goto_rect = draw_board()
+
+    def handle(self, event):
+        global seek_text
+        if event.type == pygame.KEYDOWN and seek_text is not None:
+            # Typing into the Go To box
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                pos = episode_index.seek(seek_text, current_round_index)
+                if pos is not None:
+                    set_round(pos)
+                seek_text = None
+            elif event.key == pygame.K_ESCAPE:
+                seek_text = None
+            elif event.key == pygame.K_BACKSPACE:
+                seek_text = seek_text[:-1]
+            elif event.unicode and event.unicode in "0123456789-+#dwmDWM":
+                seek_text += event.unicode
 
-# --- Main loop ---
-running = True
-while running:
-    # --- IMPORTANT CHANGE: draw_board now returns score_rects ---
-    buttons, prev_rect, next_rect, score_rects = draw_board()
-    pygame.display.flip()
-    
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-            
         elif event.type == pygame.KEYDOWN:
-            # Manual Score Adjustment Keys
-            if event.key == pygame.K_PLUS or event.key == pygame.K_KP_PLUS or event.key == pygame.K_EQUALS:
-                team_scores[current_team] += 1000
-            elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:
-                team_scores[current_team] -= 1000
-            elif event.key == pygame.K_t: # 'T' to switch team
-                current_team = 1 - current_team
-            
+            if handle_score_keys(event):
+                pass
+            elif event.key == pygame.K_g: # 'G' to open the Go To box
+                seek_text = ""
+            elif event.key == pygame.K_s: # 'S' to save the game (resume with --resume)
+                save_game()
+            # Episode navigation: arrows step rounds, PgUp/PgDn jump a week, Home/End jump a month
+            elif rounds_list and event.key == pygame.K_LEFT:
+                set_round(max(0, current_round_index - 1))
+            elif rounds_list and event.key == pygame.K_RIGHT:
+                set_round(min(len(rounds_list) - 1, current_round_index + 1))
+            elif rounds_list and event.key == pygame.K_PAGEUP:
+                set_round(episode_index.jump_days(current_round_index, -7))
+            elif rounds_list and event.key == pygame.K_PAGEDOWN:
+                set_round(episode_index.jump_days(current_round_index, 7))
+            elif rounds_list and event.key == pygame.K_HOME:
+                set_round(episode_index.jump_months(current_round_index, -1))
+            elif rounds_list and event.key == pygame.K_END:
+                set_round(episode_index.jump_months(current_round_index, 1))
+
         elif event.type == pygame.MOUSEBUTTONDOWN:
-            mx, my = pygame.mouse.get_pos()
-            
+            mx, my = event.pos
+
             # 1. Round navigation
-            if prev_rect and prev_rect.collidepoint(mx, my):
-                current_round_index = max(0, current_round_index - 1)
-            elif next_rect and next_rect.collidepoint(mx, my):
-                current_round_index = min(len(rounds_list) - 1, current_round_index + 1)
-            
+            if self.prev_rect and self.prev_rect.collidepoint(mx, my):
+                set_round(max(0, current_round_index - 1))
+            elif self.next_rect and self.next_rect.collidepoint(mx, my):
+                set_round(min(len(rounds_list) - 1, current_round_index + 1))
+            elif self.goto_rect and self.goto_rect.collidepoint(mx, my):
+                seek_text = "" if seek_text is None else None
+
             # 2. Score adjustment (Manual Scoring)
             # Clicking the score area while on the board adjusts the current team's score by +$1000
-            for i, rect in enumerate(score_rects):
-                if rect.collidepoint(mx, my) and i == current_team:
-                    team_scores[i] += 1000
+            for i, rect in enumerate(self.score_rects):
+                if rect.collidepoint(mx, my) and i == engine.current_team:
+                    engine.adjust_score(1000, i)
                     break
 
             # 3. Clue buttons
-            for b in buttons:
-                if b['rect'].collidepoint(mx, my) and not b['clue']['used']:
-                    # Find category for this clue
-                    for cat, clues in rounds_dict[rounds_list[current_round_index]].items():
-                        if b['clue'] in clues:
-                            show_question(b['clue'], cat)
-                            break
+            for b in self.buttons:
+                if b['rect'].collidepoint(mx, my) and engine.open(b['col'], b['row']) is not None:
+                    if engine.wager_kind == "final":
+                        self.manager.push(FinalScene(b['clue']))
+                    elif engine.wager_kind == "daily_double":
+                        self.manager.push(WagerScene(b['clue'], engine.open_category))
+                    else:
+                        self.manager.push(ClueScene(b['clue'], engine.open_category))
+                    break
+
+
+def handle_score_keys(event):
+    """Manual score adjustment keys; returns True if the key was one of them."""
+    if event.key == pygame.K_PLUS or event.key == pygame.K_KP_PLUS or event.key == pygame.K_EQUALS:
+        engine.adjust_score(1000)
+    elif event.key == pygame.K_MINUS or event.key == pygame.K_KP_MINUS:
+        engine.adjust_score(-1000)
+    elif event.key == pygame.K_t: # 'T' to switch team
+        engine.next_team()
+    else:
+        return False
+    return True
+
+
+def handle_answer(correct, team=None):
+    # Scoring (including the wrong-answer penalty and wagers) and the turn switch happen in the engine
+    engine.judge(correct, team)
+    if correct:
+        if sound_correct: sound_correct.play()
+    else:
+        if sound_wrong: sound_wrong.play()
+
+
+# --- Main loop ---
+scenes = SceneManager(screen, FPS)
+scenes.resize_handlers.append(on_resize)
+scenes.quit_handlers.append(buzzers.close)
+if args.mirror is not None:
+    mirror = MirrorPublisher(engine, port=args.mirror)
+    print(f"Mirror: python jeopardy_mirror.py {mirror.start()}")
+    scenes.quit_handlers.append(mirror.close)
+if not args.no_log:
+    event_log = EventLog(engine, log_path(args.log_dir), source=csv_file)  # the snapshot's dataset under --resume
+    event_log.start()
+    scenes.quit_handlers.append(event_log.close)
+startup.ready()
+scenes.push(BoardScene())
+scenes.run()
 
 pygame.quit()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+jeopardy_layout.py - Board layout computed from the window size and board shape
+
+Every size on the board (score bar, category headers, tiles, the button row
+below, font sizes) is derived from the window size and the number of
+columns and rows, so the board fits any window, fullscreen included, and
+6+ categories no longer run off the right edge.
+
+A layout is pure arithmetic on rects, but draw_board runs on every repaint
+and the hit-testing on every click. LayoutCache keeps one BoardLayout per
+(window size, board shape) and is cleared on VIDEORESIZE.
+
+fit_text() picks the largest font size at which a clue or category name
+wraps into its box, so long text shrinks instead of spilling off the tile
+or the screen. Wrapping and drawing go through jeopardy_text, so Chinese
+text wraps between characters and is drawn from cached glyphs.
+"""
+
+import pygame
+from jeopardy_text import wrap_lines, text_width, render_text
+
+# ---------- Specs ----------
+# Fractions of the window; each front-end picks one (or passes its own)
+LAYOUT_DEFAULT = {
+    "margin": 0.03,     # left/right margin, fraction of width
+    "top": 0.11,        # score bar above the categories, fraction of height
+    "category": 0.10,   # category header height, fraction of height
+    "bottom": 0.14,     # button row below the board, fraction of height
+    "gap": 0.010,       # gap between tiles, fraction of the smaller side
+}
+
+
+class BoardLayout:
+    def __init__(self, size, cols, rows, spec=None):
+        spec = LAYOUT_DEFAULT if spec is None else spec
+        self.size = size
+        self.cols = max(cols, 1)
+        self.rows = max(rows, 1)
+        width, height = size
+        gap = max(2, round(min(width, height) * spec["gap"]))
+        margin = round(width * spec["margin"])
+        top = round(height * spec["top"])
+        category_h = round(height * spec["category"])
+        bottom = round(height * spec["bottom"])
+
+        self.gap = gap
+        self.header = pygame.Rect(margin, 0, width - 2 * margin, top)
+        self.footer = pygame.Rect(margin, height - bottom, width - 2 * margin, bottom)
+        self.tile_w = max(1, (width - 2 * margin - (self.cols - 1) * gap) // self.cols)
+        board_h = height - top - bottom - category_h - gap
+        self.tile_h = max(1, (board_h - (self.rows - 1) * gap) // self.rows)
+        # Centre the columns: integer tile widths leave a few pixels over
+        self.left = (width - (self.cols * self.tile_w + (self.cols - 1) * gap)) // 2
+        self.category_top = top
+        self.category_h = category_h
+        self.tiles_top = top + category_h + gap
+        self.board_bottom = self.tiles_top + self.rows * (self.tile_h + gap) - gap
+
+        # Font sizes in pixels: tile labels are short ("$1000", "FINAL!")
+        self.header_font = max(12, int(top * 0.36))
+        self.category_font = max(10, min(int(category_h * 0.3), int(self.tile_w * 0.14)))
+        self.tile_font = max(10, min(int(self.tile_h * 0.4), int(self.tile_w * 0.16)))
+
+    def column_x(self, col):
+        return self.left + col * (self.tile_w + self.gap)
+
+    def category_rect(self, col):
+        return pygame.Rect(self.column_x(col), self.category_top, self.tile_w, self.category_h)
+
+    def tile_rect(self, col, row):
+        return pygame.Rect(self.column_x(col), self.tiles_top + row * (self.tile_h + self.gap),
+                           self.tile_w, self.tile_h)
+
+    def tile_at(self, pos):
+        """(col, row) under pos, or (None, None) for gaps and everything off the grid."""
+        x, y = pos[0] - self.left, pos[1] - self.tiles_top
+        if x < 0 or y < 0:
+            return None, None
+        col, cx = divmod(x, self.tile_w + self.gap)
+        row, cy = divmod(y, self.tile_h + self.gap)
+        if col >= self.cols or row >= self.rows or cx >= self.tile_w or cy >= self.tile_h:
+            return None, None
+        return int(col), int(row)
+
+
+class LayoutCache:
+    def __init__(self, spec=None):
+        self.spec = spec
+        self.layouts = {}
+
+    def get(self, size, cols, rows):
+        key = (tuple(size), cols, rows)
+        layout = self.layouts.get(key)
+        if layout is None:
+            layout = self.layouts[key] = BoardLayout(key[0], cols, rows, self.spec)
+        return layout
+
+    def invalidate(self):
+        self.layouts.clear()
+
+
+# ---------- Fonts ----------
+_fonts = {}
+
+def get_font(name, size):
+    """Font objects are slow to create; keep one per (file, pixel size)."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.Font(name, size)
+    return font
+
+
+# ---------- Text fitting ----------
+FIT_CACHE_SIZE = 1024
+_fits = {}
+
+def _fits_box(lines, font, width, height):
+    if len(lines) * font.get_linesize() > height:
+        return False
+    return all(text_width(font, line) <= width for line in lines)
+
+def fit_text(text, name, size, max_font, min_font=10):
+    """
+    Largest font size in [min_font, max_font] at which `text`, word-wrapped to
+    size[0], fits in size[1] pixels. Returns (font, lines); at min_font the text
+    is returned wrapped even if it still overflows. Binary search, memoised per
+    (text, font file, box, bounds).
+    """
+    key = (text, name, tuple(size), max_font, min_font)
+    fitted = _fits.get(key)
+    if fitted is not None:
+        return fitted
+    width, height = size
+    lo, hi = min_font, max(min_font, max_font)
+    fitted = None
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        font = get_font(name, mid)
+        lines = wrap_lines(text, font, width)
+        if _fits_box(lines, font, width, height):
+            fitted = (font, lines)
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    if fitted is None:
+        font = get_font(name, min_font)
+        fitted = (font, wrap_lines(text, font, width))
+    if len(_fits) >= FIT_CACHE_SIZE:
+        _fits.clear()  # a whole board's worth of text is far below the limit
+    _fits[key] = fitted
+    return fitted
+
+def draw_fitted(surface, text, name, rect, color, max_font, min_font=10, align="center"):
+    """
+    Fit `text` into `rect` and draw it on a surface or a jeopardy_render
+    renderer. align: "center", "left" (vertically centred) or "topleft".
+    Returns the height of the drawn text.
+    """
+    font, lines = fit_text(text, name, rect.size, max_font, min_font)
+    line_h = font.get_linesize()
+    text_h = len(lines) * line_h
+    y = rect.y if align == "topleft" else rect.y + (rect.height - text_h) // 2
+    renderer = hasattr(surface, "present")
+    for line in lines:
+        image = surface.text(font, line, color) if renderer else render_text(font, line, color)
+        x = rect.x + (rect.width - image.get_rect().width) // 2 if align == "center" else rect.x
+        if renderer:
+            surface.draw(image, (x, y))
+        else:
+            surface.blit(image, (x, y))
+        y += line_h
+    return text_h
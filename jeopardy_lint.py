@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+jeopardy_lint.py - Check q*.txt question sets before a show
+
+Usage: python jeopardy_lint.py [PATH ...] [--workers N] [--json] [--strict]
+
+PATH is a question set or a directory of them (q*.txt); the default is
+questions/ and the current directory. The loader accepts almost anything
+and fills the gaps silently -- a `correct` that is not 1-4 or A-D is kept
+as text and every answer is then judged wrong, a missing square_text
+becomes 100 -- so the linter reports what the game would do instead:
+
+    errors    not UTF-8, missing columns, rows with too many or too few
+              fields, empty questions, `correct` not 1-4/A-D or pointing
+              at an empty option, fewer than 2 options, square_text
+              without a number, two clues with the same value in a category
+    warnings  byte order mark, mojibake or control characters, unknown
+              columns, fewer than 4 options, repeated options, missing
+              square_text or time, categories with more or fewer clues
+              than the others
+
+Files are checked in a process pool (serially when there are only a few).
+Findings print as path:line: level code: message; --json prints them as
+one JSON document instead. The exit status is 1 when there are errors (or,
+with --strict, warnings), so it can gate a show.
+"""
+
+import argparse, csv, glob, io, json, os, re, sys, time
+from collections import Counter
+from multiprocessing import Pool
+
+from jeopardy_data import detect_delimiter, parse_question_row
+
+REQUIRED = ["subtype", "question", "option1", "option2", "option3", "option4", "correct", "time", "square_text"]
+OPTIONAL = ["daily_double", "daily_double_value", "category"]
+SERIAL_FILES = 16  # below this a process pool costs more than it saves
+
+_mojibake_re = re.compile("Ã.|Â.|â€|ï»¿")
+_control_re = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+# ---------- Checks ----------
+def lint_file(path):
+    """[(path, line, level, code, message), ...] for one question set."""
+    findings = []
+
+    def report(line, level, code, message):
+        findings.append((path, line, level, code, message))
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        report(0, "error", "unreadable", str(e))
+        return findings
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        line = data[:e.start].count(b"\n") + 1
+        report(line, "error", "not-utf8", f"byte 0x{data[e.start]:02x} is not UTF-8 (saved as another encoding?)")
+        text = data.decode("utf-8", errors="replace")
+    if text.startswith("﻿"):
+        report(1, "warning", "bom", "starts with a byte order mark; the game reads the first column as unnamed, so every category is lost")
+        text = text[1:]
+    if not text.strip():
+        report(0, "error", "empty", "file is empty")
+        return findings
+
+    header_line = text.split("\n", 1)[0]
+    delimiter = detect_delimiter(header_line)
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter)
+    header = [h.strip() for h in next(reader)]
+    missing = [c for c in REQUIRED if c not in header and not (c == "subtype" and "category" in header)]
+    if missing:
+        report(1, "error", "missing-column", "missing column(s): " + ", ".join(missing))
+        if "question" in missing:
+            return findings  # not a question set header; every row would repeat the error
+    for name in header:
+        if name and name not in REQUIRED and name not in OPTIONAL:
+            report(1, "warning", "unknown-column", f"unknown column {name!r} is ignored")
+
+    categories = {}  # category -> [(line, points, final)]
+    rows = 0
+    for values in reader:
+        line = reader.line_num
+        if not any(v.strip() for v in values):
+            continue
+        rows += 1
+        raw = " ".join(values)
+        if _mojibake_re.search(raw):
+            report(line, "warning", "mojibake", "looks like text decoded with the wrong encoding")
+        if _control_re.search(raw):
+            report(line, "warning", "control-char", "contains control characters")
+        row = dict(zip(header, values))
+        q = parse_question_row(row)
+        if len(values) != len(header):
+            report(line, "error", "ragged-row", f"{len(values)} fields, header has {len(header)} "
+                                               f"(a stray {'tab' if delimiter == chr(9) else 'comma'}?)")
+            # The fields are shifted, so the checks below would only repeat this; the
+            # game still shows the clue, so it counts towards its category's size
+            categories.setdefault(q["subtype"] or "Misc", []).append((line, None, q["final"]))
+            continue
+
+        if not q["question"]:
+            report(line, "error", "empty-question", "no question text")
+        filled = [i for i, o in enumerate(q["options"]) if o]
+        if len(filled) < 2:
+            report(line, "error", "few-options", f"{len(filled)} option(s); a question needs at least 2")
+        elif len(filled) < 4:
+            report(line, "warning", "few-options", f"only {len(filled)} of 4 options filled")
+        repeated = [o for o, n in Counter(o.lower() for o in q["options"] if o).items() if n > 1]
+        if repeated:
+            report(line, "warning", "duplicate-option", f"option {repeated[0]!r} appears more than once")
+        if not isinstance(q["correct"], int):
+            shown = q["correct_raw"] or "(empty)"
+            report(line, "error", "bad-correct", f"correct is {shown!r}, not 1-4 or A-D; every answer would be wrong")
+        elif not q["options"][q["correct"]]:
+            report(line, "error", "correct-empty-option", f"correct option {q['correct'] + 1} is empty")
+
+        square = (row.get("square_text") or "").strip()
+        if not square:
+            report(line, "warning", "missing-square-text", "no square_text; shown as 100")
+        elif not re.search(r"\d", square) and not q["final"]:
+            report(line, "error", "bad-square-text", f"square_text {square!r} has no number; shown as 100")
+        time_text = (row.get("time") or "").strip()
+        if not time_text.isdigit():
+            report(line, "warning", "bad-time", f"time {time_text or '(empty)'!r} is not whole seconds; 20 s is used")
+        categories.setdefault(q["subtype"] or "Misc", []).append((line, q["points"], q["final"]))
+
+    if rows == 0:
+        report(1, "error", "no-rows", "header only, no questions")
+    for category, clues in categories.items():
+        seen = {}
+        for line, points, final in clues:
+            if final or points is None:
+                continue
+            if points in seen:
+                report(line, "error", "duplicate-points",
+                       f"{category!r} already has a {points} clue (line {seen[points]})")
+            else:
+                seen[points] = line
+    sizes = Counter(len(clues) for clues in categories.values() if not all(c[2] for c in clues))
+    if len(sizes) > 1:
+        usual = sizes.most_common(1)[0][0]
+        for category, clues in categories.items():
+            if len(clues) != usual and not all(c[2] for c in clues):
+                report(clues[0][0], "warning", "ragged-category",
+                       f"{category!r} has {len(clues)} clues, most categories have {usual}")
+    findings.sort(key=lambda f: f[1])
+    return findings
+
+# ---------- Batch ----------
+def find_sets(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "q*.txt"))))
+        else:
+            files.append(path)
+    return files
+
+def lint_all(files, workers=None):
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) < SERIAL_FILES:
+        results = [lint_file(path) for path in files]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(lint_file, files, chunksize=max(1, len(files) // (4 * workers)))
+    return [finding for result in results for finding in result]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check q*.txt question sets for problems the game would hide")
+    parser.add_argument("paths", nargs="*", help="question sets or directories (default: questions/ and .)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--json", action="store_true", help="print the findings as JSON")
+    parser.add_argument("--strict", action="store_true", help="fail on warnings too")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    paths = args.paths or [p for p in ("questions", ".") if os.path.isdir(p)]
+    files = find_sets(paths)
+    findings = lint_all(files, args.workers)
+    errors = sum(1 for f in findings if f[2] == "error")
+    warnings = len(findings) - errors
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        json.dump({"files": len(files), "errors": errors, "warnings": warnings,
+                   "findings": [dict(zip(("file", "line", "level", "code", "message"), f)) for f in findings]},
+                  sys.stdout, indent=1, ensure_ascii=False)
+        print()
+    else:
+        for path, line, level, code, message in findings:
+            print(f"{path}:{line}: {level} {code}: {message}")
+        print(f"{len(files)} files, {errors} errors, {warnings} warnings ({elapsed:.2f} s)")
+    return 1 if errors or (args.strict and warnings) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
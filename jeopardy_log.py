@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+jeopardy_log.py - Per-game event log and post-game analytics
+
+The game attaches an EventLog to its GameEngine. Every engine event (board
+loaded, clue opened, answer judged, score adjusted by hand, turn, clue
+closed) becomes one JSON line in logs/game-YYYYMMDD-HHMMSS.jsonl. The
+listener only timestamps the event and puts it on a queue, so the click
+handlers that judge answers pay a few microseconds; a writer thread turns
+events into JSON, adds the time taken to answer, and writes them in
+batches (every FLUSH_EVENTS events or FLUSH_SECONDS seconds).
+
+Analysis, over one or more logs:
+    python jeopardy_log.py logs/*.jsonl [--top N] [--json FILE]
+
+prints accuracy per category, answers and average response time per team,
+manual adjustments, and the hardest clues (lowest accuracy, then slowest).
+"""
+
+import argparse, json, os, queue, sys, threading, time
+from datetime import datetime
+
+from jeopardy_data import clue_response
+
+FLUSH_EVENTS = 64
+FLUSH_SECONDS = 1.0
+
+def log_path(log_dir):
+    return os.path.join(log_dir, datetime.now().strftime("game-%Y%m%d-%H%M%S.jsonl"))
+
+# ---------- Writer ----------
+class EventLog:
+    def __init__(self, engine, path, source=None):
+        self.engine = engine
+        self.path = path
+        self.source = source
+        self.queue = queue.SimpleQueue()
+        self.thread = None
+        self.started = time.perf_counter()
+
+    def start(self):
+        self.engine.listeners.append(self.on_event)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.queue.put((0.0, {"type": "session", "teams": list(self.engine.team_names),
+                              "source": self.source, "started": datetime.now().isoformat(timespec="seconds")}, None))
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+        return self.path
+
+    def close(self):
+        """Write what is still queued and close the file (scene quit handler)."""
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+        self.thread = None
+
+    def on_event(self, event):
+        """Engine listener (game thread): timestamp and queue; everything else happens on the writer."""
+        context = None
+        if event["type"] == "open":
+            context = self.engine.clue_at(event["col"], event["row"])
+        elif event["type"] == "board":
+            context = list(self.engine.category_names)
+        self.queue.put((time.perf_counter() - self.started, dict(event), context))
+
+    def note(self, kind, **data):
+        """Log something the engine does not see (e.g. the source of a new board)."""
+        data["type"] = kind
+        self.queue.put((time.perf_counter() - self.started, data, None))
+
+    def _write_loop(self):
+        opened = None  # (seconds, category, points, question) of the open clue
+        lines, last_flush = [], time.perf_counter()
+        while True:
+            try:
+                item = self.queue.get(timeout=FLUSH_SECONDS)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                t, record, context = item
+                kind = record["type"]
+                if kind == "open":
+                    record["question"] = context["question"]
+                    record["answer"] = clue_response(context)
+                    opened = (t, record["category"], record["points"], record["question"])
+                elif kind == "board":
+                    record["category_names"] = context
+                elif kind == "judge" and opened is not None:
+                    record["ms"] = round((t - opened[0]) * 1000)
+                    record["category"], record["points"], record["question"] = opened[1:]
+                elif kind == "close":
+                    opened = None
+                record["t"] = round(t * 1000)
+                lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+            now = time.perf_counter()
+            if lines and (len(lines) >= FLUSH_EVENTS or now - last_flush >= FLUSH_SECONDS):
+                self._flush(lines)
+                lines, last_flush = [], now
+        self._flush(lines)
+        self.file.close()
+
+    def _flush(self, lines):
+        try:
+            self.file.writelines(lines)
+            self.file.flush()
+        except OSError as e:
+            print(f"Event log: {e}")
+
+# ---------- Analytics ----------
+def read_log(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by a crash
+
+def analyse(paths):
+    categories = {}  # category -> [answers, correct]
+    teams = {}       # team name -> [answers, correct, total ms, adjustments, adjusted points]
+    clues = {}       # (category, question) -> [answers, correct, total ms, points]
+    sessions = 0
+    for path in paths:
+        names = []
+        for record in read_log(path):
+            kind = record.get("type")
+            if kind == "session":
+                sessions += 1
+                names = record.get("teams") or []
+            elif kind in ("judge", "score"):
+                team = record.get("team", 0)
+                name = names[team] if team < len(names) else f"Team {team + 1}"
+                stats = teams.setdefault(name, [0, 0, 0, 0, 0])
+                if kind == "score":
+                    if record.get("reason") == "manual":
+                        stats[3] += 1
+                        stats[4] += record.get("delta", 0)
+                    continue
+                if "question" not in record:
+                    continue
+                correct = bool(record.get("correct"))
+                ms = record.get("ms", 0)
+                stats[0] += 1
+                stats[1] += correct
+                stats[2] += ms
+                cat = categories.setdefault(record["category"], [0, 0])
+                cat[0] += 1
+                cat[1] += correct
+                clue = clues.setdefault((record["category"], record["question"]), [0, 0, 0, record.get("points", 0)])
+                clue[0] += 1
+                clue[1] += correct
+                clue[2] += ms
+    return {
+        "sessions": sessions,
+        "categories": [{"category": c, "answers": n, "correct": k, "accuracy": round(k / n, 3)}
+                       for c, (n, k) in sorted(categories.items(), key=lambda i: (i[1][1] / i[1][0], i[0]))],
+        "teams": [{"team": t, "answers": n, "correct": k, "average_ms": round(ms / n) if n else None,
+                   "adjustments": adj, "adjusted_points": pts}
+                  for t, (n, k, ms, adj, pts) in sorted(teams.items())],
+        "hardest": [{"category": c, "question": q, "points": pts, "answers": n, "correct": k,
+                     "accuracy": round(k / n, 3), "average_ms": round(ms / n)}
+                    for (c, q), (n, k, ms, pts) in sorted(clues.items(),
+                                                         key=lambda i: (i[1][1] / i[1][0], -i[1][2] / i[1][0]))],
+    }
+
+def print_analysis(result, top):
+    print(f"{result['sessions']} sessions")
+    print("\nTeams (answers, correct, average response):")
+    for t in result["teams"]:
+        avg = f"{t['average_ms'] / 1000:.1f} s" if t["average_ms"] is not None else "-"
+        line = f"  {t['team']}: {t['answers']} answers, {t['correct']} correct, {avg}"
+        if t["adjustments"]:
+            line += f", {t['adjustments']} manual adjustments ({t['adjusted_points']:+d})"
+        print(line)
+    print("\nCategories, hardest first (accuracy, answers):")
+    for c in result["categories"][:top]:
+        print(f"  {c['accuracy']:5.0%} {c['answers']:4d}  {c['category']}")
+    print("\nHardest clues:")
+    for c in result["hardest"][:top]:
+        print(f"  {c['accuracy']:5.0%} {c['average_ms'] / 1000:5.1f} s  [{c['category']} {c['points']}] {c['question']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Post-game analytics over jeopardy event logs")
+    parser.add_argument("logs", nargs="+", help="game-*.jsonl files written with the game's event log")
+    parser.add_argument("--top", type=int, default=10, metavar="N", help="categories and clues to print")
+    parser.add_argument("--json", metavar="FILE", help="write the full analysis as JSON")
+    args = parser.parse_args(argv)
+    try:
+        result = analyse(args.logs)
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    print_analysis(result, args.top)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1, ensure_ascii=False)
+            f.write("\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+jeopardy_match.py - Judge typed free-text responses against a clue's answer
+
+Both sides are reduced to a canonical form first: HTML and the dataset's
+backslash escapes removed, full-width forms and accents on Latin letters
+folded (é -> e), case folded, punctuation dropped (letters and digits of
+any script are kept, so a Chinese answer stays Chinese), then a leading
+"what is" / "who are" and a leading article stripped. "What's the
+Jordan?" and "jordan" both become "jordan".
+
+An answer can have several accepted forms: "(the) Jordan", "Kitty Hawk or
+Kill Devil Hills", "Lincoln (Abe Lincoln)". A response is correct if it is
+within a few typos (insert, delete, substitute, swap two letters; the
+allowance grows with the answer's length) of one form; in CJK text a
+character is a whole word, so there the form must be typed exactly. Part
+of a form is not enough: the last word of "the Pacific Ocean" or "New
+York" is as often a generic noun as a surname, so a bare surname only
+counts where the data lists it as a form ("(Abraham) Lincoln").
+
+AnswerKey precomputes the forms and their letter-trigram sets when a board
+is loaded (prepare()). Judging a response is then a set difference, which
+rules out almost every far-off form, and a banded edit distance for the
+rest; well under a millisecond per response.
+"""
+
+import re, unicodedata
+
+from jeopardy_data import CJK_CHARS
+
+KEY_CACHE_SIZE = 4096  # answers kept; a board has ~30
+
+_TAGS = re.compile(r"<[^>]+>")
+_NON_WORD = re.compile(r"[\W_]+")
+_PREFIX = re.compile(r"^(?:(?:who|what|where|when|which)(?: is| are| was| were|s)? )?(?:(?:the|a|an) )?")
+_PARENS = re.compile(r"\(([^)]*)\)")
+_OR = re.compile(r"\s+or\s+|\s+/\s+")
+_CJK = re.compile(f"[{CJK_CHARS}]")
+
+# ---------- Canonical forms ----------
+def fold_accent(c):
+    """é -> e; marks on other scripts are kept (dropping ゛ would turn が into か)."""
+    base = "".join(d for d in unicodedata.normalize("NFKD", c) if not unicodedata.combining(d))
+    return base if base.isascii() else c
+
+def normalize(text):
+    """Case-folded words of letters and digits (any script) separated by single spaces."""
+    text = _TAGS.sub(" ", text).replace("\\", "")
+    text = unicodedata.normalize("NFKC", text)
+    text = "".join(fold_accent(c) for c in text).casefold()
+    text = text.replace("&", " and ").replace("'", "").replace("’", "")
+    return _NON_WORD.sub(" ", text).strip()
+
+def canonical(text):
+    """normalize() minus a leading question phrase and article."""
+    return _PREFIX.sub("", normalize(text), count=1)
+
+def answer_forms(answer):
+    """Every accepted wording of `answer`, canonical; parenthesised words are optional."""
+    answer = _TAGS.sub("", answer)
+    variants = {_PARENS.sub(" ", answer), _PARENS.sub(r" \1 ", answer)}
+    for extra in _PARENS.findall(answer):
+        # "(Abe Lincoln)", "(or Honest Abe)" name an alternative on their own; "(the)" does not
+        alternative = re.sub(r"^\s*or\s+|\s+accepted\s*$", "", extra)
+        if alternative != extra or len(extra.split()) > 1:
+            variants.add(alternative)
+    forms = []
+    for variant in variants:
+        for part in [variant] + _OR.split(variant):
+            form = canonical(part)
+            if form and form not in forms:
+                forms.append(form)
+    return forms
+
+def trigrams(word):
+    word = f"  {word} "
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+def allowed_edits(length):
+    if length < 4:
+        return 0
+    if length < 8:
+        return 1
+    if length < 13:
+        return 2
+    return 3
+
+def within_edits(a, b, limit):
+    """True if a and b are at most `limit` edits apart; adjacent swaps count as one edit."""
+    n, m = len(a), len(b)
+    if abs(n - m) > limit:
+        return False
+    big = limit + 1
+    prev2 = None
+    prev = [j if j <= limit else big for j in range(m + 1)]
+    for i in range(1, n + 1):
+        cur = [big] * (m + 1)
+        if i <= limit:
+            cur[0] = i
+        row_min = cur[0]
+        ca = a[i - 1]
+        # Only the diagonal band |i - j| <= limit can stay within the limit
+        for j in range(max(1, i - limit), min(m, i + limit) + 1):
+            d = prev[j - 1] + (ca != b[j - 1])
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if cur[j - 1] + 1 < d:
+                d = cur[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == b[j - 1] and prev2[j - 2] + 1 < d:
+                d = prev2[j - 2] + 1
+            cur[j] = d
+            if d < row_min:
+                row_min = d
+        if row_min > limit:
+            return False
+        prev2, prev = prev, cur
+    return prev[m] <= limit
+
+# ---------- Answer keys ----------
+class AnswerKey:
+    def __init__(self, answer):
+        self.answer = answer
+        forms = answer_forms(answer)
+        # Compared without spaces so "lochness" matches "loch ness"
+        self.forms = [(f.replace(" ", ""), 0 if _CJK.search(f) else allowed_edits(len(f.replace(" ", ""))))
+                      for f in forms]
+        self.grams = [trigrams(f) for f, _ in self.forms]
+
+    def matches(self, response):
+        text = canonical(response)
+        if not text:
+            return False
+        word = text.replace(" ", "")
+        grams = None
+        for (form, limit), form_grams in zip(self.forms, self.grams):
+            if word == form:
+                return True
+            if limit == 0 or abs(len(word) - len(form)) > limit:
+                continue
+            if grams is None:
+                grams = trigrams(word)
+            # One edit destroys at most four of the form's trigrams (a swap does)
+            if len(form_grams - grams) > 4 * limit:
+                continue
+            if within_edits(word, form, limit):
+                return True
+        return False
+
+
+_keys = {}
+
+def answer_key(answer):
+    """AnswerKey for `answer`, built once."""
+    key = _keys.get(answer)
+    if key is None:
+        if len(_keys) >= KEY_CACHE_SIZE:
+            _keys.clear()
+        key = _keys[answer] = AnswerKey(answer)
+    return key
+
+def prepare(categories):
+    """Build the keys for a board ({category: [clue, ...]}) when it is loaded."""
+    for clues in categories.values():
+        for clue in clues:
+            answer_key(clue["answer"])
+
+def is_correct(response, answer):
+    """
+    >>> is_correct("What's the Jordan?", "the Jordan (River)")
+    True
+    >>> is_correct("Lincoln", "(Abraham) Lincoln")
+    True
+    >>> is_correct("Pélé", "PELE"), is_correct("长江", "长江"), is_correct("黄河", "长江")
+    (True, True, False)
+    >>> is_correct("北京大学", "南京大学"), normalize("ガンダム")
+    (False, 'ガンダム')
+    >>> [r for r, a in [("ocean", "the Pacific Ocean"), ("canal", "Panama Canal"),
+    ...                 ("river", "the Jordan River"), ("york", "New York"),
+    ...                 ("states", "the United States"), ("hawk", "Kitty Hawk"),
+    ...                 ("ness", "Loch Ness"), ("lincoln", "Abraham Lincoln")] if is_correct(r, a)]
+    []
+    """
+    return answer_key(answer).matches(response)
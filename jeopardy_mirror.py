@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+jeopardy_mirror.py - Mirror the board and scores to a second screen from state deltas
+
+The host game attaches a MirrorPublisher to its GameEngine. Engine events
+(clue opened, tile used, score changed, turn changed) go out as one JSON
+line each over a local TCP socket; a new board goes out as one snapshot.
+The host never renders anything extra for the mirror, and the game thread
+only puts dicts on a queue; a sender thread does the socket writes.
+
+A viewer that connects late first gets a snapshot of the current state,
+then the same deltas as everyone else. Publisher and viewer keep their
+state with the same apply_delta(), so they cannot disagree.
+
+Viewer (audience display / stream overlay):
+    python jeopardy_mirror.py [host:]port [--renderer gpu]
+"""
+
+import json, queue, socket, threading
+
+from jeopardy_engine import playable
+
+try:
+    import pygame
+    MIRROR_EVENT = pygame.event.custom_type()
+except ImportError:  # publishing works without pygame; only the viewer draws
+    pygame = None
+    MIRROR_EVENT = None
+
+DEFAULT_MIRROR_PORT = 5006
+
+# ---------- State ----------
+def snapshot(engine):
+    """Full board state as a message; sent on every new board and to late joiners."""
+    categories = []
+    for name in engine.category_names:
+        clues = []
+        for clue in engine.categories[name]:
+            label = clue.get("square_text") or (str(clue["points"]) if clue["points"] else "FINAL!")
+            clues.append([label, not playable(clue)])
+        categories.append({"name": name, "clues": clues})
+    return {
+        "type": "snapshot",
+        "teams": list(engine.team_names),
+        "scores": list(engine.scores),
+        "current_team": engine.current_team,
+        "categories": categories,
+        "open": list(engine.open_cell) if engine.open_cell else None,
+        "revealed": engine.phase == "answer",
+    }
+
+def apply_delta(state, delta):
+    """Apply one message to a state dict (in place). Deltas before the first snapshot are ignored."""
+    kind = delta.get("type")
+    if kind == "snapshot":
+        state.clear()
+        state.update(delta)
+        return state
+    if "categories" not in state:
+        return state
+    if kind == "open":
+        state["open"] = [delta["col"], delta["row"]]
+        state["revealed"] = False
+    elif kind == "reveal":
+        state["revealed"] = True
+    elif kind in ("judge", "score"):
+        state["scores"][delta["team"]] = delta["score"]
+    elif kind == "turn":
+        state["current_team"] = delta["team"]
+    elif kind == "close":
+        if delta["used"]:
+            state["categories"][delta["col"]]["clues"][delta["row"]][1] = True
+        state["open"] = None
+        state["revealed"] = False
+    return state
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+# ---------- Publisher ----------
+class MirrorPublisher:
+    def __init__(self, engine, host="127.0.0.1", port=DEFAULT_MIRROR_PORT):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.queue = queue.Queue()
+        self.state = {}     # owned by the sender thread
+        self.clients = []   # owned by the sender thread
+        self.sock = None
+        engine.listeners.append(self.on_event)
+
+    def start(self):
+        self.sock = socket.create_server((self.host, self.port))
+        self.port = self.sock.getsockname()[1]
+        self.queue.put(snapshot(self.engine))
+        threading.Thread(target=self._accept, daemon=True).start()
+        threading.Thread(target=self._send_loop, daemon=True).start()
+        return self.port
+
+    def close(self):
+        self.queue.put(None)
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def on_event(self, event):
+        """Engine listener (game thread): queue the delta and return straight away."""
+        if event["type"] == "board":
+            self.queue.put(snapshot(self.engine))
+        else:
+            self.queue.put(dict(event))
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except (OSError, AttributeError):
+                return  # socket closed
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.settimeout(1)
+            # Joining goes through the queue so the snapshot is taken between deltas
+            self.queue.put(("join", conn))
+
+    def _send_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if isinstance(item, tuple):
+                conn = item[1]
+                if self._send(conn, encode(dict(self.state, type="snapshot"))):
+                    self.clients.append(conn)
+                continue
+            apply_delta(self.state, item)
+            data = encode(item)
+            self.clients = [c for c in self.clients if self._send(c, data)]
+        for conn in self.clients:
+            conn.close()
+        self.clients = []
+
+    def _send(self, conn, data):
+        try:
+            conn.sendall(data)
+            return True
+        except OSError:
+            conn.close()  # a stalled or closed viewer is dropped; it can reconnect
+            return False
+
+# ---------- Viewer ----------
+BG = (10, 10, 10)
+TILE_COLOR = (30, 110, 200)
+TILE_USED_COLOR = (80, 80, 80)
+CATEGORY_COLOR = (20, 90, 160)
+TEXT = (255, 255, 255)
+HIGHLIGHT = (255, 165, 0)
+# No buttons on the audience screen, so the board runs almost to the bottom
+VIEWER_LAYOUT = {"margin": 0.03, "top": 0.11, "category": 0.10, "bottom": 0.03, "gap": 0.01}
+
+def receive(host, port, state, lock):
+    """Viewer receiver thread: apply each line to `state` and wake the pygame loop."""
+    try:
+        with socket.create_connection((host, port)) as conn:
+            for line in conn.makefile("rb"):
+                with lock:
+                    apply_delta(state, json.loads(line))
+                wake()
+    except OSError:
+        pass
+    wake(closed=True)
+
+def wake(**attrs):
+    if pygame.display.get_init():  # the window may already be gone
+        pygame.event.post(pygame.event.Event(MIRROR_EVENT, attrs))
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Audience display for a running Jeopardy game")
+    parser.add_argument("target", nargs="?", default=str(DEFAULT_MIRROR_PORT), help="[host:]port of the game's --mirror")
+    parser.add_argument("--renderer", choices=["software", "gpu"], default="software",
+                        help="gpu draws with SDL textures (for 4K projectors); falls back to software")
+    args = parser.parse_args(argv)
+    host, _, port = args.target.rpartition(":")
+    host, port = host or "127.0.0.1", int(port)
+
+    from jeopardy_scenes import Scene, SceneManager
+    from jeopardy_layout import LayoutCache, fit_text, get_font
+    from jeopardy_render import create_renderer
+    pygame.init()
+    renderer = create_renderer((1280, 720), "Jeopardy - Audience", args.renderer)
+    layouts = LayoutCache(VIEWER_LAYOUT)
+    state, lock = {}, threading.Lock()
+
+    class MirrorScene(Scene):
+        def __init__(self):
+            super().__init__()
+            self.status = f"Waiting for the game on {host}:{port}..."
+
+        def handle(self, event):
+            if event.type == MIRROR_EVENT:
+                if getattr(event, "closed", False):
+                    self.status = "Game closed the mirror"
+                self.manager.invalidate()
+
+        def draw(self, r):
+            r.clear(BG)
+            w, h = r.get_size()
+            with lock:
+                if "categories" not in state or not state["categories"]:
+                    r.draw(r.text(get_font(None, 36), self.status, TEXT), center=(w // 2, h // 2))
+                    return
+                teams, scores, cats = state["teams"], state["scores"], state["categories"]
+                layout = layouts.get((w, h), len(cats), max(len(c["clues"]) for c in cats))
+                # Scores across the top
+                font = get_font(None, layout.header_font)
+                slot = w / len(teams)
+                for i, name in enumerate(teams):
+                    rect = r.draw(r.text(font, f"{name}: {scores[i]}", TEXT), center=(int(slot * (i + 0.5)), layout.header.centery))
+                    if i == state["current_team"]:
+                        r.outline(rect.inflate(16, 12), HIGHLIGHT, 3)
+                # Board
+                tile_font = get_font(None, layout.tile_font)
+                for col, cat in enumerate(cats):
+                    cat_rect = layout.category_rect(col)
+                    r.fill(cat_rect, CATEGORY_COLOR)
+                    box = cat_rect.inflate(-8, -8)
+                    cat_font, lines = fit_text(cat["name"], None, box.size, layout.category_font)
+                    y = box.centery - len(lines) * cat_font.get_linesize() // 2
+                    for line in lines:
+                        r.draw(r.text(cat_font, line, TEXT), center=(box.centerx, y + cat_font.get_linesize() // 2))
+                        y += cat_font.get_linesize()
+                    for row, (text, used) in enumerate(cat["clues"]):
+                        rect = layout.tile_rect(col, row)
+                        r.fill(rect, TILE_USED_COLOR if used else TILE_COLOR)
+                        if not used:
+                            r.draw(r.text(tile_font, text, TEXT), center=rect.center)
+                # Open clue: dim the board and show which tile is in play
+                if state["open"] is not None:
+                    col, row = state["open"]
+                    r.shade((0, 0, w, h), (0, 0, 0, 170))
+                    banner = f"{cats[col]['name']} - {cats[col]['clues'][row][0]}"
+                    big, lines = fit_text(banner, None, (w - 80, h // 3), layout.header_font * 3)
+                    y = h // 2 - len(lines) * big.get_linesize() // 2
+                    for line in lines:
+                        r.draw(r.text(big, line, HIGHLIGHT), center=(w // 2, y + big.get_linesize() // 2))
+                        y += big.get_linesize()
+
+    scenes = SceneManager(renderer)
+    scenes.resize_handlers.append(lambda size: layouts.invalidate())
+    threading.Thread(target=receive, args=(host, port, state, lock), daemon=True).start()
+    scenes.push(MirrorScene())
+    scenes.run()
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
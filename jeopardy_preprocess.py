@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+jeopardy_preprocess.py - Convert/validate a large jeopardy_clues dump into sharded TSVs
+
+Usage: python jeopardy_preprocess.py jeopardy_clues.tsv out_dir [--workers N] [--chunk-rows N]
+                                     [--shard-by season|month] [--only SHARD ...]
+       python jeopardy_preprocess.py --verify out_dir
+
+The input is split into chunks of raw lines which are parsed, validated and
+normalised in a process pool. Each worker groups its rows by shard, so the
+parent only appends ready-made TSV text to the shard files. Alongside the
+shards a manifest.json records each shard's date range, row count and
+checksum. --only regenerates just the named shards and updates their
+manifest entries, leaving every other shard untouched. The output
+directory can be passed straight to jeopardy_game.py. --verify checks an
+existing output directory against its manifest checksums, to catch shards
+that were damaged or edited by hand since they were written.
+"""
+
+import argparse, csv, hashlib, html, os, re, sys, time
+from multiprocessing import Pool
+from datetime import date
+
+from jeopardy_data import read_manifest, write_manifest, verify_dataset
+
+COLUMNS = ["round", "clue_value", "daily_double_value", "category", "comments",
+           "answer", "question", "air_date", "notes"]
+FINAL_ROUND = 3
+
+# ---------- Normalisation ----------
+_ws_re = re.compile(r"\s+")
+_tag_re = re.compile(r"<[^>]+>")
+_digits_re = re.compile(r"-?\d+")
+
+def clean_text(text):
+    """Unescape HTML entities, drop stray tags and backslash escapes, collapse whitespace."""
+    if not text:
+        return ""
+    text = html.unescape(text)
+    text = _tag_re.sub("", text)
+    text = text.replace('\\"', '"').replace("\\'", "'")
+    return _ws_re.sub(" ", text).strip()
+
+def parse_value(text):
+    """'$1,000' / '1000' / '' -> int (0 when missing or unparsable)."""
+    if not text:
+        return 0
+    m = _digits_re.search(text.replace(",", ""))
+    return int(m.group()) if m else 0
+
+def season_of(air_date):
+    """Seasons start in September: 1984-09-10 is season 1, 1985-01-02 too."""
+    d = date.fromisoformat(air_date)
+    return d.year - 1983 if d.month >= 9 else d.year - 1984
+
+def shard_name(air_date, shard_by):
+    if shard_by == "month":
+        return air_date[:7]
+    return "season%02d" % season_of(air_date)
+
+def normalise_row(row):
+    """Return a normalised row dict, or raise ValueError describing why it was rejected."""
+    air_date = (row.get("air_date") or "").strip()
+    try:
+        date.fromisoformat(air_date)
+    except ValueError:
+        raise ValueError(f"bad air_date {air_date!r}")
+    try:
+        rnd = int((row.get("round") or "").strip())
+    except ValueError:
+        raise ValueError(f"bad round {row.get('round')!r}")
+    category = clean_text(row.get("category"))
+    clue_text = clean_text(row.get("answer"))
+    response = clean_text(row.get("question"))
+    if not category or not clue_text or not response:
+        raise ValueError("missing category/answer/question")
+
+    clue_value = parse_value(row.get("clue_value") or row.get("cluevalue"))
+    dd_value = parse_value(row.get("daily_double_value"))
+    if rnd >= FINAL_ROUND:
+        # Final Jeopardy carries no board value; the game shows it as FINAL!
+        rnd = FINAL_ROUND
+        clue_value = dd_value = 0
+    return {
+        "round": rnd,
+        "clue_value": clue_value,
+        "daily_double_value": dd_value,
+        "category": category,
+        "comments": clean_text(row.get("comments")),
+        "answer": clue_text,
+        "question": response,
+        "air_date": air_date,
+        "notes": clean_text(row.get("notes")),
+    }
+
+def format_row(row):
+    return "\t".join(str(row[c]).replace("\t", " ") for c in COLUMNS) + "\n"
+
+# ---------- Workers ----------
+def process_chunk(args):
+    """Parse one chunk of raw lines. Returns ({shard: (tsv_text, rows, first_date, last_date)}, stats)."""
+    header, lines, delimiter, shard_by, only = args
+    stats = {"rows": 0, "rejected": 0, "daily_doubles": 0, "finals": 0, "errors": []}
+    shards = {}
+    reader = csv.DictReader(lines, fieldnames=header, delimiter=delimiter)
+    for raw in reader:
+        stats["rows"] += 1
+        try:
+            row = normalise_row(raw)
+        except ValueError as e:
+            stats["rejected"] += 1
+            if len(stats["errors"]) < 5:
+                stats["errors"].append(str(e))
+            continue
+        if row["daily_double_value"] > 0:
+            stats["daily_doubles"] += 1
+        if row["round"] == FINAL_ROUND:
+            stats["finals"] += 1
+        name = shard_name(row["air_date"], shard_by)
+        if only and name not in only:
+            continue
+        shard = shards.get(name)
+        if shard is None:
+            shard = shards[name] = [[], row["air_date"], row["air_date"]]
+        shard[0].append(format_row(row))
+        shard[1] = min(shard[1], row["air_date"])
+        shard[2] = max(shard[2], row["air_date"])
+    return {k: ("".join(v[0]), len(v[0]), v[1], v[2]) for k, v in shards.items()}, stats
+
+def iter_chunks(fh, header, delimiter, shard_by, only, chunk_rows):
+    # Lines are split raw; the dataset has no quoted multi-line fields
+    lines = []
+    for line in fh:
+        lines.append(line)
+        if len(lines) >= chunk_rows:
+            yield header, lines, delimiter, shard_by, only
+            lines = []
+    if lines:
+        yield header, lines, delimiter, shard_by, only
+
+# ---------- Driver ----------
+def preprocess(in_file, out_dir, workers=None, chunk_rows=20000, shard_by="season", only=None, quiet=False):
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    only = frozenset(only) if only else None
+    manifest = read_manifest(out_dir)
+    if only and manifest is not None and manifest.get("shard_by") != shard_by:
+        raise ValueError(f"{out_dir} is sharded by {manifest.get('shard_by')}, not {shard_by}")
+    totals = {"rows": 0, "rejected": 0, "daily_doubles": 0, "finals": 0, "errors": []}
+    shard_files = {}
+    shard_info = {}  # name -> {"file", "rows", "first_date", "last_date", "sha256" (hash object)}
+    try:
+        with open(in_file, "r", encoding="utf-8", newline="") as fh:
+            header_line = fh.readline()
+            delimiter = "\t" if "\t" in header_line else ","
+            header = [h.strip() for h in next(csv.reader([header_line], delimiter=delimiter))]
+            with Pool(workers) as pool:
+                chunks = iter_chunks(fh, header, delimiter, shard_by, only, chunk_rows)
+                # imap keeps chunk order, so shard contents follow input order
+                for shards, stats in pool.imap(process_chunk, chunks):
+                    for name, (text, rows, first_date, last_date) in shards.items():
+                        info = shard_info.get(name)
+                        if info is None:
+                            # Shards are written under a temp name and swapped in at the end
+                            out = open(os.path.join(out_dir, name + ".tsv.tmp"), "wb")
+                            shard_files[name] = out
+                            info = shard_info[name] = {"file": name + ".tsv", "rows": 0,
+                                                       "first_date": first_date, "last_date": last_date,
+                                                       "sha256": hashlib.sha256()}
+                            text = "\t".join(COLUMNS) + "\n" + text
+                        data = text.encode("utf-8")
+                        shard_files[name].write(data)
+                        info["sha256"].update(data)
+                        info["rows"] += rows
+                        info["first_date"] = min(info["first_date"], first_date)
+                        info["last_date"] = max(info["last_date"], last_date)
+                    for k in ("rows", "rejected", "daily_doubles", "finals"):
+                        totals[k] += stats[k]
+                    totals["errors"].extend(stats["errors"][:5 - len(totals["errors"])])
+    finally:
+        for out in shard_files.values():
+            out.close()
+
+    for name, info in shard_info.items():
+        os.replace(os.path.join(out_dir, name + ".tsv.tmp"), os.path.join(out_dir, info["file"]))
+        info["sha256"] = info["sha256"].hexdigest()
+        info["name"] = name
+
+    # Regenerated shards replace their old entries; with --only everything else is kept as is
+    entries = {}
+    if only and manifest is not None:
+        entries = {e["name"]: e for e in manifest["shards"] if e["name"] not in only}
+    entries.update(shard_info)
+    write_manifest(out_dir, {
+        "version": 1,
+        "shard_by": shard_by,
+        "columns": COLUMNS,
+        "shards": [entries[name] for name in sorted(entries)],
+    })
+
+    elapsed = time.perf_counter() - start
+    shard_rows = {name: info["rows"] for name, info in shard_info.items()}
+    totals["shards"] = shard_rows
+    totals["seconds"] = elapsed
+    if not quiet:
+        rate = totals["rows"] / elapsed if elapsed > 0 else 0
+        print(f"{totals['rows']} rows in {elapsed:.2f}s ({rate:,.0f} rows/s), "
+              f"{totals['rejected']} rejected, {totals['daily_doubles']} daily doubles, "
+              f"{totals['finals']} final clues, {len(shard_rows)} shards -> {out_dir}")
+        for err in totals["errors"]:
+            print(f"  rejected: {err}")
+    return totals
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert a jeopardy_clues dump into sharded TSVs for jeopardy_game.py")
+    parser.add_argument("input", nargs="?", help="jeopardy_clues .tsv/.csv file")
+    parser.add_argument("out_dir", nargs="?", help="directory to write shards into")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=20000, help="rows per work unit")
+    parser.add_argument("--shard-by", choices=["season", "month"], default="season")
+    parser.add_argument("--only", nargs="+", metavar="SHARD", help="regenerate only these shards (e.g. season05 or 1990-03)")
+    parser.add_argument("--verify", metavar="DIR", help="check a dataset directory against its manifest checksums")
+    args = parser.parse_args(argv)
+    if args.verify:
+        problems = verify_dataset(args.verify)
+        for name, problem in problems:
+            print(f"{os.path.join(args.verify, name)}: {problem}")
+        print(f"{args.verify}: " + (f"{len(problems)} problem(s)" if problems else "all shards match the manifest"))
+        return 1 if problems else 0
+    if not args.input or not args.out_dir:
+        parser.error("input and out_dir are required (or --verify DIR)")
+    try:
+        totals = preprocess(args.input, args.out_dir, args.workers, args.chunk_rows, args.shard_by, args.only)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    return 0 if totals["rows"] > totals["rejected"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,24 @@
-import pygame
 import csv
 import sys
+from jeopardy_startup import Startup, load_fonts
+import pygame
 from collections import defaultdict, OrderedDict
+from jeopardy_engine import GameEngine, RULES_SOLO
+from jeopardy_layout import LayoutCache, draw_fitted
+from jeopardy_match import prepare, is_correct
 
 # ------------------------------
 # CONFIG
 # ------------------------------
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
-BOARD_TOP = 100
 BOARD_LEFT = 50
-CELL_WIDTH = 200
-CELL_HEIGHT = 100
-CELL_MARGIN = 10
-CATEGORY_HEIGHT = 50
-CATEGORY_PADDING = 20
 FONT_SIZE = 24
 SCORE_FONT_SIZE = 32
-BOTTOM_MARGIN = 80  # space for round buttons
+# Board geometry as fractions of the window (see jeopardy_layout.py);
+# columns shrink to fit, so 6+ categories stay on screen
+BOARD_LAYOUT = {"margin": 0.042, "top": 0.125, "category": 0.0625, "bottom": 0.1, "gap": 0.0125}
+layouts = LayoutCache(BOARD_LAYOUT)
 
 # Colors
 WHITE = (255, 255, 255)
@@ -31,13 +32,13 @@ YELLOW = (65,105,225)
 # ------------------------------
 # Pygame Initialization
 # ------------------------------
-pygame.init()
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+startup = Startup()
+startup.init_pygame()
+screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.RESIZABLE)
 pygame.display.set_caption("Jeopardy")
+startup.first_frame(screen, BLACK)
 clock = pygame.time.Clock()
-
-font = pygame.font.SysFont(None, FONT_SIZE)
-score_font = pygame.font.SysFont(None, SCORE_FONT_SIZE)
+fonts = startup.load("fonts", load_fonts, None, (FONT_SIZE, SCORE_FONT_SIZE))  # while the TSV is read
 
 # ------------------------------
 # Load TSV/CSV Data
@@ -85,60 +86,65 @@ date_list = list(dates_sorted.keys())
 current_date_idx = 0
 current_round_idx = 0
 
+# Single player: one "team", no penalty, no turn switching
+engine = GameEngine(["Score"], RULES_SOLO)
+
 def get_current_round():
     current_date = date_list[current_date_idx]
     round_numbers = list(dates_sorted[current_date].keys())
     current_round_number = round_numbers[current_round_idx]
     current_round_data = dates_sorted[current_date][current_round_number]
+    engine.load_board(current_round_data)
+    prepare(current_round_data)  # answer keys for typed responses
     return current_date, current_round_number, current_round_data
 
 current_date, current_round_number, current_round = get_current_round()
+font, score_font = startup.wait(fonts, "fonts")
+startup.ready()
 
 # ------------------------------
 # Game State
 # ------------------------------
-score = 0
 showing_question_window = False
 showing_answer = False
 current_question = None
+typed_answer = ""  # typed response, judged automatically on Enter
 feedback = ""
 
 # Buttons
 correct_button = pygame.Rect(250, 550, 200, 60)
 wrong_button = pygame.Rect(750, 550, 200, 60)
 show_answer_button = pygame.Rect(500, 550, 200, 60)
+typed_answer_box = pygame.Rect(250, 450, 700, 60)
 next_round_button = pygame.Rect(0,0,150,50)  # will set y dynamically
 prev_round_button = pygame.Rect(0,0,150,50)
 
 # ------------------------------
 # Helper Functions
 # ------------------------------
+def board_layout():
+    return layouts.get(screen.get_size(), len(engine.category_names), engine.max_rows)
+
 def draw_board():
-    global next_round_button, prev_round_button, CELL_HEIGHT_DYNAMIC
+    global next_round_button, prev_round_button
     screen.fill(BLACK)
-    max_rows = max(len(current_round[cat]) for cat in current_round)
-    
-    # Adjust cell height to fit screen if needed
-    available_height = WINDOW_HEIGHT - BOARD_TOP - BOTTOM_MARGIN
-    cell_area_height = available_height - CATEGORY_HEIGHT - CATEGORY_PADDING
-    CELL_HEIGHT_DYNAMIC = min(CELL_HEIGHT, cell_area_height // max_rows)
+    layout = board_layout()
     
     # Categories
     for col_idx, cat in enumerate(current_round.keys()):
-        x = BOARD_LEFT + col_idx * (CELL_WIDTH + CELL_MARGIN)
-        y = BOARD_TOP
+        cat_rect = layout.category_rect(col_idx)
         # Draw category title
-        pygame.draw.rect(screen, BLUE, (x, y, CELL_WIDTH, CATEGORY_HEIGHT))
-        screen.blit(font.render(cat, True, WHITE), (x + 5, y + 5))
+        pygame.draw.rect(screen, BLUE, cat_rect)
+        screen.blit(font.render(cat, True, WHITE), (cat_rect.x + 5, cat_rect.y + 5), (0, 0, cat_rect.width - 10, cat_rect.height - 5))
         # Draw clue buttons
         for row_idx, q in enumerate(current_round[cat]):
-            cell_y = y + CATEGORY_HEIGHT + CATEGORY_PADDING + row_idx * (CELL_HEIGHT_DYNAMIC + CELL_MARGIN)
+            cell = layout.tile_rect(col_idx, row_idx)
             color = GRAY if q["used"] else BLUE
-            pygame.draw.rect(screen, color, (x, cell_y, CELL_WIDTH, CELL_HEIGHT_DYNAMIC))
-            screen.blit(font.render(str(q["points"]), True, WHITE), (x + 10, cell_y + 10))
+            pygame.draw.rect(screen, color, cell)
+            screen.blit(font.render(str(q["points"]), True, WHITE), (cell.x + 10, cell.y + 10))
     
     # Score and info
-    screen.blit(score_font.render(f"Score: {score}", True, GREEN), (BOARD_LEFT, 20))
+    screen.blit(score_font.render(f"Score: {engine.scores[0]}", True, GREEN), (BOARD_LEFT, 20))
     screen.blit(font.render(f"Date: {current_date}  Round: {current_round_number}", True, YELLOW), (500, 20))
     
     # Feedback
@@ -146,7 +152,7 @@ def draw_board():
         screen.blit(score_font.render(feedback, True, RED if "Wrong" in feedback else GREEN), (800, 20))
     
     # Round navigation buttons
-    board_bottom = BOARD_TOP + CATEGORY_HEIGHT + CATEGORY_PADDING + max_rows * (CELL_HEIGHT_DYNAMIC + CELL_MARGIN) + 20
+    board_bottom = layout.board_bottom + 20
     next_round_button.y = board_bottom
     next_round_button.x = BOARD_LEFT
     prev_round_button.y = board_bottom
@@ -157,33 +163,22 @@ def draw_board():
     screen.blit(font.render("Prev Round", True, WHITE), (prev_round_button.x + 10, prev_round_button.y + 15))
 
 def get_cell_under_mouse(pos):
-    x, y = pos
-    for col_idx, cat in enumerate(current_round.keys()):
-        col_x = BOARD_LEFT + col_idx * (CELL_WIDTH + CELL_MARGIN)
-        if col_x <= x <= col_x + CELL_WIDTH:
-            for row_idx, q in enumerate(current_round[cat]):
-                row_y = BOARD_TOP + CATEGORY_HEIGHT + CATEGORY_PADDING + row_idx * (CELL_HEIGHT_DYNAMIC + CELL_MARGIN)
-                if row_y <= y <= row_y + CELL_HEIGHT_DYNAMIC:
-                    return (col_idx, row_idx)
-    return None
+    col_idx, row_idx = board_layout().tile_at(pos)
+    if col_idx is None or engine.clue_at(col_idx, row_idx) is None:
+        return None
+    return (col_idx, row_idx)
 
 def show_question_window_func():
     screen.fill(WHITE)
-    # Question text wrapping
-    text = current_question["question"]
-    lines = []
-    line = ""
-    for w in text.split():
-        if font.size(line + " " + w)[0] > WINDOW_WIDTH - 40:
-            lines.append(line)
-            line = w
-        else:
-            line += " " + w
-    lines.append(line)
-    for i, l in enumerate(lines):
-        screen.blit(font.render(l.strip(), True, BLACK), (20, 50 + i*30))
+    # Question text, shrunk to fit above the answer line
+    draw_fitted(screen, current_question["question"], None, pygame.Rect(20, 50, WINDOW_WIDTH - 40, 140),
+                BLACK, 48, FONT_SIZE - 8, align="topleft")
     
     if not showing_answer:
+        pygame.draw.rect(screen, BLACK, typed_answer_box, 2)
+        label = typed_answer + "_" if typed_answer else "Type your answer, Enter to submit"
+        draw_fitted(screen, label, None, typed_answer_box.inflate(-20, -8), BLACK if typed_answer else GRAY,
+                    SCORE_FONT_SIZE, align="left")
         pygame.draw.rect(screen, YELLOW, show_answer_button)
         screen.blit(font.render("Show Answer", True, WHITE), (show_answer_button.x + 25, show_answer_button.y + 15))
     else:
@@ -211,6 +206,23 @@ while running:
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             running = False
+        elif event.type == pygame.VIDEORESIZE:
+            WINDOW_WIDTH, WINDOW_HEIGHT = screen.get_size()
+            layouts.invalidate()
+        elif event.type == pygame.KEYDOWN and showing_question_window and not showing_answer:
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                if typed_answer.strip():
+                    correct = is_correct(typed_answer, current_question["answer"])
+                    engine.judge(correct)
+                    if correct:
+                        feedback = "Correct!"
+                    else:
+                        feedback = f"Wrong - {current_question['answer']}"
+                    showing_question_window = False
+            elif event.key == pygame.K_BACKSPACE:
+                typed_answer = typed_answer[:-1]
+            elif event.unicode and event.unicode.isprintable():
+                typed_answer += event.unicode
         elif event.type == pygame.MOUSEBUTTONDOWN:
             pos = event.pos
             if not showing_question_window:
@@ -228,24 +240,23 @@ while running:
                 else:
                     cell = get_cell_under_mouse(pos)
                     if cell:
-                        col_idx, row_idx = cell
-                        cat = list(current_round.keys())[col_idx]
-                        q = current_round[cat][row_idx]
-                        if not q["used"]:
+                        q = engine.open(*cell)
+                        if q is not None:
                             current_question = q
                             showing_question_window = True
                             showing_answer = False
+                            typed_answer = ""
             else:
                 # Question window buttons
                 if not showing_answer and show_answer_button.collidepoint(pos):
                     showing_answer = True
+                    engine.reveal()
                 elif showing_answer:
                     if correct_button.collidepoint(pos):
-                        score += current_question["points"]
-                        current_question["used"] = True
+                        engine.judge(True)
                         showing_question_window = False
                     elif wrong_button.collidepoint(pos):
-                        current_question["used"] = True
+                        engine.judge(False)
                         showing_question_window = False
 
 pygame.quit()
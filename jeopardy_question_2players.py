@@ -1,16 +1,21 @@
 import csv
 import sys
+from jeopardy_startup import Startup, load_fonts, load_sounds
 import pygame
+from jeopardy_engine import GameEngine, RULES_NO_PENALTY
+from jeopardy_layout import draw_fitted
 
-pygame.init()
+startup = Startup()
+startup.init_pygame()
 
 # --- Screen setup ---
 SCREEN_WIDTH, SCREEN_HEIGHT = 1800, 900
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption("Jeopardy Game")
-font_category = pygame.font.SysFont(None, 36)
-font_score = pygame.font.SysFont(None, 48)
-font_clue = pygame.font.SysFont(None, 48)
+startup.first_frame(screen, (0, 0, 0))
+# Fonts and sounds load on loader threads while the dataset is read
+fonts = startup.load("fonts", load_fonts, None, (36, 48))
+sounds = startup.load("sounds", load_sounds, "correct.wav", "wrong.wav")
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -23,9 +28,7 @@ YELLOW = (255, 255, 0)
 ORANGE = (255, 140, 0)
 
 # --- Game state ---
-team_scores = [0, 0]
-team_names = ["Team 1", "Team 2"]
-current_team = 0
+engine = GameEngine(["Team 1", "Team 2"], RULES_NO_PENALTY)
 
 current_round_index = 0
 rounds_list = []
@@ -37,13 +40,6 @@ CATEGORY_MARGIN_Y = 80
 BOTTOM_MARGIN_Y = 120
 BUTTON_HEIGHT = 60
 
-# ---------- Load sounds ----------
-try:
-    sound_correct = pygame.mixer.Sound("correct.wav")
-    sound_wrong = pygame.mixer.Sound("wrong.wav")
-except:
-    sound_correct = sound_wrong = None
-
 # --- Load dataset ---
 if len(sys.argv) < 2:
     print("Usage: python program.py database_file.tsv")
@@ -75,7 +71,17 @@ def load_data(filename):
                 rounds_dict[key][category].append(clue)
     rounds_list = sorted(rounds_dict.keys())
 
+def set_round(index):
+    global current_round_index
+    current_round_index = index
+    engine.load_board(rounds_dict[rounds_list[current_round_index]])
+
 load_data(csv_file)
+set_round(0)
+font_category, font_score = startup.wait(fonts, "fonts")
+font_clue = font_score
+sound_correct, sound_wrong = startup.wait(sounds, "sounds")
+startup.ready()
 
 # --- Helper functions ---
 def draw_board():
@@ -87,10 +93,10 @@ def draw_board():
     col_width = (SCREEN_WIDTH - BUTTON_MARGIN_X * (num_categories + 1)) / num_categories
 
     # Draw team scores (top-left)
-    for i in range(2):
-        score_surf = font_score.render(f"{team_names[i]}: {team_scores[i]}", True, WHITE)
+    for i in range(len(engine.team_names)):
+        score_surf = font_score.render(f"{engine.team_names[i]}: {engine.scores[i]}", True, WHITE)
         screen.blit(score_surf, (20 + i*500, 10))
-        if i == current_team:
+        if i == engine.current_team:
             pygame.draw.rect(screen, ORANGE, (20 + i*500 - 10, 5, score_surf.get_width()+20, score_surf.get_height()+10), 3)
 
     # Draw air_date and round (top-right)
@@ -98,14 +104,10 @@ def draw_board():
     round_surf = font_score.render(round_info, True, WHITE)
     screen.blit(round_surf, (SCREEN_WIDTH - round_surf.get_width() - 20, 10))
 
-    # Draw categories with wrapped text
+    # Draw categories, shrunk to fit above the first row of clues
     for idx, cat in enumerate(current_categories):
         x = BUTTON_MARGIN_X + idx * (col_width + BUTTON_MARGIN_X)
-        wrapped_lines = wrap_text(cat, font_category, col_width)
-        for i, line in enumerate(wrapped_lines):
-            screen.blit(font_category.render(line, True, WHITE),
-                        (x + (col_width - font_category.size(line)[0]) / 2,
-                         CATEGORY_MARGIN_Y + i*30))
+        draw_fitted(screen, cat, None, pygame.Rect(x, CATEGORY_MARGIN_Y, col_width, 55), WHITE, 36)
 
     # Draw clue buttons
     buttons = []
@@ -123,7 +125,7 @@ def draw_board():
                 text_surf = font_clue.render(str(clue['points']), True, WHITE)
                 screen.blit(text_surf, (x + (col_width - text_surf.get_width()) / 2,
                                         y + (BUTTON_HEIGHT - text_surf.get_height()) / 2))
-                buttons.append({'rect': rect, 'clue': clue})
+                buttons.append({'rect': rect, 'clue': clue, 'col': col, 'row': row})
 
     # Round navigation buttons
     prev_rect = pygame.Rect(50, SCREEN_HEIGHT - BOTTOM_MARGIN_Y + 20, 200, 60)
@@ -140,26 +142,12 @@ def draw_board():
     return buttons, prev_rect, next_rect
 
 
-def wrap_text(text, font, max_width):
-    words = text.split()
-    lines = []
-    current = ""
-    for word in words:
-        test = current + " " + word if current else word
-        if font.size(test)[0] <= max_width:
-            current = test
-        else:
-            lines.append(current)
-            current = word
-    if current:
-        lines.append(current)
-    return lines
-
 def show_question(clue, category):
     running = True
     show_answer = False
     correct_rect = wrong_rect = answer_rect = None
-    line_spacing = 80  # space between question lines
+    question_box = pygame.Rect(20, 90, SCREEN_WIDTH*0.6, 300)
+    answer_box = pygame.Rect(20, 400, SCREEN_WIDTH-40, SCREEN_HEIGHT-400-170)
 
     while running:
         screen.fill(BLACK)
@@ -168,10 +156,8 @@ def show_question(clue, category):
         cat_surf = font_category.render(f"Category: {category}", True, ORANGE)
         screen.blit(cat_surf, (20, 20))  # top-left, orange
 
-        # --- Display question below category ---
-        lines = wrap_text(clue['question'], font_clue, SCREEN_WIDTH*0.6)
-        for i, line in enumerate(lines):
-            screen.blit(font_clue.render(line, True, WHITE), (20, 90 + i * line_spacing))
+        # --- Display question below category, shrunk to fit if it is long ---
+        draw_fitted(screen, clue['question'], None, question_box, WHITE, 64, align="topleft")
 
         # --- Buttons ---
         if not show_answer:
@@ -180,9 +166,7 @@ def show_question(clue, category):
             screen.blit(font_category.render("Show Answer", True, WHITE), (answer_rect.x+20, answer_rect.y+15))
         else:
             # Display answer
-            lines_ans = wrap_text(clue['answer'], font_clue, SCREEN_WIDTH-40)
-            for i, line in enumerate(lines_ans):
-                screen.blit(font_clue.render(line, True, YELLOW), (20, 400 + i*30))
+            draw_fitted(screen, clue['answer'], None, answer_box, YELLOW, 64, align="topleft")
 
             # Correct / Wrong buttons
             correct_rect = pygame.Rect(SCREEN_WIDTH/2-220, SCREEN_HEIGHT-150, 200, 60)
@@ -203,25 +187,21 @@ def show_question(clue, category):
                 mx, my = pygame.mouse.get_pos()
                 if not show_answer and answer_rect and answer_rect.collidepoint(mx,my):
                     show_answer = True
+                    engine.reveal()
                 elif show_answer and correct_rect and correct_rect.collidepoint(mx,my):
-                    handle_answer(True, clue['points'])
-                    clue['used'] = True
+                    handle_answer(True)
                     running = False
                 elif show_answer and wrong_rect and wrong_rect.collidepoint(mx,my):
-                    handle_answer(False, clue['points'])
-                    clue['used'] = True
+                    handle_answer(False)
                     running = False
 
-def handle_answer(correct, points):
-    global current_team
+def handle_answer(correct):
+    engine.judge(correct)  # scores, marks the clue used and switches turn
     if correct:
-        team_scores[current_team] += points
         sound_correct.play()
     else:
         sound_wrong.play()
 
-    current_team = 1 - current_team  # switch turn
-  
 
 # --- Main loop ---
 running = True
@@ -235,17 +215,14 @@ while running:
             mx, my = pygame.mouse.get_pos()
             # Round navigation
             if prev_rect.collidepoint(mx, my):
-                current_round_index = max(0, current_round_index - 1)
+                set_round(max(0, current_round_index - 1))
             elif next_rect.collidepoint(mx, my):
-                current_round_index = min(len(rounds_list) - 1, current_round_index + 1)
+                set_round(min(len(rounds_list) - 1, current_round_index + 1))
             # Clue buttons
             for b in buttons:
-                if b['rect'].collidepoint(mx, my):
-                    # Find category for this clue
-                    for cat, clues in rounds_dict[rounds_list[current_round_index]].items():
-                        if b['clue'] in clues:
-                            show_question(b['clue'], cat)
-                            break
+                if b['rect'].collidepoint(mx, my) and engine.open(b['col'], b['row']) is not None:
+                    show_question(b['clue'], engine.open_category)
+                    break
 
 pygame.quit()
 
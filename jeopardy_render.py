@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+jeopardy_render.py - Drawing back-ends: software blits or GPU textures via pygame._sdl2
+
+Both renderers have the same small interface (clear, fill, outline, shade,
+text, draw, present), so a scene draws the same way on either:
+
+    SoftwareRenderer  blits onto the display surface, as pygame always has
+    GpuRenderer       pygame._sdl2.video Renderer; fills and alpha shading
+                      are done by the GPU, and each rendered text is
+                      uploaded once as a Texture and then only drawn
+
+On a 4K projector the full-frame fill and alpha dim are what make software
+rendering slow; on the GPU they cost next to nothing. create_renderer()
+picks the back-end at startup (jeopardy.py and jeopardy_mirror.py take
+--renderer) and falls back to software when pygame._sdl2 or a renderer is
+not available. Rounded rects are drawn on the GPU as plain rects plus four
+corners cut from one cached circle texture, so tiles of any size (and the
+clue card while it zooms open) need no new textures.
+
+The software renderer keeps its frame between presents, so a scene can
+repaint one area and present just that (present(rects)); the GPU back
+buffer does not survive a present, and SceneManager repaints every frame
+there (keeps_frame).
+
+SurfacePool and CachedLayer are for the software path: full-screen
+SRCALPHA layers (dims, the feedback card) are allocated once per window
+size and repainted only when what they show changes.
+"""
+
+import pygame
+from jeopardy_text import render_text
+
+try:
+    from pygame._sdl2 import video
+except ImportError:  # older pygame builds
+    video = None
+
+TEXT_CACHE_SIZE = 512  # rendered texts kept per renderer
+CORNER_CACHE_SIZE = 64  # circle textures (colour, radius, width) on the GPU
+
+
+def _place(image, pos, size, anchor):
+    """Screen rect for draw(): top-left at pos, or a pygame.Rect anchor (center=, topright=, ...)."""
+    rect = pygame.Rect((0, 0), size if size is not None else image.get_rect().size)
+    if pos is not None:
+        rect.topleft = pos
+    for name, value in anchor.items():
+        setattr(rect, name, value)
+    return rect
+
+
+class SoftwareRenderer:
+    kind = "software"
+    keeps_frame = True  # draws straight onto the display surface
+
+    def __init__(self, size, title, resizable=True):
+        self.surface = pygame.display.set_mode(size, pygame.RESIZABLE if resizable else 0)
+        pygame.display.set_caption(title)
+        self.images = {}  # (font, text, color) -> image
+        self.shades = {}  # (size, rgba) -> SRCALPHA layer
+
+    def get_size(self):
+        return self.surface.get_size()
+
+    def clear(self, color):
+        self.surface.fill(color)
+
+    def fill(self, rect, color, radius=0):
+        pygame.draw.rect(self.surface, color, rect, border_radius=radius)
+
+    def outline(self, rect, color, width=1, radius=0):
+        pygame.draw.rect(self.surface, color, rect, width, border_radius=radius)
+
+    def shade(self, rect, rgba):
+        """Darken/tint `rect` with a translucent colour."""
+        rect = pygame.Rect(rect)
+        key = (rect.size, tuple(rgba))
+        layer = self.shades.get(key)
+        if layer is None:
+            # One layer per size and colour, reused on every frame
+            layer = self.shades[key] = pygame.Surface(rect.size, pygame.SRCALPHA)
+            layer.fill(rgba)
+        self.surface.blit(layer, rect)
+
+    def text(self, font, text, color):
+        """Rendered text as an image for draw(); rendered (and uploaded) once."""
+        key = (font, text, tuple(color))
+        image = self.images.get(key)
+        if image is None:
+            if len(self.images) >= TEXT_CACHE_SIZE:
+                self.images.clear()
+            image = self.images[key] = self.upload(render_text(font, text, color))
+        return image
+
+    def upload(self, surface):
+        return surface
+
+    def draw(self, image, pos=None, size=None, clip=None, **anchor):
+        """
+        Draw an image from text() with its top-left at pos or placed by an anchor
+        (center=..., midright=...). size stretches it; clip limits drawing to a
+        screen area. Returns the rect the whole image covers.
+        """
+        rect = _place(image, pos, size, anchor)
+        if size is not None:
+            image = pygame.transform.smoothscale(image, rect.size)
+        area = rect.clip(clip) if clip is not None else rect
+        if area.width and area.height:
+            self.surface.blit(image, area, area.move(-rect.x, -rect.y))
+        return rect
+
+    def present(self, rects=None):
+        """Show the frame, or with rects only those areas of it."""
+        if rects:
+            pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+
+    def resized(self):
+        self.surface = pygame.display.get_surface()
+        self.shades.clear()
+
+
+class GpuRenderer(SoftwareRenderer):
+    kind = "gpu"
+    keeps_frame = False  # the back buffer is undefined after present()
+
+    def __init__(self, size, title, resizable=True):
+        self.window = video.Window(title, size=size, resizable=resizable)
+        # accelerated=-1: the best renderer SDL has, hardware first
+        self.renderer = video.Renderer(self.window, accelerated=-1, vsync=True)
+        self.images = {}
+        self.corners = {}  # (colour, radius, width) -> circle texture
+
+    def get_size(self):
+        return self.window.size
+
+    def _color(self, color):
+        self.renderer.draw_color = tuple(color) + (255,) * (4 - len(color))
+
+    def clear(self, color):
+        self._color(color)
+        self.renderer.clear()
+
+    def fill(self, rect, color, radius=0):
+        rect = pygame.Rect(rect)
+        radius = min(radius, rect.width // 2, rect.height // 2)
+        self._color(color)
+        if radius <= 0:
+            self.renderer.fill_rect(rect)
+            return
+        self.renderer.fill_rect(rect.inflate(0, -2 * radius))
+        self.renderer.fill_rect(rect.inflate(-2 * radius, 0))
+        self._corners(rect, color, radius, 0)
+
+    def outline(self, rect, color, width=1, radius=0):
+        rect = pygame.Rect(rect)
+        radius = min(radius, rect.width // 2, rect.height // 2)
+        self._color(color)
+        if radius <= 0:
+            for i in range(width):
+                self.renderer.draw_rect(rect.inflate(-2 * i, -2 * i))
+            return
+        inner_w, inner_h = rect.width - 2 * radius, rect.height - 2 * radius
+        for edge in ((rect.x + radius, rect.y, inner_w, width), (rect.x + radius, rect.bottom - width, inner_w, width),
+                     (rect.x, rect.y + radius, width, inner_h), (rect.right - width, rect.y + radius, width, inner_h)):
+            self.renderer.fill_rect(pygame.Rect(edge))
+        self._corners(rect, color, radius, width)
+
+    def _corners(self, rect, color, radius, width):
+        """Round off a rect: each corner is a quarter of one circle texture."""
+        key = (tuple(color), radius, width)
+        texture = self.corners.get(key)
+        if texture is None:
+            if len(self.corners) >= CORNER_CACHE_SIZE:
+                self.corners.clear()
+            circle = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+            pygame.draw.circle(circle, color, (radius, radius), radius, width)
+            texture = self.corners[key] = self.upload(circle)
+        for sx, sy in ((0, 0), (radius, 0), (0, radius), (radius, radius)):
+            x = rect.x if sx == 0 else rect.right - radius
+            y = rect.y if sy == 0 else rect.bottom - radius
+            texture.draw(srcrect=(sx, sy, radius, radius), dstrect=(x, y, radius, radius))
+
+    def shade(self, rect, rgba):
+        self.renderer.draw_blend_mode = pygame.BLENDMODE_BLEND
+        self._color(rgba)
+        self.renderer.fill_rect(pygame.Rect(rect))
+        self.renderer.draw_blend_mode = pygame.BLENDMODE_NONE
+
+    def upload(self, surface):
+        return video.Texture.from_surface(self.renderer, surface)
+
+    def draw(self, image, pos=None, size=None, clip=None, **anchor):
+        rect = _place(image, pos, size, anchor)
+        if clip is None:
+            image.draw(dstrect=rect)
+            return rect
+        area = rect.clip(clip)
+        if area.width and area.height:
+            # The source area, in texture pixels (the texture may be stretched)
+            sx, sy = image.width / rect.width, image.height / rect.height
+            src = pygame.Rect(round((area.x - rect.x) * sx), round((area.y - rect.y) * sy),
+                              round(area.width * sx), round(area.height * sy))
+            image.draw(srcrect=src, dstrect=area)
+        return rect
+
+    def present(self, rects=None):
+        self.renderer.present()
+
+    def resized(self):
+        pass  # textures do not depend on the window size
+
+
+class SurfacePool:
+    """Named off-screen surfaces, reallocated only when the requested size changes."""
+
+    def __init__(self):
+        self.surfaces = {}
+
+    def get(self, name, size, flags=pygame.SRCALPHA):
+        surface = self.surfaces.get(name)
+        if surface is None or surface.get_size() != tuple(size):
+            surface = self.surfaces[name] = pygame.Surface(size, flags)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+class CachedLayer:
+    """
+    A pooled surface that is only repainted when its key (or the size) changes.
+    Overlays such as the games' dimmed feedback card are painted once per
+    message and blitted as they are for every frame they stay on screen.
+    """
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+        self.key = None
+        self.surface = None
+
+    def get(self, size, key, paint):
+        surface = self.pool.get(self.name, size)
+        if surface is not self.surface or key != self.key:
+            surface.fill((0, 0, 0, 0))
+            paint(surface)
+            self.surface, self.key = surface, key
+        return surface
+
+
+def create_renderer(size, title, kind="software", resizable=True):
+    """kind "gpu" falls back to software rendering if no GPU renderer can be created."""
+    if kind == "gpu":
+        if video is None:
+            print("pygame._sdl2 is not available; using software rendering")
+        else:
+            try:
+                return GpuRenderer(size, title, resizable)
+            except pygame.error as e:
+                print(f"GPU renderer unavailable ({e}); using software rendering")
+    return SoftwareRenderer(size, title, resizable)
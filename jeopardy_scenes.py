@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+jeopardy_scenes.py - Scene stack and the single main loop the game scripts run on
+
+Each screen (file select, board, clue, Final Jeopardy) is a Scene with
+handle/update/draw. The SceneManager owns the only event pump and the only
+frame clock; the top scene gets the events, and scenes marked as overlays
+are drawn on top of the scene underneath instead of replacing it.
+
+Frames are only drawn when something changed. Input events and scene
+changes repaint the whole stack; a scene that changed a small area (a timer
+tick) repaints just that area and passes the rect to update_rects(). While
+nothing is dirty and no scene is animating, the loop sleeps in
+pygame.event.wait() instead of spinning at FPS.
+
+Windows are resizable and F11 toggles fullscreen; resize_handlers are told
+the new size so cached layouts can be dropped.
+
+Animations (tile flips, zooms, score count-ups) are Tweens on the manager's
+Animator. They run on elapsed milliseconds from the frame clock, not on
+frame counts, and each frame all running tweens are painted and presented
+with a single display.update() of their rects. With no tween running the
+loop goes back to sleeping.
+
+`screen` is normally the display surface. It can also be a renderer from
+jeopardy_render (software or GPU); scenes then draw through it and frames
+are presented by the renderer. A renderer that does not keep its frame
+between presents (the GPU one) gets a full repaint instead of rect updates.
+"""
+
+import pygame
+
+
+class Scene:
+    overlay = False  # True: draw the scene below first (e.g. a clue card over the board)
+
+    def __init__(self):
+        self.manager = None
+
+    def animating(self):
+        """True while the scene needs a frame every tick regardless of input."""
+        return False
+
+    def enter(self):
+        """Called when the scene becomes the top of the stack."""
+
+    def exit(self):
+        """Called when the scene is popped or replaced."""
+
+    def handle(self, event):
+        pass
+
+    def update(self, dt):
+        """dt: milliseconds since the previous frame."""
+
+    def draw(self, surface):
+        pass
+
+
+# ---------- Animation ----------
+def ease_out(t):
+    return 1 - (1 - t) ** 3
+
+def linear(t):
+    return t
+
+
+class Tween:
+    """
+    Calls draw(surface, p) every frame for duration_ms, with eased progress p
+    going 0 -> 1; draw paints its area and returns the rect it touched.
+    on_done runs once after the final (p == 1) frame.
+    """
+
+    def __init__(self, duration_ms, draw, on_done=None, ease=ease_out):
+        self.duration = max(1, duration_ms)
+        self.draw = draw
+        self.on_done = on_done
+        self.ease = ease
+        self.elapsed = None  # starts on its first frame, so time spent idle before it doesn't count
+
+    def progress(self):
+        return self.ease(min(1.0, self.elapsed / self.duration))
+
+    def finished(self):
+        return self.elapsed >= self.duration
+
+
+class Animator:
+    def __init__(self):
+        self.tweens = []
+
+    def add(self, tween):
+        self.tweens.append(tween)
+        return tween
+
+    def active(self):
+        return bool(self.tweens)
+
+    def update(self, dt):
+        for tween in self.tweens:
+            tween.elapsed = 0 if tween.elapsed is None else tween.elapsed + dt
+
+    def draw(self, surface):
+        """Paint every running tween; returns their rects for one display update."""
+        rects = []
+        for tween in list(self.tweens):
+            rect = tween.draw(surface, tween.progress())
+            if rect:
+                rects.append(rect)
+            if tween.finished():
+                self.tweens.remove(tween)
+                if tween.on_done:
+                    tween.on_done()
+        return rects
+
+
+# Input that can change what is on screen and so triggers a full repaint.
+# Other events (mouse motion, timers) only repaint if a scene asks for it.
+REPAINT_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.VIDEORESIZE,
+                  pygame.VIDEOEXPOSE, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED)
+
+
+class SceneManager:
+    def __init__(self, screen, fps=30):
+        self.screen = screen
+        self.renderer = hasattr(screen, "present")
+        self.keeps_frame = not self.renderer or screen.keeps_frame
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.animator = Animator()
+        self.stack = []
+        self.running = False
+        self.dirty = True
+        self.dirty_rects = []
+        self.quit_handlers = []  # called once when the loop ends (autosave, flush logs, ...)
+        self.resize_handlers = []  # called with the new window size
+
+    @property
+    def top(self):
+        return self.stack[-1] if self.stack else None
+
+    def invalidate(self):
+        """Repaint the whole stack on the next frame."""
+        self.dirty = True
+
+    def update_rects(self, *rects):
+        """The top scene already drew into these rects; just present them."""
+        self.dirty_rects.extend(rects)
+
+    def push(self, scene):
+        self.dirty = True
+        scene.manager = self
+        self.stack.append(scene)
+        scene.enter()
+
+    def pop(self):
+        self.dirty = True
+        scene = self.stack.pop()
+        scene.exit()
+        if self.stack:
+            self.stack[-1].enter()
+        return scene
+
+    def replace(self, scene):
+        self.dirty = True
+        if self.stack:
+            self.stack.pop().exit()
+        self.push(scene)
+
+    def quit(self):
+        self.running = False
+
+    def resized(self):
+        if self.renderer:
+            self.screen.resized()
+        else:
+            self.screen = pygame.display.get_surface()
+        self.dirty = True
+        for handler in self.resize_handlers:
+            handler(self.screen.get_size())
+
+    def toggle_fullscreen(self):
+        try:
+            pygame.display.toggle_fullscreen()
+        except pygame.error:
+            return  # not supported by this video driver
+        self.resized()
+
+    def present(self, rects=None):
+        if self.renderer:
+            self.screen.present(rects)
+        elif rects:
+            pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+
+    def draw(self):
+        # Start from the topmost non-overlay scene and paint upwards
+        start = len(self.stack) - 1
+        while start > 0 and self.stack[start].overlay:
+            start -= 1
+        for scene in self.stack[start:]:
+            scene.draw(self.screen)
+
+    def run(self):
+        self.running = True
+        while self.running and self.stack:
+            if self.dirty or self.top.animating() or self.animator.active():
+                dt = self.clock.tick(self.fps)
+                events = pygame.event.get()
+            else:
+                # Nothing to animate: block until the next event (input or timer tick)
+                events = [pygame.event.wait()] + pygame.event.get()
+                dt = self.clock.tick()
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    break
+                if event.type in REPAINT_EVENTS:
+                    self.dirty = True
+                if event.type == pygame.VIDEORESIZE:
+                    self.resized()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                    self.toggle_fullscreen()
+                    continue
+                self.top.handle(event)
+                if not self.stack:
+                    break
+            if not self.running or not self.stack:
+                break
+            self.top.update(dt)
+            self.animator.update(dt)
+            rects, self.dirty_rects = self.dirty_rects, []
+            full = self.dirty or self.top.animating() or (
+                not self.keeps_frame and (rects or self.animator.active()))
+            self.dirty = False  # tween callbacks below may ask for the next repaint
+            if full:
+                self.draw()
+                self.animator.draw(self.screen)
+                self.present()
+            else:
+                rects += self.animator.draw(self.screen)
+                if rects:
+                    self.present(rects)
+        for handler in self.quit_handlers:
+            handler()
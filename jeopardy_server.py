@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+jeopardy_server.py - LAN answer server so players can answer multiple-choice clues from phones
+
+Runs an asyncio HTTP + WebSocket server on a background thread next to the
+pygame loop (stdlib only, no extra packages). Phones open http://<host>:<port>/,
+pick a name and get the open clue pushed to them; each answer is stamped on
+arrival and queued. The game thread never waits on the network: it calls
+open_clue()/close_clue(), and drains queued answers in one batch when it
+gets the ANSWER_EVENT wake-up.
+
+Stand-in clients for testing:
+    python jeopardy_server.py --simulate 50 --port 8765
+starts a server, connects 50 fake phones, opens a clue and reports latency.
+"""
+
+import asyncio, base64, hashlib, json, os, random, struct, sys, threading, time
+
+try:
+    import pygame
+    ANSWER_EVENT = pygame.event.custom_type()
+except ImportError:  # the server and stand-in clients also run without pygame
+    pygame = None
+    ANSWER_EVENT = None
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+PAGE = """<!doctype html>
+<html><head><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Jeopardy</title>
+<style>
+body{font-family:sans-serif;background:#0a0a0a;color:#fff;margin:0;padding:16px}
+button{display:block;width:100%;margin:8px 0;padding:18px;font-size:20px;border:0;border-radius:6px;background:#1e6ec8;color:#fff}
+button:disabled{background:#505050}
+#status{color:#ffa500;margin:8px 0}
+</style></head><body>
+<h2 id="q">Waiting for the next clue...</h2>
+<div id="opts"></div><div id="status"></div><div id="score"></div>
+<script>
+var name = localStorage.getItem("jname") || prompt("Your name?") || "Player";
+localStorage.setItem("jname", name);
+var ws = new WebSocket("ws://" + location.host + "/ws");
+var clue = null;
+ws.onopen = function(){ ws.send(JSON.stringify({type:"join", name:name})); };
+ws.onmessage = function(e){
+  var m = JSON.parse(e.data), opts = document.getElementById("opts");
+  if (m.type == "clue") {
+    clue = m.clue; document.getElementById("q").textContent = m.question;
+    document.getElementById("status").textContent = ""; opts.innerHTML = "";
+    m.options.forEach(function(o, i){
+      var b = document.createElement("button");
+      b.textContent = String.fromCharCode(65 + i) + ". " + o;
+      b.onclick = function(){
+        ws.send(JSON.stringify({type:"answer", clue:clue, option:i}));
+        Array.prototype.forEach.call(opts.children, function(c){ c.disabled = true; });
+        document.getElementById("status").textContent = "Answer locked in";
+      };
+      opts.appendChild(b);
+    });
+  } else if (m.type == "result") {
+    document.getElementById("status").textContent = m.correct ? "Correct!" : "Wrong";
+    document.getElementById("score").textContent = "Score: " + m.score;
+    opts.innerHTML = "";
+  } else if (m.type == "closed") {
+    opts.innerHTML = ""; document.getElementById("q").textContent = "Waiting for the next clue...";
+  }
+};
+</script></body></html>
+"""
+
+# ---------- WebSocket framing ----------
+async def ws_read(reader):
+    """Read one frame. Returns (opcode, payload bytes)."""
+    b1, b2 = await reader.readexactly(2)
+    opcode = b1 & 0x0F
+    length = b2 & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+    mask = await reader.readexactly(4) if b2 & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+def ws_frame(payload, opcode=1, mask=False):
+    """Build one final frame; clients must mask, servers must not."""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    n = len(payload)
+    if n < 126:
+        header.append(mask_bit | n)
+    elif n < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack(">H", n)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack(">Q", n)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return bytes(header) + payload
+
+def ws_accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+# ---------- Server ----------
+class AnswerServer:
+    def __init__(self, host="0.0.0.0", port=8765):
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.clients = {}   # writer -> player id
+        self.players = {}   # player id -> {"name", "score"}
+        self.next_player = 0
+        self.lock = threading.Lock()
+        self.answers = []   # (player id, option, ms since clue opened), drained by the game
+        self.clue_id = 0
+        self.clue_open = False
+        self.clue_opened_ns = 0
+        self.answered = {}  # player id -> (option, ms) for the open clue
+        self.ready = threading.Event()
+
+    # ---------- Game-thread API ----------
+    def start(self):
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.ready.wait(5)
+        return self.port
+
+    def stop(self):
+        if self.loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop).result(2)
+        except Exception:
+            pass
+        self.thread.join(2)
+
+    def open_clue(self, question, options):
+        with self.lock:
+            self.clue_id += 1
+            self.clue_open = True
+            self.clue_opened_ns = time.perf_counter_ns()
+            self.answered = {}
+            self.answers = []
+        self._broadcast({"type": "clue", "clue": self.clue_id, "question": question, "options": options})
+
+    def close_clue(self, correct_index=None, points=0):
+        """
+        Close the open clue, score phone answers and tell every phone its result.
+        Returns [(name, option, ms, correct), ...] in answer order.
+        """
+        with self.lock:
+            if not self.clue_open:
+                return []
+            self.clue_open = False
+            answered = dict(self.answered)
+            results = []
+            for pid, (option, ms) in answered.items():
+                correct = correct_index is not None and option == correct_index
+                player = self.players.get(pid)
+                if player is None:
+                    continue
+                if correct:
+                    player["score"] += points
+                results.append((player["name"], option, ms, correct))
+            results.sort(key=lambda r: r[2])
+            messages = {}
+            for writer, pid in self.clients.items():
+                if pid in answered:
+                    option = answered[pid][0]
+                    messages[writer] = {"type": "result", "correct": correct_index is not None and option == correct_index,
+                                        "score": self.players[pid]["score"]}
+                else:
+                    messages[writer] = {"type": "closed"}
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._send_each, messages)
+        return results
+
+    def drain(self):
+        """Answers received since the last drain, as (name, option, ms)."""
+        with self.lock:
+            answers, self.answers = self.answers, []
+            return [(self.players[pid]["name"], option, ms) for pid, option, ms in answers]
+
+    def answer_count(self):
+        with self.lock:
+            return len(self.answered)
+
+    def leaderboard(self, n=5):
+        with self.lock:
+            return sorted(((p["score"], p["name"]) for p in self.players.values()), reverse=True)[:n]
+
+    # ---------- Network thread ----------
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(asyncio.start_server(self._serve, self.host, self.port))
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.close()
+
+    async def _shutdown(self):
+        self.server.close()
+        # Closing the sockets lets every handler finish on its own read error
+        for writer in list(self.clients):
+            writer.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=1)
+        self.loop.call_soon(self.loop.stop)
+
+    def _broadcast(self, message):
+        if self.loop is None:
+            return
+        data = ws_frame(json.dumps(message).encode())
+        self.loop.call_soon_threadsafe(self._write_all, data)
+
+    def _write_all(self, data):
+        for writer in list(self.clients):
+            writer.write(data)
+
+    def _send_each(self, messages):
+        for writer, message in messages.items():
+            if writer in self.clients:
+                writer.write(ws_frame(json.dumps(message).encode()))
+
+    async def _serve(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        path = lines[0].split(" ")[1] if len(lines[0].split(" ")) > 1 else "/"
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                          f"Sec-WebSocket-Accept: {ws_accept_key(headers.get('sec-websocket-key', ''))}\r\n\r\n").encode())
+            await self._websocket(reader, writer)
+        else:
+            body = PAGE.encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                         + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        writer.close()
+
+    async def _websocket(self, reader, writer):
+        pid = None
+        try:
+            while True:
+                opcode, payload = await ws_read(reader)
+                if opcode == 8:  # close
+                    writer.write(ws_frame(b"", opcode=8))
+                    break
+                if opcode == 9:  # ping
+                    writer.write(ws_frame(payload, opcode=10))
+                    continue
+                if opcode != 1:
+                    continue
+                stamp = time.perf_counter_ns()
+                try:
+                    message = json.loads(payload)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                if message.get("type") == "join" and pid is None:
+                    with self.lock:
+                        pid = self.next_player
+                        self.next_player += 1
+                        self.players[pid] = {"name": str(message.get("name", "Player"))[:24], "score": 0}
+                        self.clients[writer] = pid
+                elif message.get("type") == "answer" and pid is not None:
+                    self._record_answer(pid, message, stamp)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            with self.lock:
+                self.clients.pop(writer, None)
+
+    def _record_answer(self, pid, message, stamp):
+        with self.lock:
+            # Only the first answer per player to the currently open clue counts
+            if not self.clue_open or message.get("clue") != self.clue_id or pid in self.answered:
+                return
+            option = message.get("option")
+            if not isinstance(option, int):
+                return
+            ms = (stamp - self.clue_opened_ns) / 1e6
+            self.answered[pid] = (option, ms)
+            first_in_batch = not self.answers
+            self.answers.append((pid, option, ms))
+        # One wake-up per batch: the game drains everything queued so far in one go
+        if first_in_batch and pygame is not None and pygame.display.get_init():
+            pygame.event.post(pygame.event.Event(ANSWER_EVENT))
+
+# ---------- Stand-in client ----------
+async def stand_in_client(host, port, name, choose=None, answers=None):
+    """A fake phone: joins, answers each clue with choose(options) and records results."""
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    await reader.readuntil(b"\r\n\r\n")
+    writer.write(ws_frame(json.dumps({"type": "join", "name": name}).encode(), mask=True))
+    choose = choose or (lambda options: random.randrange(len(options)))
+    try:
+        while True:
+            opcode, payload = await ws_read(reader)
+            if opcode == 8:
+                break
+            message = json.loads(payload)
+            if message["type"] == "clue":
+                writer.write(ws_frame(json.dumps({"type": "answer", "clue": message["clue"],
+                                                  "option": choose(message["options"])}).encode(), mask=True))
+            elif message["type"] == "result" and answers is not None:
+                answers.append((name, message["correct"], message["score"]))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+def simulate(num_clients, port=0):
+    server = AnswerServer("127.0.0.1", port)
+    port = server.start()
+    results = []
+
+    def run_clients():
+        async def main():
+            await asyncio.gather(*(stand_in_client("127.0.0.1", port, f"phone{i}", answers=results)
+                                   for i in range(num_clients)), return_exceptions=True)
+        asyncio.run(main())
+
+    threading.Thread(target=run_clients, daemon=True).start()
+    deadline = time.time() + 5
+    while len(server.players) < num_clients and time.time() < deadline:
+        time.sleep(0.01)
+    server.open_clue("Stand-in clue", ["A", "B", "C", "D"])
+    while server.answer_count() < num_clients and time.time() < deadline:
+        time.sleep(0.005)
+    answers = server.drain()
+    scored = server.close_clue(0, 100)
+    ms = sorted(a[2] for a in answers)
+    print(f"{len(server.players)} phones joined, {len(answers)} answers, {sum(1 for s in scored if s[3])} correct")
+    if ms:
+        print(f"answer latency: first {ms[0]:.1f} ms, median {ms[len(ms)//2]:.1f} ms, last {ms[-1]:.1f} ms")
+    server.stop()
+    return len(answers) == num_clients
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the phone answer server or simulate phones against it")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--simulate", type=int, default=50, help="number of stand-in phones")
+    args = parser.parse_args()
+    sys.exit(0 if simulate(args.simulate, args.port) else 1)
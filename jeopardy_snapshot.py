@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+jeopardy_snapshot.py - Save a game of jeopardy_game.py and resume it, on this machine or another
+
+    python jeopardy_game.py dataset/ ...          (press S on the board to save)
+    python jeopardy_game.py --resume saves/game-20250101-200000.jsnap [dataset/]
+    python jeopardy_snapshot.py saves/game-20250101-200000.jsnap   (print what is in it)
+
+A snapshot records the dataset path and date range, the teams, their
+scores and whose turn it is, the round on screen, and for that round and
+every round with clues used a bitset of its used clues and one of its
+daily doubles (which may have been placed at random). Clue dicts are not
+stored: the clues are identified by their position in the round, and a
+16-bit checksum of the round's clue texts catches a dataset that changed
+in between.
+
+The file is a few hundred bytes however large the dataset (about 15 bytes
+per round played), packed with struct:
+
+    "JSN" version:u8
+    dataset, date_from, date_to             u16 length + UTF-8 each
+    teams:u8, per team: name (u8 length + UTF-8), score:i32
+    current_team:u8, round on screen: date:u32 (ordinal), round:u8
+    rounds:u16, per round: date:u32, round:u8, checksum:u16, clues:u16,
+        flags:u8, used bits, daily double bits if flags & HAS_DAILY_DOUBLES
+    crc32 of everything before:u32
+
+Resuming reads only the episodes the snapshot refers to (only their shards
+when the dataset has a manifest), so the board is back before the rest of
+the dataset has been read.
+"""
+
+import argparse, os, struct, sys, zlib
+from datetime import date, datetime
+
+MAGIC = b"JSN"
+VERSION = 1
+HAS_DAILY_DOUBLES = 1
+SNAPSHOT_SUFFIX = ".jsnap"
+
+def snapshot_path(save_dir):
+    return os.path.join(save_dir, datetime.now().strftime("game-%Y%m%d-%H%M%S") + SNAPSHOT_SUFFIX)
+
+# ---------- Rounds ----------
+def round_clues(categories):
+    """The clues of a round in a fixed order: categories as read, clues in board order."""
+    return [clue for clues in categories.values() for clue in clues]
+
+def round_checksum(clues):
+    text = "\n".join(clue["question"] for clue in clues)
+    return zlib.crc32(text.encode("utf-8")) & 0xFFFF
+
+def to_bits(flags):
+    value = 0
+    for i, flag in enumerate(flags):
+        if flag:
+            value |= 1 << i
+    return value.to_bytes((len(flags) + 7) // 8, "little")
+
+def from_bits(data, count):
+    value = int.from_bytes(data, "little")
+    return [bool(value >> i & 1) for i in range(count)]
+
+# ---------- Encoding ----------
+def _text(value, size="H"):
+    data = (value or "").encode("utf-8")
+    return struct.pack("<" + size, len(data)) + data
+
+def take_snapshot(engine, dataset, rounds_dict, round_key, date_from=None, date_to=None):
+    """Snapshot bytes for the game: `rounds_dict` holds every round loaded, `round_key` the one shown."""
+    parts = [MAGIC, struct.pack("<B", VERSION),
+             _text(dataset), _text(date_from), _text(date_to),
+             struct.pack("<B", len(engine.team_names))]
+    for name, score in zip(engine.team_names, engine.scores):
+        parts.append(_text(name, "B") + struct.pack("<i", score))
+    parts.append(struct.pack("<BIB", engine.current_team, date.fromisoformat(round_key[0]).toordinal(), round_key[1]))
+
+    entries = []
+    for key, categories in sorted(rounds_dict.items()):
+        clues = round_clues(categories)
+        used = [clue["used"] for clue in clues]
+        if key != round_key and not any(used):
+            continue
+        daily_doubles = [clue.get("daily_double", False) for clue in clues]
+        flags = HAS_DAILY_DOUBLES if any(daily_doubles) else 0
+        entry = struct.pack("<IBHHB", date.fromisoformat(key[0]).toordinal(), key[1],
+                            round_checksum(clues), len(clues), flags) + to_bits(used)
+        if flags & HAS_DAILY_DOUBLES:
+            entry += to_bits(daily_doubles)
+        entries.append(entry)
+    parts.append(struct.pack("<H", len(entries)))
+    parts.extend(entries)
+    body = b"".join(parts)
+    return body + struct.pack("<I", zlib.crc32(body))
+
+def parse_snapshot(data):
+    """Decode snapshot bytes into a dict; ValueError if they are not a snapshot or are damaged."""
+    if len(data) < 8 or data[:3] != MAGIC:
+        raise ValueError("not a game snapshot")
+    if struct.unpack_from("<I", data, len(data) - 4)[0] != zlib.crc32(data[:-4]):
+        raise ValueError("snapshot is damaged (checksum mismatch)")
+    if data[3] != VERSION:
+        raise ValueError(f"unsupported snapshot version {data[3]}")
+    pos = 4
+
+    def take(fmt):
+        nonlocal pos
+        values = struct.unpack_from(fmt, data, pos)
+        pos += struct.calcsize(fmt)
+        return values
+
+    def text(size="H"):
+        nonlocal pos
+        (length,) = take("<" + size)
+        pos += length
+        return data[pos - length:pos].decode("utf-8")
+
+    try:
+        snapshot = {"dataset": text(), "date_from": text() or None, "date_to": text() or None}
+        teams, scores = [], []
+        for _ in range(take("<B")[0]):
+            teams.append(text("B"))
+            scores.append(take("<i")[0])
+        current_team, ordinal, rnd = take("<BIB")
+        snapshot.update(teams=teams, scores=scores, current_team=current_team,
+                        round=(date.fromordinal(ordinal).isoformat(), rnd))
+        rounds = {}
+        for _ in range(take("<H")[0]):
+            ordinal, rnd, checksum, count, flags = take("<IBHHB")
+            size = (count + 7) // 8
+            used = from_bits(data[pos:pos + size], count)
+            pos += size
+            daily_doubles = None
+            if flags & HAS_DAILY_DOUBLES:
+                daily_doubles = from_bits(data[pos:pos + size], count)
+                pos += size
+            rounds[(date.fromordinal(ordinal).isoformat(), rnd)] = (checksum, used, daily_doubles)
+        snapshot["rounds"] = rounds
+    except (struct.error, UnicodeDecodeError, ValueError):
+        raise ValueError("snapshot is truncated or malformed")
+    return snapshot
+
+def save_snapshot(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(data)
+    os.replace(path + ".tmp", path)
+    return path
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return parse_snapshot(f.read())
+
+# ---------- Restoring ----------
+def apply_snapshot(snapshot, rounds_dict):
+    """
+    Set used and daily double flags on the loaded rounds. Returns the keys of
+    rounds that are missing or whose clues changed; those are left as loaded.
+    """
+    skipped = []
+    for key, (checksum, used, daily_doubles) in snapshot["rounds"].items():
+        categories = rounds_dict.get(key)
+        clues = round_clues(categories) if categories is not None else []
+        if categories is None or len(clues) != len(used) or round_checksum(clues) != checksum:
+            skipped.append(key)
+            continue
+        for i, clue in enumerate(clues):
+            clue["used"] = used[i]
+            if daily_doubles is not None and daily_doubles[i]:
+                clue["daily_double"] = True
+            else:
+                clue.pop("daily_double", None)
+    return skipped
+
+def restore_rounds(snapshot, dataset=None):
+    """The rounds a snapshot refers to, read from `dataset` (default: its own path), flags applied."""
+    from jeopardy_data import read_episodes
+    dates = {key[0] for key in snapshot["rounds"]} | {snapshot["round"][0]}
+    rounds_dict = read_episodes(dataset or snapshot["dataset"], dates)
+    return rounds_dict, apply_snapshot(snapshot, rounds_dict)
+
+# ---------- Command line ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show what a jeopardy_game.py snapshot holds")
+    parser.add_argument("snapshot")
+    args = parser.parse_args(argv)
+    try:
+        size = os.path.getsize(args.snapshot)
+        snapshot = load_snapshot(args.snapshot)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    date_range = f" from {snapshot['date_from'] or 'the start'} to {snapshot['date_to'] or 'the end'}" \
+        if snapshot["date_from"] or snapshot["date_to"] else ""
+    print(f"{args.snapshot}: {size} bytes, dataset {snapshot['dataset']}{date_range}")
+    for i, (name, score) in enumerate(zip(snapshot["teams"], snapshot["scores"])):
+        print(f"  {name}: {score}" + ("  (to play)" if i == snapshot["current_team"] else ""))
+    print(f"  on screen: {snapshot['round'][0]} round {snapshot['round'][1]}")
+    for (air_date, rnd), (_, used, _) in sorted(snapshot["rounds"].items()):
+        print(f"  {air_date} round {rnd}: {sum(used)} of {len(used)} clues used")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+jeopardy_startup.py - Startup pipeline: first frame early, fonts and sounds loaded alongside the data
+
+pygame.init() starts every subsystem, including opening the audio device
+and enumerating joysticks, and the front-ends then loaded their fonts
+(a large CJK font file, once per size) and both WAVs one after another
+before the window showed anything or any data was read. With Startup:
+
+    1. only display and font are initialised, the window opens and a
+       first (blank) frame is presented straight away
+    2. the mixer is started and sounds and fonts are loaded on loader
+       threads (SDL releases the GIL while it reads and decodes them)
+    3. meanwhile the main thread reads the question data, then waits for
+       whatever assets it still needs
+
+Joysticks are initialised by BuzzerHub when it needs them.
+
+Import this module before pygame so its clock also covers importing
+pygame. With --timings the front-ends print the breakdown, e.g.
+
+    startup: imports 180 ms, pygame 9 ms, window 14 ms, first frame 2 ms, data 310 ms,
+    waiting for fonts 0 ms; first frame at 205 ms, ready at 515 ms
+    (in the background: sounds 160 ms, fonts 60 ms)
+"""
+
+import time
+STARTED = time.perf_counter()
+
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from jeopardy_layout import get_font
+
+
+class Startup:
+    def __init__(self, report=False):
+        self.report = report
+        self.last = STARTED
+        self.phases = []      # (name, ms) on the main thread, in order
+        self.background = []  # (name, ms) on the loader threads
+        self.first_frame_ms = None
+        self.loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        self.mark("imports")
+
+    def mark(self, name):
+        """Book the time since the previous mark under `name`."""
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000))
+        self.last = now
+
+    def init_pygame(self):
+        """The subsystems every front-end needs; the mixer starts on a loader thread."""
+        pygame.display.init()
+        pygame.font.init()
+        pygame.time.wait(0)  # starts SDL's timer, which get_ticks() needs without pygame.init()
+        self.mark("pygame")
+
+    def first_frame(self, screen, color):
+        """screen: the display surface, or a jeopardy_render renderer."""
+        if hasattr(screen, "present"):
+            screen.clear(color)
+            screen.present()
+        else:
+            screen.fill(color)
+            pygame.display.flip()
+        pygame.event.pump()  # some window managers only map the window once events are pumped
+        self.mark("first frame")
+        self.first_frame_ms = (self.last - STARTED) * 1000
+
+    def load(self, name, fn, *args):
+        """Run fn(*args) on a loader thread; returns a Future for wait()."""
+        def job():
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                self.background.append((name, (time.perf_counter() - start) * 1000))
+        return self.loader.submit(job)
+
+    def wait(self, future, name):
+        """Result of a load(); the time spent blocked on it is its own phase (mark() the work before)."""
+        result = future.result()
+        self.mark(f"waiting for {name}")
+        return result
+
+    def ready(self):
+        """Startup is over: print the breakdown if asked to."""
+        self.loader.shutdown(wait=False)
+        if not self.report:
+            return
+        ready_ms = (time.perf_counter() - STARTED) * 1000
+        phases = ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.phases)
+        line = f"startup: {phases}; "
+        if self.first_frame_ms is not None:
+            line += f"first frame at {self.first_frame_ms:.0f} ms, "
+        line += f"ready at {ready_ms:.0f} ms"
+        if self.background:
+            line += " (in the background: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.background) + ")"
+        print(line)
+
+
+# ---------- Loaders ----------
+def load_fonts(name, sizes):
+    """Fonts through jeopardy_layout's cache, so later get_font() calls for these sizes are free."""
+    return tuple(get_font(name, size) for size in sizes)
+
+def load_sounds(*paths):
+    """Start the mixer and load `paths`; all None when there is no audio device or a file is missing."""
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        return tuple(pygame.mixer.Sound(path) for path in paths)
+    except (pygame.error, OSError):
+        return (None,) * len(paths)
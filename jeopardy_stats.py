@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+jeopardy_stats.py - Statistics over a clue dump or a sharded dataset, streamed
+
+Usage: python jeopardy_stats.py PATH ... [--from DATE] [--to DATE] [--workers N]
+                                [--chunk-rows N] [--top N] [--csv DIR] [--json FILE]
+
+PATH is a jeopardy_clues TSV/CSV (any size) or a dataset directory from
+jeopardy_preprocess.py (with a manifest only the shards overlapping
+--from/--to are read). Reports:
+
+    categories      clues and rounds per category
+    values          clue value distribution per round
+    daily doubles   clues, daily doubles and the average wager per round
+    incomplete      rounds with fewer than 30 clues or 6 categories
+    answer lengths  histogram of response lengths (characters, bins of 5)
+
+Rows are read in chunks of raw lines and each chunk is aggregated into
+counters in a process pool (rows are cleaned with the preprocessor's
+normalise_row, so "$1,000" and HTML entities count the same as in the
+game). Only the counters are kept, so memory depends on the number of
+categories and episodes, not on the size of the input.
+"""
+
+import argparse, csv, json, os, sys, time
+from collections import Counter, deque
+from multiprocessing import Pool
+
+from jeopardy_data import read_manifest, select_shards
+from jeopardy_preprocess import normalise_row, FINAL_ROUND
+
+BOARD_CLUES = 30       # 6 categories x 5 clues in rounds 1 and 2
+BOARD_CATEGORIES = 6
+LENGTH_BIN = 5         # characters per answer-length bin
+LENGTH_MAX = 60        # longer answers share the last bin
+
+# ---------- Aggregation ----------
+class Report:
+    """Counters for a set of rows; reports for separate chunks merge()."""
+
+    def __init__(self):
+        self.rows = 0
+        self.rejected = 0
+        self.category_clues = Counter()    # category -> clues
+        self.category_rounds = Counter()   # category -> (episode, round)s it was played in
+        self.values = {}                   # round -> Counter(clue value)
+        self.daily_doubles = Counter()     # round -> daily doubles
+        self.wagers = Counter()            # round -> sum of daily double wagers
+        self.round_clues = Counter()       # round -> clues
+        self.boards = {}                   # (air_date, round) -> Counter(category -> clues)
+        self.lengths = Counter()           # bin start -> answers
+
+    def add(self, row):
+        rnd = row["round"]
+        category = row["category"]
+        self.rows += 1
+        self.category_clues[category] += 1
+        self.round_clues[rnd] += 1
+        self.values.setdefault(rnd, Counter())[row["clue_value"]] += 1
+        if row["daily_double_value"] > 0:
+            self.daily_doubles[rnd] += 1
+            self.wagers[rnd] += row["daily_double_value"]
+        self.boards.setdefault((row["air_date"], rnd), Counter())[category] += 1
+        self.lengths[min(len(row["question"]) // LENGTH_BIN * LENGTH_BIN, LENGTH_MAX)] += 1
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.rejected += other.rejected
+        self.category_clues.update(other.category_clues)
+        self.round_clues.update(other.round_clues)
+        for rnd, values in other.values.items():
+            self.values.setdefault(rnd, Counter()).update(values)
+        self.daily_doubles.update(other.daily_doubles)
+        self.wagers.update(other.wagers)
+        for key, categories in other.boards.items():
+            self.boards.setdefault(key, Counter()).update(categories)
+        self.lengths.update(other.lengths)
+
+    def finish(self):
+        """Per-board counts -> category appearances. Call once, after the last merge()."""
+        for categories in self.boards.values():
+            self.category_rounds.update(categories.keys())
+
+    # ---------- Tables ----------
+    def category_table(self):
+        rows = [(c, n, self.category_rounds[c]) for c, n in self.category_clues.items()]
+        rows.sort(key=lambda r: (-r[1], r[0]))
+        return ["category", "clues", "rounds"], rows
+
+    def value_table(self):
+        rows = [(rnd, value, n) for rnd in sorted(self.values) for value, n in sorted(self.values[rnd].items())]
+        return ["round", "clue_value", "clues"], rows
+
+    def daily_double_table(self):
+        rows = []
+        for rnd in sorted(self.round_clues):
+            dd = self.daily_doubles[rnd]
+            rows.append((rnd, self.round_clues[rnd], dd, round(dd / self.round_clues[rnd], 4),
+                         round(self.wagers[rnd] / dd) if dd else 0))
+        return ["round", "clues", "daily_doubles", "rate", "average_wager"], rows
+
+    def incomplete_table(self):
+        rows = []
+        for (air_date, rnd), categories in sorted(self.boards.items()):
+            clues = sum(categories.values())
+            if rnd < FINAL_ROUND and (clues < BOARD_CLUES or len(categories) < BOARD_CATEGORIES):
+                rows.append((air_date, rnd, len(categories), clues))
+        return ["air_date", "round", "categories", "clues"], rows
+
+    def length_table(self):
+        rows = []
+        for start in range(0, LENGTH_MAX + 1, LENGTH_BIN):
+            label = f"{start}+" if start == LENGTH_MAX else f"{start}-{start + LENGTH_BIN - 1}"
+            rows.append((label, self.lengths[start]))
+        return ["answer_chars", "answers"], rows
+
+    def tables(self):
+        return {
+            "categories": self.category_table(),
+            "values": self.value_table(),
+            "daily_doubles": self.daily_double_table(),
+            "incomplete": self.incomplete_table(),
+            "answer_lengths": self.length_table(),
+        }
+
+# ---------- Workers ----------
+def process_chunk(args):
+    header, lines, delimiter, start, end = args
+    report = Report()
+    for raw in csv.DictReader(lines, fieldnames=header, delimiter=delimiter):
+        try:
+            row = normalise_row(raw)
+        except ValueError:
+            report.rejected += 1
+            continue
+        if (start and row["air_date"] < start) or (end and row["air_date"] > end):
+            continue
+        report.add(row)
+    return report
+
+def iter_chunks(paths, start, end, chunk_rows):
+    # Lines are split raw, as in jeopardy_preprocess; the dataset has no multi-line fields
+    for path in paths:
+        with open(path, "r", encoding="utf-8", newline="") as fh:
+            header_line = fh.readline()
+            delimiter = "\t" if "\t" in header_line else ","
+            header = [h.strip() for h in next(csv.reader([header_line], delimiter=delimiter))]
+            lines = []
+            for line in fh:
+                lines.append(line)
+                if len(lines) >= chunk_rows:
+                    yield header, lines, delimiter, start, end
+                    lines = []
+            if lines:
+                yield header, lines, delimiter, start, end
+
+def input_files(path, start=None, end=None):
+    """The TSVs to read for `path`: itself, or a dataset directory's (selected) shards."""
+    if not os.path.isdir(path):
+        return [path]
+    manifest = read_manifest(path)
+    if manifest is not None:
+        names = [entry["file"] for entry in select_shards(manifest, start, end)]
+    else:
+        names = sorted(name for name in os.listdir(path) if name.endswith(".tsv"))
+    return [os.path.join(path, name) for name in names]
+
+def collect(paths, start=None, end=None, workers=None, chunk_rows=20000):
+    files = [f for path in paths for f in input_files(path, start, end)]
+    report = Report()
+    chunks = iter_chunks(files, start, end, chunk_rows)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for part in map(process_chunk, chunks):
+            report.merge(part)
+    else:
+        with Pool(workers) as pool:
+            # Pool.imap would read the whole input ahead; keep at most two chunks per worker in flight
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(process_chunk, (chunk,)))
+                if len(pending) >= 2 * workers:
+                    report.merge(pending.popleft().get())
+            while pending:
+                report.merge(pending.popleft().get())
+    report.finish()
+    return report
+
+# ---------- Output ----------
+def write_csv(out_dir, tables):
+    os.makedirs(out_dir, exist_ok=True)
+    for name, (columns, rows) in tables.items():
+        path = os.path.join(out_dir, name + ".csv")
+        with open(path + ".tmp", "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            writer.writerows(rows)
+        os.replace(path + ".tmp", path)
+
+def write_json(path, report, tables):
+    data = {"rows": report.rows, "rejected": report.rejected}
+    for name, (columns, rows) in tables.items():
+        data[name] = [dict(zip(columns, row)) for row in rows]
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
+
+def print_summary(report, tables, top):
+    print(f"{report.rows} clues, {report.rejected} rejected rows, "
+          f"{len(report.category_clues)} categories, {len(report.boards)} rounds")
+    _, rows = tables["categories"]
+    print(f"\nTop {min(top, len(rows))} categories (clues, rounds):")
+    for category, clues, rounds in rows[:top]:
+        print(f"  {clues:6d} {rounds:5d}  {category}")
+    print("\nValues per round:")
+    for rnd in sorted(report.values):
+        common = ", ".join(f"{v}: {n}" for v, n in sorted(report.values[rnd].most_common(8)))
+        print(f"  round {rnd}: {common}")
+    print("\nDaily doubles:")
+    for rnd, clues, dd, rate, wager in tables["daily_doubles"][1]:
+        if dd:
+            print(f"  round {rnd}: {dd} of {clues} clues ({rate:.1%}), average wager {wager}")
+    incomplete = tables["incomplete"][1]
+    print(f"\n{len(incomplete)} incomplete boards" + (f", e.g. {incomplete[0][0]} round {incomplete[0][1]}: "
+          f"{incomplete[0][2]} categories, {incomplete[0][3]} clues" if incomplete else ""))
+    print("\nAnswer lengths (characters):")
+    _, rows = tables["answer_lengths"]
+    widest = max((n for _, n in rows), default=0) or 1
+    for label, n in rows:
+        print(f"  {label:>6} {n:8d} {'#' * round(40 * n / widest)}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Statistics over a jeopardy_clues dump or a sharded dataset")
+    parser.add_argument("paths", nargs="+", help="clue TSV/CSV files or dataset directories")
+    parser.add_argument("--from", dest="date_from", metavar="DATE", help="first air date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", metavar="DATE", help="last air date (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=20000, help="rows per work unit")
+    parser.add_argument("--top", type=int, default=20, metavar="N", help="categories to print")
+    parser.add_argument("--csv", metavar="DIR", help="write one CSV per table into DIR")
+    parser.add_argument("--json", metavar="FILE", help="write every table into one JSON file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        report = collect(args.paths, args.date_from, args.date_to, args.workers, args.chunk_rows)
+    except OSError as e:
+        print(f"Error: {e}")
+        return 1
+    tables = report.tables()
+    print_summary(report, tables, args.top)
+    if args.csv:
+        write_csv(args.csv, tables)
+    if args.json:
+        write_json(args.json, report, tables)
+    elapsed = time.perf_counter() - start
+    print(f"\n{report.rows + report.rejected} rows in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
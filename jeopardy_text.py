@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+jeopardy_text.py - CJK-aware line breaking and a glyph atlas for the big CJK font
+
+wrap_lines() used to split on spaces only, so a Chinese clue (no spaces)
+was one line running off the overlay. Here text is cut into break units:
+a run of Latin letters/digits is one unit, every CJK character is a unit
+of its own, and the usual line-breaking rules are kept -- closing
+punctuation (，。」) never starts a line and opening brackets (（「) never
+end one; they stick to their neighbour.
+
+Rendering a string with NotoSansSC means FreeType loading and rasterising
+every glyph again, each time. GlyphAtlas rasterises each glyph once per
+font size (in white, with alpha) and composes strings from those images,
+tinted to the requested colour; composed strings are kept too. The CJK
+glyph space is huge, so both caches are LRU-bounded (GLYPH_CACHE_SIZE
+glyphs, TEXT_CACHE_SIZE strings) and a long session only keeps what is
+still on screen.
+
+Text without CJK goes through font.render/font.size as before, so Latin
+kerning is unchanged. Measuring and drawing always agree: text_width()
+adds the same glyph advances the atlas composes with.
+"""
+
+import re
+from collections import OrderedDict
+import pygame
+
+from jeopardy_data import CJK_CHARS
+
+GLYPH_CACHE_SIZE = 4096  # glyph images over all fonts and sizes (~3 KB each at 30 px)
+TEXT_CACHE_SIZE = 512    # composed strings
+ADVANCE_CACHE_SIZE = 65536
+
+_cjk_re = re.compile(f"[{CJK_CHARS}]")
+_units_re = re.compile(f"\\s+|[{CJK_CHARS}]|[^\\s{CJK_CHARS}]+")
+
+# Line-breaking rules (kinsoku): never at the start / the end of a line
+NO_START = set("，。、；：？！）」』】》〉〕］｝”’・ー…‥々ゝゞぁぃぅぇぉっゃゅょァィゥェォッャュョ〜,.;:?!)]}%")
+NO_END = set("（「『【《〈〔［｛“‘([{$")
+
+# ---------- Line breaking ----------
+def has_cjk(text):
+    return _cjk_re.search(text) is not None
+
+def break_units(text):
+    """Pieces a line may break between; whitespace runs become " "."""
+    units = []
+    glue = False  # the previous unit was an opening bracket: join the next one to it
+    for piece in _units_re.findall(text):
+        if piece.isspace():
+            if units and units[-1] != " ":
+                units.append(" ")
+            glue = False
+        elif units and (glue or piece[0] in NO_START) and units[-1] != " ":
+            units[-1] += piece
+            glue = piece[-1] in NO_END
+        else:
+            units.append(piece)
+            glue = piece[-1] in NO_END
+    return units
+
+def wrap_lines(text, font, max_width):
+    """
+    Greedy wrap that breaks at spaces and between CJK characters. A unit
+    wider than max_width (a long word) still gets its own line.
+    """
+    lines, cur = [], ""
+    for unit in break_units(text):
+        if unit == " ":
+            if cur:
+                cur += " "
+            continue
+        test = cur + unit
+        if not cur or text_width(font, test) <= max_width:
+            cur = test
+        else:
+            lines.append(cur.rstrip())
+            cur = unit
+    lines.append(cur.rstrip())
+    return lines
+
+# ---------- Measuring ----------
+_advances = {}
+
+def advance(font, ch):
+    key = (font, ch)
+    width = _advances.get(key)
+    if width is None:
+        metrics = font.metrics(ch)
+        width = metrics[0][4] if metrics and metrics[0] else font.size(ch)[0]
+        if len(_advances) >= ADVANCE_CACHE_SIZE:
+            _advances.clear()  # plain ints; refilled from FreeType's own cache
+        _advances[key] = width
+    return width
+
+def text_width(font, text):
+    """Width as drawn by render_text()."""
+    if not has_cjk(text):
+        return font.size(text)[0]
+    return sum(advance(font, ch) for ch in text)
+
+# ---------- Glyph atlas ----------
+class GlyphAtlas:
+    def __init__(self, max_glyphs=GLYPH_CACHE_SIZE, max_texts=TEXT_CACHE_SIZE):
+        self.max_glyphs = max_glyphs
+        self.max_texts = max_texts
+        self.glyphs = OrderedDict()  # (font, ch) -> white image, least recently used first
+        self.texts = OrderedDict()   # (font, text, color) -> composed image
+        self.rasterised = 0
+
+    def glyph(self, font, ch):
+        key = (font, ch)
+        image = self.glyphs.get(key)
+        if image is not None:
+            self.glyphs.move_to_end(key)
+            return image
+        image = self.glyphs[key] = font.render(ch, True, (255, 255, 255))
+        self.rasterised += 1
+        if len(self.glyphs) > self.max_glyphs:
+            self.glyphs.popitem(last=False)
+        return image
+
+    def compose(self, font, text, color):
+        """`text` drawn from cached glyphs, tinted to `color`."""
+        glyphs, x, width = [], 0, 1
+        for ch in text:
+            image = self.glyph(font, ch)
+            glyphs.append((image, x))
+            width = max(width, x + image.get_width())
+            x += advance(font, ch)
+        surface = pygame.Surface((width, font.get_height()), pygame.SRCALPHA)
+        for image, x in glyphs:
+            # MAX keeps overlapping edges intact; a normal blit onto the transparent
+            # surface would darken the anti-aliased pixels
+            surface.blit(image, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        surface.fill(tuple(color)[:3] + (255,), special_flags=pygame.BLEND_RGBA_MULT)
+        return surface
+
+    def render(self, font, text, color):
+        """Like font.render(text, True, color); the result is shared, so do not draw on it."""
+        key = (font, text, tuple(color))
+        image = self.texts.get(key)
+        if image is not None:
+            self.texts.move_to_end(key)
+            return image
+        if has_cjk(text):
+            image = self.compose(font, text, color)
+        else:
+            image = font.render(text, True, color)
+        self.texts[key] = image
+        if len(self.texts) > self.max_texts:
+            self.texts.popitem(last=False)
+        return image
+
+    def clear(self):
+        self.glyphs.clear()
+        self.texts.clear()
+
+
+atlas = GlyphAtlas()
+
+def render_text(font, text, color):
+    return atlas.render(font, text, color)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+jeopardy_watch.py - Reload the open question set while the game runs
+
+FileWatcher watches one file from a thread: with inotify on Linux (through
+ctypes; the directory is watched, since most editors save by writing a new
+file and renaming it over the old one) and by polling os.stat every
+POLL_SECONDS elsewhere. Editors save in bursts (backup, write, rename,
+chmod), so the callback runs once the file has been quiet for
+DEBOUNCE_SECONDS.
+
+LiveQuestionSet keeps the rows of a q*.txt file keyed by their raw line.
+reload() reads the file again but parses only the lines it has not seen:
+unchanged rows keep their clue dicts, so their `used` flags (and daily
+doubles) survive, and an edited row takes over the flags of the row it
+replaced (same category and value). Rows are one line each, as in every
+set shipped here; quoted fields spanning lines are not supported.
+
+    python jeopardy_watch.py q01_example.txt [--poll]   (print what each save changes)
+"""
+
+import argparse, csv, ctypes, ctypes.util, os, select, struct, sys, threading, time
+
+from jeopardy_data import detect_delimiter, parse_question_row, group_questions
+
+DEBOUNCE_SECONDS = 0.3
+POLL_SECONDS = 0.5
+
+# inotify(7)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_CLOEXEC = 0o2000000
+IN_NONBLOCK = 0o4000
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+def _inotify():
+    """libc with inotify, or None (not Linux, or no libc to load)."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+# ---------- Watching ----------
+class FileWatcher:
+    def __init__(self, path, callback, debounce=DEBOUNCE_SECONDS, poll=False):
+        self.path = os.path.abspath(path)
+        self.callback = callback  # called on the watcher thread
+        self.debounce = debounce
+        self.poll = poll
+        self.stopped = threading.Event()
+        self.thread = None
+        self.mode = None  # "inotify" or "polling" once started
+
+    def start(self):
+        fd = None if self.poll else self._open_inotify()
+        self.mode = "inotify" if fd is not None else "polling"
+        target = (lambda: self._watch_inotify(fd)) if fd is not None else self._watch_polling
+        self.thread = threading.Thread(target=target, daemon=True)
+        self.thread.start()
+        return self.mode
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    def _open_inotify(self):
+        libc = _inotify()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY | IN_ATTRIB
+        if libc.inotify_add_watch(fd, os.path.dirname(self.path).encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _fire_when_quiet(self, changed, deadline):
+        """Debounce: returns the new deadline, calling back once it has passed."""
+        now = time.monotonic()
+        if changed:
+            return now + self.debounce
+        if deadline is not None and now >= deadline:
+            self.callback(self.path)
+            return None
+        return deadline
+
+    def _watch_inotify(self, fd):
+        name = os.path.basename(self.path).encode()
+        deadline = None
+        try:
+            while not self.stopped.is_set():
+                timeout = POLL_SECONDS if deadline is None else max(0.0, deadline - time.monotonic())
+                ready, _, _ = select.select([fd], [], [], timeout)
+                changed = False
+                if ready:
+                    data = os.read(fd, 65536)
+                    pos = 0
+                    while pos + EVENT_HEADER.size <= len(data):
+                        _, _, _, length = EVENT_HEADER.unpack_from(data, pos)
+                        pos += EVENT_HEADER.size
+                        changed |= data[pos:pos + length].rstrip(b"\0") == name
+                        pos += length
+                deadline = self._fire_when_quiet(changed, deadline)
+        finally:
+            os.close(fd)
+
+    def _watch_polling(self):
+        last = self._stat()
+        deadline = None
+        while not self.stopped.wait(POLL_SECONDS if deadline is None else min(POLL_SECONDS, self.debounce)):
+            current = self._stat()
+            changed, last = current != last, current
+            deadline = self._fire_when_quiet(changed, deadline)
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None  # mid-save (renamed away); the next poll sees the new file
+        return st.st_mtime_ns, st.st_size
+
+# ---------- Incremental reload ----------
+class LiveQuestionSet:
+    def __init__(self, path):
+        self.path = path
+        self.header = None
+        self.rows = {}   # raw line -> [clue, ...] (identical lines are separate clues)
+        self.text = None
+
+    def load(self):
+        """(categories, category_names) like read_question_file(), remembering the rows."""
+        result = self.reload()
+        return result[:2]
+
+    def reload(self):
+        """
+        Re-read the file: (categories, category_names, rows parsed), or None when
+        its text has not changed. Unchanged rows keep their clue dicts.
+        """
+        with open(self.path, "r", encoding="utf-8", newline="") as fh:
+            text = fh.read()
+        if text == self.text:
+            return None
+        lines = text.splitlines()
+        header_line = lines[0] if lines else ""
+        delimiter = detect_delimiter(header_line)
+        header = [h.strip() for h in next(csv.reader([header_line], delimiter=delimiter), [])]
+        old_rows = self.rows if header == self.header else {}
+
+        rows, questions, added = {}, [], []
+        for line in lines[1:]:
+            if not line.strip():
+                continue
+            kept = old_rows.get(line)
+            if kept:
+                clue = kept.pop(0)
+            else:
+                values = next(csv.reader([line], delimiter=delimiter), [])
+                clue = parse_question_row(dict(zip(header, values)))
+                added.append(clue)
+            rows.setdefault(line, []).append(clue)
+            questions.append(clue)
+
+        # An edited row is a removed row plus an added one: carry the flags over
+        removed = {}
+        for clues in old_rows.values():
+            for clue in clues:
+                removed.setdefault((clue["subtype"], clue["points"]), clue)
+        for clue in added:
+            old = removed.pop((clue["subtype"], clue["points"]), None)
+            if old is not None:
+                clue["used"] = old["used"]
+                if old.get("daily_double"):
+                    clue["daily_double"] = True
+
+        self.header, self.rows, self.text = header, rows, text
+        categories, category_names = group_questions(questions)
+        return categories, category_names, len(added)
+
+# ---------- Command line ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a question set and report what each save changes")
+    parser.add_argument("path", help="q*.txt question set")
+    parser.add_argument("--poll", action="store_true", help="poll the file instead of using inotify")
+    args = parser.parse_args(argv)
+    path = args.path
+    live = LiveQuestionSet(path)
+    categories, _ = live.load()
+    print(f"{path}: {sum(len(c) for c in categories.values())} questions; watching (Ctrl+C to stop)")
+
+    def changed(_):
+        start = time.perf_counter()
+        try:
+            result = live.reload()
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"  error: {e}")
+            return
+        if result is not None:
+            categories, _, parsed = result
+            print(f"  reloaded: {sum(len(c) for c in categories.values())} questions, {parsed} rows parsed "
+                  f"({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    watcher = FileWatcher(path, changed, poll=args.poll)
+    print(f"  using {watcher.start()}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())